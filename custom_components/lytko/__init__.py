@@ -1,20 +1,31 @@
 from __future__ import annotations
 
-import asyncio
-
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import Platform
 from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import ConfigEntryNotReady
 from homeassistant.helpers.typing import ConfigType
 
+from .catalog import async_get_catalog
 from .conf import LOGGER
-from .const import DOMAIN, ENTRY_TYPE, THERMOSTAT, SCHEDULE
+from .const import DOMAIN, ENTRY_TYPE, THERMOSTAT, SCHEDULE, ATTR_THERMOSTAT, DEVICE_ID
 from .device_manager import DeviceManager
+from .helper import resolve_thermostat_device_id
+from .production_calendar import async_get_calendar
+from .schedule_store import async_get_schedule_store
+from .shadow import async_remove_shadow
+from .state_cache import async_get_state_cache
+from .services import async_register_services
 
-PLATFORMS: list[str] = [Platform.SWITCH, Platform.CLIMATE, Platform.SELECT, Platform.NUMBER]
+PLATFORMS: list[str] = [Platform.SWITCH, Platform.CLIMATE, Platform.SELECT, Platform.NUMBER, Platform.EVENT]
 
 async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
     hass.data.setdefault(DOMAIN, {})
+    await async_get_calendar(hass).async_load()
+    await async_get_schedule_store(hass).async_load()
+    await async_get_state_cache(hass).async_load()
+    async_register_services(hass)
+    async_get_catalog(hass)
     return True
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
@@ -24,23 +35,38 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         await manager.initialize()
         hass.data[DOMAIN][entry.entry_id] = manager
 
-        asyncio.create_task(hass.config_entries.async_forward_entry_setups(entry, PLATFORMS))
+        await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
     elif entry.data.get(ENTRY_TYPE) == SCHEDULE:
-        hass.data[DOMAIN][entry.entry_id] = entry.data
-        asyncio.create_task(hass.config_entries.async_forward_entry_setups(entry, [Platform.EVENT]))
+        await async_migrate_schedule_entry(hass, entry)
 
     return True
 
+async def async_migrate_schedule_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Переносим устаревшую запись-расписание в общее хранилище и удаляем её."""
+    device_id = resolve_thermostat_device_id(hass, entry.data.get(ATTR_THERMOSTAT, ""))
+    if device_id is None:
+        # Термостат ещё не поднялся: не блокируем старт, Home Assistant повторит попытку сам.
+        raise ConfigEntryNotReady(f"Термостат {entry.data.get(ATTR_THERMOSTAT)} не найден")
+
+    # unique_id записи становится id расписания, чтобы сохранить entity_id.
+    async_get_schedule_store(hass).async_add(device_id, dict(entry.data), schedule_id=entry.unique_id)
+    LOGGER.info(f"Расписание {entry.title} перенесено в хранилище термостата {device_id}")
+    hass.async_create_task(hass.config_entries.async_remove(entry.entry_id))
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
-    unload_ok = False
+    unload_ok = True
     if entry.data.get(ENTRY_TYPE) == THERMOSTAT:
         unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
-    elif entry.data.get(ENTRY_TYPE) == SCHEDULE:
-        unload_ok = await hass.config_entries.async_unload_platforms(entry, [Platform.EVENT])
 
     if unload_ok:
         if entry.entry_id in hass.data[DOMAIN]:
             if entry.data.get(ENTRY_TYPE) == THERMOSTAT:
                 await hass.data[DOMAIN][entry.entry_id].stop()
             hass.data[DOMAIN].pop(entry.entry_id)
-    return unload_ok
\ No newline at end of file
+    return unload_ok
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Термостат удалён: забываем его сохранённое состояние и тень."""
+    if entry.data.get(ENTRY_TYPE) == THERMOSTAT:
+        async_get_state_cache(hass).async_remove(entry.data[DEVICE_ID])
+        await async_remove_shadow(hass, entry.data[DEVICE_ID])
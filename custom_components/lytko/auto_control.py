@@ -0,0 +1,107 @@
+import time
+from typing import Awaitable, Callable
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+
+from .const import AUTO_MIN_ON_TIME, AUTO_MIN_OFF_TIME
+
+
+# Функции решения записаны без ветвлений, чтобы работать и с числами, и поэлементно
+# с массивами NumPy: ими же пользуется симулятор для подбора параметров.
+
+def auto_heating(temperature, target, hysteresis, heating):
+    """Нужен ли обогрев: включаем ниже target - hysteresis, выключаем выше target + hysteresis."""
+    return (temperature < target - hysteresis) | ((temperature <= target + hysteresis) & heating)
+
+
+def min_cycle(heating, min_on, min_off):
+    """Минимальное время, которое реле должно пробыть в текущем состоянии."""
+    return min_off + heating * (min_on - min_off)
+
+
+def hold_remaining(heating: bool, since_switch: float | None, min_on: float, min_off: float) -> float:
+    """Сколько ещё нельзя переключать реле, чтобы не нарушить минимальное время цикла."""
+    if since_switch is None:
+        return 0
+    return max(0.0, min_cycle(heating, min_on, min_off) - since_switch)
+
+
+class AutoController:
+    """Режим AUTO по внешнему датчику: решение принимается только при смене температуры или уставки.
+
+    Между событиями не работает ничего, кроме, возможно, одного таймера, который
+    досчитывает минимальное время включения или выключения.
+    """
+
+    def __init__(
+            self,
+            hass: HomeAssistant,
+            switch: Callable[[bool], Awaitable[None]],
+            min_on: float = AUTO_MIN_ON_TIME,
+            min_off: float = AUTO_MIN_OFF_TIME,
+    ):
+        self.hass = hass
+        self._switch = switch
+        self.min_on = min_on
+        self.min_off = min_off
+        self.active = False
+        self.heating = False
+        self._switched_at: float | None = None
+        self._temperature: float | None = None
+        self._target: float | None = None
+        self._hysteresis = 0.0
+        self._unsub_hold = None
+        self.evaluations = 0
+        self.switches = 0
+
+    @callback
+    def start(self, heating: bool) -> None:
+        self.active = True
+        self.heating = heating
+        self._switched_at = None
+        self._evaluate()
+
+    @callback
+    def stop(self) -> None:
+        self.active = False
+        self._cancel_hold()
+
+    @callback
+    def update(self, temperature: float | None, target: float | None, hysteresis: float) -> None:
+        self._temperature = temperature
+        self._target = target
+        self._hysteresis = hysteresis
+        self._evaluate()
+
+    @callback
+    def _cancel_hold(self) -> None:
+        if self._unsub_hold:
+            self._unsub_hold()
+            self._unsub_hold = None
+
+    @callback
+    def _hold_expired(self, _now) -> None:
+        self._unsub_hold = None
+        self._evaluate()
+
+    @callback
+    def _evaluate(self) -> None:
+        if not self.active or self._temperature is None or self._target is None:
+            return
+        self.evaluations += 1
+        wanted = bool(auto_heating(self._temperature, self._target, self._hysteresis, self.heating))
+        if wanted == self.heating:
+            self._cancel_hold()
+            return
+        since = None if self._switched_at is None else time.monotonic() - self._switched_at
+        remaining = hold_remaining(self.heating, since, self.min_on, self.min_off)
+        if remaining:
+            if not self._unsub_hold:
+                self._unsub_hold = async_call_later(self.hass, remaining, self._hold_expired)
+            return
+        self._cancel_hold()
+        self.heating = wanted
+        self._switched_at = time.monotonic()
+        self.switches += 1
+        self.hass.async_create_task(self._switch(wanted))
@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+from homeassistant.const import EVENT_STATE_CHANGED
+from homeassistant.core import HomeAssistant, Event, callback
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+from homeassistant.helpers.event import async_call_later
+
+from .const import DOMAIN, DATA_CATALOG, SIGNAL_CATALOG_UPDATED
+
+# Пачку изменений при старте Home Assistant рассылаем одним сигналом.
+NOTIFY_DELAY = 1
+
+
+def _label(state) -> str:
+    return f"{state.name} ({state.entity_id})"
+
+
+class EntityCatalog:
+    """Индекс датчиков температуры и термостатов Lytko для выпадающих списков.
+
+    Строится одним проходом по состояниям, дальше обновляется по событиям
+    state_changed и entity_registry_updated; списки отдаются из кэша.
+    """
+
+    def __init__(self, hass: HomeAssistant):
+        self.hass = hass
+        self._registry = er.async_get(hass)
+        self._sensors: dict[str, str] = {}
+        self._thermostats: dict[str, str] = {}
+        self._sensor_options: list[str] | None = None
+        self._sensor_ids: dict[str, str] | None = None
+        self._thermostat_list: list[dict] | None = None
+        self._unsubs = []
+        self._unsub_notify = None
+
+    @callback
+    def async_start(self) -> None:
+        for state in self.hass.states.async_all(("sensor", "climate")):
+            self._update(state.entity_id, state)
+        self._unsubs.append(self.hass.bus.async_listen(EVENT_STATE_CHANGED, self._state_changed))
+        self._unsubs.append(self.hass.bus.async_listen(er.EVENT_ENTITY_REGISTRY_UPDATED, self._registry_updated))
+
+    @callback
+    def async_stop(self) -> None:
+        for unsub in self._unsubs:
+            unsub()
+        self._unsubs = []
+        if self._unsub_notify:
+            self._unsub_notify()
+            self._unsub_notify = None
+
+    def _is_thermostat(self, entity_id: str) -> bool:
+        entry = self._registry.async_get(entity_id)
+        return entry is not None and entry.platform == DOMAIN
+
+    @callback
+    def _update(self, entity_id: str, state) -> None:
+        if entity_id.startswith("sensor."):
+            index = self._sensors
+            wanted = state is not None and "temperature" in str(state.attributes.get("device_class", "")).lower()
+        elif entity_id.startswith("climate."):
+            index = self._thermostats
+            wanted = state is not None and self._is_thermostat(entity_id)
+        else:
+            return
+        label = _label(state) if wanted else None
+        if index.get(entity_id) == label:
+            return
+        if label is None:
+            index.pop(entity_id, None)
+        else:
+            index[entity_id] = label
+        if index is self._sensors:
+            self._sensor_options = None
+            self._sensor_ids = None
+        else:
+            self._thermostat_list = None
+        self._schedule_notify()
+
+    @callback
+    def _state_changed(self, event: Event) -> None:
+        entity_id = event.data["entity_id"]
+        if entity_id.startswith(("sensor.", "climate.")):
+            self._update(entity_id, event.data.get("new_state"))
+
+    @callback
+    def _registry_updated(self, event: Event) -> None:
+        entity_id = event.data["entity_id"]
+        if old_entity_id := event.data.get("old_entity_id"):
+            self._update(old_entity_id, None)
+        self._update(entity_id, None if event.data["action"] == "remove" else self.hass.states.get(entity_id))
+
+    @callback
+    def _schedule_notify(self) -> None:
+        if self._unsubs and self._unsub_notify is None:
+            self._unsub_notify = async_call_later(self.hass, NOTIFY_DELAY, self._notify)
+
+    @callback
+    def _notify(self, _now) -> None:
+        self._unsub_notify = None
+        async_dispatcher_send(self.hass, SIGNAL_CATALOG_UPDATED)
+
+    @callback
+    def sensor_options(self) -> list[str]:
+        """Варианты «Имя (sensor.xxx)» для выбора внешнего датчика."""
+        if self._sensor_options is None:
+            self._sensor_options = sorted(self._sensors.values())
+        return self._sensor_options
+
+    @callback
+    def sensor_label(self, entity_id: str) -> str | None:
+        return self._sensors.get(entity_id)
+
+    @callback
+    def sensor_entity_id(self, label: str) -> str | None:
+        """Датчик по выбранному варианту списка."""
+        if self._sensor_ids is None:
+            self._sensor_ids = {label: entity_id for entity_id, label in self._sensors.items()}
+        return self._sensor_ids.get(label)
+
+    @callback
+    def thermostats(self) -> list[dict]:
+        """Термостаты Lytko для выпадающего списка в формах расписаний."""
+        if self._thermostat_list is None:
+            self._thermostat_list = [
+                {'id': entity_id, 'name': label.rsplit(" (", 1)[0], 'icon': 'mdi:thermometer'}
+                for entity_id, label in sorted(self._thermostats.items(), key=lambda item: item[1])
+            ]
+        return self._thermostat_list
+
+
+def async_get_catalog(hass: HomeAssistant) -> EntityCatalog:
+    """Общий для всей интеграции индекс сущностей; запускается при первом обращении."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    catalog = domain_data.get(DATA_CATALOG)
+    if catalog is None:
+        catalog = domain_data[DATA_CATALOG] = EntityCatalog(hass)
+        catalog.async_start()
+    return catalog
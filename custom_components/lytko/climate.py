@@ -1,4 +1,3 @@
-import asyncio
 import logging
 from typing import Any, Mapping
 
@@ -9,14 +8,17 @@ from homeassistant.components.climate.const import (
 )
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import UnitOfTemperature
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers import device_registry as dr
 from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
+from .auto_control import AutoController
 from .const import NAME, DOMAIN, SELECTED_THERMOMETER, MODEL, MAC
 from .device_manager import DeviceManager
+from .entity import LytkoEntity
 from .events import HeatingEvent, TargetTemperatureEvent
+from .outbound import Priority
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -33,7 +35,7 @@ async def async_setup_entry(
 
     async_add_entities([device_manager.thermostat])
 
-class ThermostatClimate(ClimateEntity):
+class ThermostatClimate(LytkoEntity, ClimateEntity):
 
     def __init__(self, hass: HomeAssistant, device_manager: DeviceManager, config: ConfigEntry):
         self.hass = hass
@@ -47,7 +49,17 @@ class ThermostatClimate(ClimateEntity):
         self.temp_max = 100
         self.step = 0.5
         self.automatic_external_sensor = False
-        self._auto_mode_task = None
+        self.auto_controller = AutoController(hass, self._auto_switch)
+
+    async def async_added_to_hass(self) -> None:
+        await super().async_added_to_hass()
+        if self.automatic_external_sensor and not self.auto_controller.active:
+            # AUTO восстановлен из сохранённого состояния: уставка устройства уже поднята.
+            self.auto_controller.start(self._heating)
+            self._update_auto_controller()
+
+    async def async_will_remove_from_hass(self) -> None:
+        self.auto_controller.stop()
 
     @property
     def device_info(self) -> DeviceInfo | None:
@@ -107,18 +119,18 @@ class ThermostatClimate(ClimateEntity):
             modes.append(HVACMode.AUTO)
         return modes
 
+    @property
+    def extra_state_attributes(self) -> Mapping[str, Any] | None:
+        return {
+            **self.device_manager.timeline.attributes,
+            "converged": self.device_manager.shadow.converged,
+            "restored": self.device_manager.restored,
+        }
+
     @property
     def supported_features(self) -> ClimateEntityFeature:
         return ClimateEntityFeature.TARGET_TEMPERATURE | ClimateEntityFeature.TURN_OFF | ClimateEntityFeature.TURN_ON
 
-    async def set_settings(self, temp_min: float, temp_max: float, step: float):
-        if self.temp_min != temp_min or self.temp_max!=temp_max or self.step!=self.step:
-            self.temp_max = temp_max
-            self.temp_min = temp_min
-            self.step = step
-            self.async_write_ha_state()
-
-
     async def async_set_hvac_mode(self, hvac_mode: HVACMode) -> None:
         before_hvac_mode = self.hvac_mode
         if hvac_mode == HVACMode.OFF:
@@ -140,30 +152,54 @@ class ThermostatClimate(ClimateEntity):
                 )
             )
 
-        if not self._auto_mode_task and self.automatic_external_sensor:
-            self._auto_mode_task = asyncio.create_task(self._auto_mode_loop())
+        if self.automatic_external_sensor and not self.auto_controller.active:
+            # Термостат в AUTO работает как реле: его уставку поднимаем до максимума один раз при входе.
+            await self.device_manager.send_device_command(
+                TargetTemperatureEvent(
+                    temperature=self.temp_max
+                )
+            )
+            self.auto_controller.start(self._heating)
+            self._update_auto_controller()
+        elif not self.automatic_external_sensor:
+            self.auto_controller.stop()
+        self.device_manager.state_cache.async_update(
+            self.device_manager.device_id,
+            auto=self.automatic_external_sensor,
+            auto_target=self._target_temperature if self.automatic_external_sensor else None,
+        )
 
-        if self._auto_mode_task and not self.automatic_external_sensor:
-            self._auto_mode_task.cancel()
-            self._auto_mode_task = None
 
+    async def async_external_sensor_removed(self) -> None:
+        """Внешний датчик убран из настроек: выходим из AUTO и возвращаем уставку термостату."""
+        self._external_sensor_temperature = None
+        if not self.automatic_external_sensor:
+            return
+        self.automatic_external_sensor = False
+        self.auto_controller.stop()
+        if self._target_temperature is not None:
+            # В AUTO уставка устройства была поднята до максимума, уставка комнаты хранилась здесь.
+            await self.device_manager.send_device_command(
+                TargetTemperatureEvent(
+                    temperature=self._target_temperature
+                )
+            )
+        self.device_manager.state_cache.async_update(self.device_manager.device_id, auto=False)
 
     async def async_turn_off(self) -> None:
-        await self.device_manager.send_device_command(
-            HeatingEvent(
-                heating_on=False
-            )
-        )
-        self._heating = False
-        self.async_write_ha_state()
+        await self._set_heating(False)
 
     async def async_turn_on(self) -> None:
+        await self._set_heating(True)
+
+    async def _set_heating(self, heating_on: bool, priority: Priority = Priority.USER) -> None:
         await self.device_manager.send_device_command(
             HeatingEvent(
-                heating_on=True
-            )
+                heating_on=heating_on
+            ),
+            priority,
         )
-        self._heating = True
+        self._heating = heating_on
         self.async_write_ha_state()
 
 
@@ -177,40 +213,21 @@ class ThermostatClimate(ClimateEntity):
                         temperature=target_temp
                     )
                 )
+            if self.automatic_external_sensor:
+                self.device_manager.state_cache.async_update(self.device_manager.device_id, auto_target=target_temp)
+            self._update_auto_controller()
             self.async_write_ha_state()
 
-    async def set_current_temperature(self, temperature):
-        self._current_temperature = temperature
-        self.async_write_ha_state()
-
-    async def set_current_external_temperature(self, temperature):
+    @callback
+    def set_current_external_temperature(self, temperature):
         self._external_sensor_temperature = temperature
-        self.async_write_ha_state()
-
-
-    async def set_target_temperature(self, temperature):
-        self._target_temperature = temperature
-        self.async_write_ha_state()
-
-    async def set_heating(self, heating):
-        self._heating = heating
-        self.async_write_ha_state()
+        self._update_auto_controller()
+        if self.entity_id is not None:
+            self.async_write_ha_state()
 
+    def _update_auto_controller(self):
+        if self.automatic_external_sensor:
+            self.auto_controller.update(self._external_sensor_temperature, self._target_temperature, self.step)
 
-    async def _auto_mode_loop(self):
-        """Automatically control the heating based on the external sensor's temperature."""
-        while self.automatic_external_sensor:
-            if self._external_sensor_temperature is not None and self._target_temperature is not None:
-                await self.device_manager.send_device_command(
-                    TargetTemperatureEvent(
-                        temperature=self.temp_max
-                    )
-                )
-                lower_threshold = self._target_temperature - self.step
-                upper_threshold = self._target_temperature + self.step
-
-                if self._external_sensor_temperature < lower_threshold:
-                    await self.async_turn_on()
-                elif self._external_sensor_temperature > upper_threshold:
-                    await self.async_turn_off()
-            await asyncio.sleep(1)
\ No newline at end of file
+    async def _auto_switch(self, heating_on: bool):
+        await self._set_heating(heating_on, Priority.AUTOMATIC)
@@ -0,0 +1,48 @@
+import json
+from typing import Any, Callable
+
+from .events import Event, HeatingEvent, TargetTemperatureEvent, ThermistorSettingsEvent, AliceSettingsEvent
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson входит в зависимости Home Assistant
+    orjson = None
+
+if orjson is not None:
+    BACKEND = "orjson"
+
+    def loads(data: str | bytes) -> Any:
+        """Разбор JSON из str или bytes без промежуточного декодирования."""
+        return orjson.loads(data)
+
+    def dumps(value: Any) -> str:
+        return orjson.dumps(value).decode()
+else:
+    BACKEND = "json"
+    loads = json.loads
+    dumps = json.JSONEncoder(ensure_ascii=False, separators=(",", ":")).encode
+
+
+def _command(action: str, fields: dict[str, Callable[[Any], Any]]) -> Callable[[Any], str]:
+    """Кодировщик команды: постоянная часть JSON сериализуется один раз при импорте."""
+    head = dumps({"action": action})[:-1]
+    parts = tuple((f",{dumps(name)}:", getter) for name, getter in fields.items())
+
+    def encode(event: Any) -> str:
+        return head + "".join(prefix + dumps(getter(event)) for prefix, getter in parts) + "}"
+
+    return encode
+
+
+ENCODERS: dict[type[Event], Callable[[Any], str]] = {
+    TargetTemperatureEvent: _command("thermostat.set.target", {"t_target": lambda e: e.temperature}),
+    HeatingEvent: _command("thermostat.set.mode", {"heat": lambda e: "on" if e.heating_on else "off"}),
+    ThermistorSettingsEvent: _command("thermostat.set.sensor", {"sensor": lambda e: e.resistance}),
+    AliceSettingsEvent: _command("alice.login", {"login": lambda e: e.login, "pass": lambda e: e.password}),
+}
+
+
+def encode_command(event: Event) -> str | None:
+    """Кадр команды для устройства или None, если протокол такую команду не поддерживает."""
+    encoder = ENCODERS.get(type(event))
+    return encoder(event) if encoder else None
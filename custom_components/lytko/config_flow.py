@@ -1,7 +1,5 @@
 from __future__ import annotations
 
-import uuid
-
 import voluptuous as vol
 from homeassistant import config_entries
 from homeassistant.components import zeroconf
@@ -12,10 +10,12 @@ from homeassistant.helpers import selector
 
 from .const import ATTR_END_TIME, ATTR_START_TIME, ATTR_TEMPERATURE, SCHEDULE_DAYS
 from .const import DAYS_OF_WEEK, HOLIDAY_DAYS
-from .const import DEVICE_ID, DOMAIN, NAME, MODEL, MAC, ENTRY_TYPE, SCHEDULE, THERMOSTAT, ATTR_THERMOSTAT
-from .events import Event
-from .helper import get_thermostat_devices
+from .const import DEVICE_ID, DOMAIN, NAME, MODEL, MAC, ENTRY_TYPE, THERMOSTAT, ATTR_THERMOSTAT
+from .events import ThermostatFrame
+from .helper import get_thermostat_devices, resolve_thermostat_device_id
 from .options_flow import OptionsFlowHandler
+from .schedule_store import async_get_schedule_store
+from .scheduler import parse_time
 from .websocket_client import WebSocketClient
 
 
@@ -53,13 +53,22 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
 
     async def async_step_schedule(self, user_input=None):
+        errors = {}
         if user_input is not None:
-            user_input[ENTRY_TYPE] = SCHEDULE
-            await self.async_set_unique_id(str(uuid.uuid4()))
-            return self.async_create_entry(title=user_input["name"], data=user_input)
+            device_id = resolve_thermostat_device_id(self.hass, user_input[ATTR_THERMOSTAT])
+            try:
+                user_input[ATTR_START_TIME] = parse_time(user_input[ATTR_START_TIME]).strftime("%H:%M")
+                user_input[ATTR_END_TIME] = parse_time(user_input[ATTR_END_TIME]).strftime("%H:%M")
+            except ValueError:
+                errors["base"] = "invalid_time"
+            if device_id is None:
+                errors["base"] = "thermostat_not_found"
+            if not errors:
+                async_get_schedule_store(self.hass).async_add(device_id, user_input)
+                return self.async_abort(reason="schedule_added")
 
         thermostats = await get_thermostat_devices(self.hass)
-        devices = [f"{thermostat['name']} ({thermostat['id']})"
+        devices = [selector.SelectOptionDict(value=thermostat['id'], label=thermostat['name'])
                    for thermostat in thermostats]
 
         return self.async_show_form(
@@ -79,6 +88,7 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 ),
                 vol.Required(HOLIDAY_DAYS, default=True) : bool
             }),
+            errors=errors,
         )
 
 
@@ -116,8 +126,8 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             client = WebSocketClient(f"ws://{self.selected_device["ip"]}/ws", self.handle_websocket_event)
 
             success = await client.connect()
+            await client.close()
             if not success:
-                del client
                 return self.async_show_form(
                     step_id="device",
                     errors={"base": "cannot_connect"},
@@ -134,7 +144,7 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             data_schema=self.get_device_selection_schema(),
         )
 
-    def handle_websocket_event(self, event: Event):
+    def handle_websocket_event(self, frame: ThermostatFrame):
         pass
 
     async def async_step_device_name(self, user_input=None):
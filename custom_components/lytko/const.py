@@ -17,6 +17,58 @@ THERMOSTAT = "THERMOSTAT"
 SCHEDULE_DAYS = "SCHEDULE_DAYS"
 HOLIDAY_DAYS = "HOLIDAY_DAYS"
 BASE_TEMPERATURE = "BASE_TEMPERATURE"
+DATA_SCHEDULER = "scheduler"
+SIGNAL_AVAILABILITY = "lytko_availability"
+LIVENESS_DEADLINE = "liveness_deadline"
+CONNECT_TIMEOUT = 10
+PING_INTERVAL = 10
+PING_TIMEOUT = 5
+RECONNECT_MIN_DELAY = 1
+RECONNECT_MAX_DELAY = 60
+SHUTDOWN_TIMEOUT = 5
+INBOUND_QUEUE_SIZE = 32
+COMMAND_DEBOUNCE = 0.5
+COMMAND_MAX_DELAY = 2
+ACK_TIMEOUT = 10
+COMMAND_RATE = 2
+COMMAND_BURST = 4
+COMMAND_RATE_LIMIT = "command_rate_limit"
+COMMAND_BURST_SIZE = "command_burst_size"
+AUTO_MIN_ON_TIME = 120
+AUTO_MIN_OFF_TIME = 120
+DATA_SENSOR_HUB = "sensor_hub"
+SENSOR_DEADBAND = 0.1
+SENSOR_MIN_INTERVAL = 10
+EXTERNAL_DEADBAND = "external_deadband"
+EXTERNAL_MIN_INTERVAL = "external_min_interval"
+EXTRA_THERMOMETERS = "extra_thermometers"
+FUSION_METHOD = "fusion_method"
+FUSION_MEDIAN = "median"
+FUSION_TRIMMED = "trimmed"
+FUSION_WEIGHTED = "weighted"
+FUSION_SAMPLES_PER_SENSOR = 3
+FUSION_TRIM = 0.2
+FUSION_PRIMARY_WEIGHT = 2
+DATA_CATALOG = "catalog"
+SIGNAL_CATALOG_UPDATED = "lytko_catalog_updated"
+DATA_STATE_CACHE = "state_cache"
+DATA_DISCOVERY = "discovery"
+HAP_SERVICE_TYPE = "_hap._tcp.local."
+DISCOVERY_TTL = 3600
+DISCOVERY_REQUEST_TIMEOUT = 3000
+CONNECT_STAGGER = 0.25
+COMMAND_DEBOUNCE_MS = "command_debounce_ms"
+DATA_CALENDAR = "calendar"
+SIGNAL_CALENDAR_UPDATED = "lytko_calendar_updated"
+SERVICE_RELOAD_CALENDARS = "reload_calendars"
+DATA_SCHEDULE_STORE = "schedule_store"
+SIGNAL_SCHEDULES_UPDATED = "lytko_schedules_updated"
+ATTR_SCHEDULE_ID = "schedule_id"
+ATTR_SCHEDULES = "schedules"
+SERVICE_ADD_SCHEDULE = "add_schedule"
+SERVICE_UPDATE_SCHEDULE = "update_schedule"
+SERVICE_DELETE_SCHEDULE = "delete_schedule"
+SERVICE_REPLACE_SCHEDULES = "replace_schedules"
 DAYS_OF_WEEK = ["Понедельник", "Вторник", "Среда", "Четверг", "Пятница", "Суббота", "Воскресенье"]
 days_map = {
         "Monday": "Понедельник",
@@ -27,124 +79,3 @@ days_map = {
         "Saturday": "Суббота",
         "Sunday": "Воскресенье",
     }
-
-holidays = [
-        "2025-01-01",
-        "2025-01-02",
-        "2025-01-03",
-        "2025-01-04",
-        "2025-01-05",
-        "2025-01-06",
-        "2025-01-07",
-        "2025-01-08",
-        "2025-01-11",
-        "2025-01-12",
-        "2025-01-18",
-        "2025-01-19",
-        "2025-01-25",
-        "2025-01-26",
-        "2025-02-01",
-        "2025-02-02",
-        "2025-02-08",
-        "2025-02-09",
-        "2025-02-15",
-        "2025-02-16",
-        "2025-02-22",
-        "2025-02-23",
-        "2025-03-01",
-        "2025-03-02",
-        "2025-03-08",
-        "2025-03-09",
-        "2025-03-15",
-        "2025-03-16",
-        "2025-03-22",
-        "2025-03-23",
-        "2025-03-29",
-        "2025-03-30",
-        "2025-04-05",
-        "2025-04-06",
-        "2025-04-12",
-        "2025-04-13",
-        "2025-04-19",
-        "2025-04-20",
-        "2025-04-26",
-        "2025-04-27",
-        "2025-05-01",
-        "2025-05-02",
-        "2025-05-03",
-        "2025-05-04",
-        "2025-05-08",
-        "2025-05-09",
-        "2025-05-10",
-        "2025-05-11",
-        "2025-05-17",
-        "2025-05-18",
-        "2025-05-24",
-        "2025-05-25",
-        "2025-05-31",
-        "2025-06-01",
-        "2025-06-07",
-        "2025-06-08",
-        "2025-06-12",
-        "2025-06-13",
-        "2025-06-14",
-        "2025-06-15",
-        "2025-06-21",
-        "2025-06-22",
-        "2025-06-28",
-        "2025-06-29",
-        "2025-07-05",
-        "2025-07-06",
-        "2025-07-12",
-        "2025-07-13",
-        "2025-07-19",
-        "2025-07-20",
-        "2025-07-26",
-        "2025-07-27",
-        "2025-08-02",
-        "2025-08-03",
-        "2025-08-09",
-        "2025-08-10",
-        "2025-08-16",
-        "2025-08-17",
-        "2025-08-23",
-        "2025-08-24",
-        "2025-08-30",
-        "2025-08-31",
-        "2025-09-06",
-        "2025-09-07",
-        "2025-09-13",
-        "2025-09-14",
-        "2025-09-20",
-        "2025-09-21",
-        "2025-09-27",
-        "2025-09-28",
-        "2025-10-04",
-        "2025-10-05",
-        "2025-10-11",
-        "2025-10-12",
-        "2025-10-18",
-        "2025-10-19",
-        "2025-10-25",
-        "2025-10-26",
-        "2025-11-02",
-        "2025-11-03",
-        "2025-11-04",
-        "2025-11-08",
-        "2025-11-09",
-        "2025-11-15",
-        "2025-11-16",
-        "2025-11-22",
-        "2025-11-23",
-        "2025-11-29",
-        "2025-11-30",
-        "2025-12-06",
-        "2025-12-07",
-        "2025-12-13",
-        "2025-12-14",
-        "2025-12-20",
-        "2025-12-21",
-        "2025-12-27",
-        "2025-12-28",
-        "2025-12-31"
-]
\ No newline at end of file
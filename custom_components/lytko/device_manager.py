@@ -1,24 +1,33 @@
 import asyncio
-import socket
+import time
+from dataclasses import asdict, fields
 
-from homeassistant.components import zeroconf
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import callback
 from homeassistant.helpers import device_registry as dr
 from homeassistant.helpers import entity_registry as er
 from homeassistant.helpers.device_registry import DeviceInfo
-from homeassistant.helpers.event import async_track_state_change
-from zeroconf import Zeroconf, ServiceStateChange, IPVersion
-from zeroconf._services.info import AsyncServiceInfo
-from zeroconf.asyncio import AsyncServiceBrowser
+from homeassistant.helpers.dispatcher import async_dispatcher_send
 from .conf import LOGGER
-from .const import ALICE_LOGIN, ALICE_PASSWORD, SELECTED_THERMOMETER
+from .discovery import async_get_discovery
+from .const import ALICE_LOGIN, ALICE_PASSWORD, SELECTED_THERMOMETER, BASE_TEMPERATURE, LIVENESS_DEADLINE
+from .const import SHUTDOWN_TIMEOUT, COMMAND_DEBOUNCE, COMMAND_DEBOUNCE_MS, ACK_TIMEOUT
+from .const import COMMAND_RATE, COMMAND_BURST, COMMAND_RATE_LIMIT, COMMAND_BURST_SIZE
+from .const import SENSOR_DEADBAND, SENSOR_MIN_INTERVAL, EXTERNAL_DEADBAND, EXTERNAL_MIN_INTERVAL
+from .const import EXTRA_THERMOMETERS, FUSION_METHOD, FUSION_MEDIAN, FUSION_PRIMARY_WEIGHT
 from .const import DEVICE_ID, MODEL, MAC, NAME
+from .entity import availability_signal
 from .events import AliceSettingsEvent
-from .events import Event, HeatingEvent, TargetTemperatureEvent, CurrentTemperatureEvent, ChildLockEvent, \
-    ThermostatSettingsEvent
-from .exceptions import AliceAuthError
-from .websocket_client import WebSocketClient
+from .events import Event, HeatingEvent, TargetTemperatureEvent, ThermostatFrame
+from .exceptions import DeviceNotConnectedError
+from .fusion import SensorFusion
+from .inbound import FrameQueue
+from .outbound import CommandQueue, Priority, TokenBucket
+from .sensor_hub import async_get_sensor_hub
+from .shadow import DeviceShadow
+from .state_cache import async_get_state_cache
+from .timeline import ThermostatTimeline
+from .websocket_client import WebSocketClient, address_uri
 
 
 class DeviceManager:
@@ -32,7 +41,8 @@ class DeviceManager:
         self.external_sensor_id = self.device_id + "_external"
         self.hass = hass
         self.config = config
-        self.uri = f"ws://{self.config.data['ip']}/ws"
+        self.uri = address_uri(self.config.data['ip'])
+        self._addresses: tuple[str, ...] = ()
         self.client = None
         self.thermostat = None
         self.child_lock = None
@@ -41,7 +51,9 @@ class DeviceManager:
         self.entity_registry = er.async_get(self.hass)
         self.external_sensor_working = False
         self.external_sensor = None
+        self.fusion: SensorFusion | None = None
         self._sensor_subscription = None
+        self._discovery_subscription = None
         self.device_info = DeviceInfo(
             connections={(dr.CONNECTION_NETWORK_MAC, self.config.data[MAC])},
             manufacturer="Lytko",
@@ -52,53 +64,220 @@ class DeviceManager:
             hw_version="1",
             serial_number=self.config.unique_id
         )
-        self.schedule_tasks = []
+        self._tasks: set[asyncio.Task] = set()
+        self.inbound = FrameQueue()
+        self.outbound = CommandQueue(
+            self._write_command,
+            debounce=self.config.options.get(COMMAND_DEBOUNCE_MS, COMMAND_DEBOUNCE * 1000) / 1000,
+            bucket=TokenBucket(
+                self.config.options.get(COMMAND_RATE_LIMIT, COMMAND_RATE),
+                self.config.options.get(COMMAND_BURST_SIZE, COMMAND_BURST),
+            ),
+        )
+        self.shadow = DeviceShadow(hass, self.device_id)
+        self.state_cache = async_get_state_cache(hass)
+        self._last_frame = ThermostatFrame()
+        self._converged = False
+        self.restored = False
+        self.frames_received = 0
+        self.state_writes = 0
+        self._options = dict(config.options)
+        self._identity = (config.data.get("ip"), config.data[MAC])
+        self.reconfigurations = 0
+        self._created_at = time.monotonic()
+        self.setup_seconds: float | None = None
+        self.first_connect_seconds: float | None = None
+        self.last_reconfigure_seconds = None
+        self.timeline = ThermostatTimeline(hass, self)
 
         config.async_on_unload(config.add_update_listener(self.config_update_listener))
 
+    def _spawn(self, coro, name: str) -> asyncio.Task:
+        """Запускаем фоновую задачу устройства; stop() гарантированно её завершит."""
+        task = asyncio.create_task(coro, name=f"lytko {self.device_id} {name}")
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
     async def stop(self):
-        for task in self.schedule_tasks:
-            task()
+        """Останавливаем все задачи и соединение устройства за ограниченное время."""
+        self.timeline.async_shutdown()
+        self.outbound.shutdown()
+        if self._sensor_subscription:
+            self._sensor_subscription()
+            self._sensor_subscription = None
+        if self._discovery_subscription:
+            self._discovery_subscription()
+            self._discovery_subscription = None
 
-        self.schedule_tasks = []
+        tasks = set(self._tasks)
+        for task in tasks:
+            task.cancel()
         await self.client.close()
+        await self.shadow.async_flush()
+        if tasks:
+            _, pending = await asyncio.wait(tasks, timeout=SHUTDOWN_TIMEOUT)
+            if pending:
+                LOGGER.warning(f"Термостат {self.device_id}: {len(pending)} задач не завершились за {SHUTDOWN_TIMEOUT} с")
 
     async def config_update_listener(self, hass, entry):
-        if entry.options.get(ALICE_LOGIN) and entry.options.get(ALICE_PASSWORD):
-            try:
-                await self.send_device_command(
-                    AliceSettingsEvent(login=entry.options.get(ALICE_LOGIN),
-                                       password=entry.options.get(ALICE_PASSWORD))
-                )
-            except:
-                raise AliceAuthError("Не удалось привязать устройство к Алисе.")
-
-    async def _async_on_service_state_change(self, zeroconf: Zeroconf, service_type: str, name: str, state_change: ServiceStateChange) -> None:
-        info = AsyncServiceInfo(service_type, name)
-        await info.async_request(zeroconf, 3000)
-        if info:
-            if b'id' in info.properties:
-                if info.properties.get(b'id') == bytes(self.config.data[MAC], 'utf-8'):
-                    new_uri = f"ws://{socket.inet_ntoa(info.addresses_by_version(IPVersion.V4Only)[0])}/ws"
-                    if self.uri != new_uri:
-                        await self.client.close()
-                        del self.client
-                        self.uri = new_uri
-                        self.client = WebSocketClient(self.uri, self.handle_event_wrapper)
-                        await self.client.connect()
-
-    def _on_service_state_change(self, zeroconf: Zeroconf, service_type: str, name: str, state_change: ServiceStateChange) -> None:
-        asyncio.ensure_future(self._async_on_service_state_change(zeroconf, service_type, name,state_change))
-
-    async def search_ip(self):
-        aiozc = await zeroconf.async_get_async_instance(self.hass)
-        await aiozc.zeroconf.async_wait_for_start()
-        browser = AsyncServiceBrowser(aiozc.zeroconf, ["_hap._tcp.local."], handlers=[self._on_service_state_change])
-        await asyncio.sleep(10)
-        await browser.async_cancel()
-        await aiozc.async_close()
+        """Применяем изменённые настройки на лету; перезагрузка — только при смене IP или MAC."""
+        if (entry.data.get("ip"), entry.data[MAC]) != self._identity:
+            hass.async_create_task(hass.config_entries.async_reload(entry.entry_id))
+            return
+
+        started = time.monotonic()
+        old, new = self._options, dict(entry.options)
+        self._options = new
+        changed = {key for key in old.keys() | new.keys() if old.get(key) != new.get(key)}
+        if not changed:
+            return
+
+        if changed & {ALICE_LOGIN, ALICE_PASSWORD} and new.get(ALICE_LOGIN) and new.get(ALICE_PASSWORD):
+            await self.send_device_command(
+                AliceSettingsEvent(login=new.get(ALICE_LOGIN), password=new.get(ALICE_PASSWORD))
+            )
+        if changed & {SELECTED_THERMOMETER, EXTRA_THERMOMETERS, FUSION_METHOD, EXTERNAL_DEADBAND, EXTERNAL_MIN_INTERVAL}:
+            await self.update_sensor_subscription(new.get(SELECTED_THERMOMETER))
+        if COMMAND_DEBOUNCE_MS in changed:
+            self.outbound.debounce = new.get(COMMAND_DEBOUNCE_MS, COMMAND_DEBOUNCE * 1000) / 1000
+        if changed & {COMMAND_RATE_LIMIT, COMMAND_BURST_SIZE}:
+            self.outbound.bucket.rate = new.get(COMMAND_RATE_LIMIT, COMMAND_RATE)
+            self.outbound.bucket.burst = new.get(COMMAND_BURST_SIZE, COMMAND_BURST)
+        if LIVENESS_DEADLINE in changed and self.client is not None:
+            # Действует со следующего ожидания кадра, соединение не рвём.
+            self.client.stale_after = new.get(LIVENESS_DEADLINE) or None
+        if BASE_TEMPERATURE in changed:
+            self.timeline.async_base_temperature_changed()
+        if self.thermostat and self.thermostat.entity_id:
+            self.thermostat.async_write_ha_state()
+
+        self.reconfigurations += 1
+        self.last_reconfigure_seconds = time.monotonic() - started
+        LOGGER.debug(f"Термостат {self.device_id}: настройки {sorted(changed)} применены "
+                     f"за {self.last_reconfigure_seconds * 1000:.1f} мс без перезагрузки")
+
+    def _candidates(self) -> dict[str, str]:
+        """URI -> адрес: сохранённый IP и всё, что нашёл поиск; порядок задаёт очерёдность попыток."""
+        addresses = [self.config.data["ip"], *self._addresses]
+        return {address_uri(address): address for address in addresses}
+
+    @callback
+    def _on_addresses(self, addresses: tuple[str, ...]):
+        """Поиск нашёл адреса устройства: следующая попытка подключения пройдёт по всем сразу."""
+        if addresses == self._addresses:
+            return
+        self._addresses = addresses
+        if self.client is not None:
+            self.client.set_candidates(list(self._candidates()))
+
+    @callback
+    def _remember_address(self):
+        """Запоминаем в записи адрес, который ответил, чтобы следующий старт подключился с первой попытки."""
+        address = self._candidates().get(self.client.uri)
+        if address is None or address == self.config.data.get("ip"):
+            return
+        LOGGER.info(f"Термостат {self.device_id} сменил адрес: {self.config.data.get('ip')} -> {address}")
+        # Смена адреса, найденная поиском, не требует перезагрузки записи.
+        self._identity = (address, self.config.data[MAC])
+        self.hass.config_entries.async_update_entry(self.config, data={**self.config.data, "ip": address})
+
+    def _create_client(self, uri: str) -> WebSocketClient:
+        return WebSocketClient(
+            uri,
+            self.inbound.put,
+            self.handle_availability,
+            stale_after=self.config.options.get(LIVENESS_DEADLINE) or None,
+            candidates=list(self._candidates()),
+            failure_handler=self.handle_connect_failed,
+        )
+
+    def diagnostics(self) -> dict:
+        """Счётчики устройства для диагностики."""
+        return {
+            "available": self.available,
+            "restored": self.restored,
+            "uri": self.uri,
+            "shadow": {
+                "converged": self.shadow.converged,
+                "desired": self.shadow.desired,
+                "reported": self.shadow.reported,
+                "dirty": sorted(self.shadow.dirty),
+                "replayed": self.shadow.replayed,
+            },
+            "frames_received": self.frames_received,
+            "setup_seconds": self.setup_seconds,
+            "first_connect_seconds": self.first_connect_seconds,
+            "reconfigurations": self.reconfigurations,
+            "last_reconfigure_seconds": self.last_reconfigure_seconds,
+            "state_writes": self.state_writes,
+            "connection": asdict(self.client.stats) if self.client else None,
+            "outbound": {
+                "depth": self.outbound.depth,
+                "submitted": self.outbound.submitted,
+                "sent": self.outbound.sent,
+                "superseded": self.outbound.superseded,
+                "rejected": self.outbound.rejected,
+                "failed": self.outbound.failed,
+                "in_flight": self.outbound.in_flight,
+                "acked": self.outbound.acked,
+                "ack_timeouts": self.outbound.timeouts,
+                "last_ack_latency": self.outbound.last_latency,
+                "throttled": self.outbound.throttled,
+                "throttled_seconds": round(self.outbound.throttled_seconds, 3),
+                "tokens": round(self.outbound.bucket.tokens, 2),
+            },
+            "inbound": {
+                "depth": self.inbound.depth,
+                "max_depth": self.inbound.max_depth,
+                "received": self.inbound.received,
+                "coalesced": self.inbound.coalesced,
+            },
+        }
+
+    @property
+    def available(self) -> bool:
+        return self.client is not None and self.client.connected
+
+    @property
+    def entities_available(self) -> bool:
+        """Сущности видны при связи, а с сохранённым состоянием — и до первой неудачной попытки подключения."""
+        return self.available or self.restored
+
+    @callback
+    def handle_connect_failed(self):
+        """Первая попытка подключения не удалась: сохранённое состояние больше не выдаём за текущее."""
+        if self.restored:
+            self.restored = False
+            async_dispatcher_send(self.hass, availability_signal(self.device_id))
+
+    @callback
+    def handle_availability(self, available: bool):
+        """Связь с устройством потеряна или восстановлена: перерисовываем все сущности."""
+        LOGGER.info(f"Термостат {self.device_id} {'на связи' if available else 'недоступен'}")
+        if available and self.first_connect_seconds is None:
+            self.first_connect_seconds = time.monotonic() - self._created_at
+        if available:
+            self.restored = False
+            self._remember_address()
+        if not available:
+            self.shadow.disconnected()
+        self._converged = self.shadow.converged
+        async_dispatcher_send(self.hass, availability_signal(self.device_id))
+
+    @callback
+    def _check_converged(self):
+        # Флаг сходимости показывается в атрибутах термостата, перерисовываем сущности только при его смене.
+        if self._converged != self.shadow.converged:
+            self._converged = self.shadow.converged
+            async_dispatcher_send(self.hass, availability_signal(self.device_id))
 
     async def initialize(self):
+        """Готовим сущности и запускаем фоновые задачи; соединения не ждём.
+
+        До первого ответа устройства сущности показывают сохранённое состояние с отметкой
+        `restored`; если первая попытка подключения не удалась, они становятся недоступны.
+        """
         from .climate import ThermostatClimate
         from .switch import ChildLockSwitch
         from .number import BaseTemperature
@@ -106,87 +285,196 @@ class DeviceManager:
         self.thermostat = ThermostatClimate(self.hass, self, self.config)
         self.child_lock = ChildLockSwitch(self.hass, self, self.config)
         self.base_temperature = BaseTemperature(self.hass, self, self.config)
+        await self.shadow.async_load()
+        self._restore_state()
 
-        self.client = WebSocketClient(self.uri, self.handle_event_wrapper)
-        await self.client.connect()
+        self._spawn(self._consume_frames(), "inbound")
+        self._spawn(self.outbound.run(), "outbound")
+        self.client = self._create_client(self.uri)
+        self.client.start()
 
         await self.update_sensor_subscription(self.config.options.get(SELECTED_THERMOMETER))
 
-        asyncio.create_task(self.search_ip())
+        discovery = async_get_discovery(self.hass)
+        self._discovery_subscription = discovery.async_subscribe(self.config.data[MAC], self._on_addresses)
+        if addresses := discovery.async_addresses(self.config.data[MAC]):
+            self._on_addresses(addresses)
+        self.setup_seconds = time.monotonic() - self._created_at
+
+    def _restore_state(self):
+        """Показываем последнее известное состояние до первого живого кадра."""
+        cached = self.state_cache.async_get(self.device_id)
+        if cached.get("auto") and self.config.options.get(SELECTED_THERMOMETER):
+            # В AUTO уставка устройства — служебный максимум, уставка комнаты хранится отдельно.
+            self.thermostat.automatic_external_sensor = True
+            self.thermostat._target_temperature = cached.get("auto_target")
+            self.external_sensor_working = True
+        frame = cached.get("frame")
+        if frame:
+            self.restored = True
+            self._last_frame = ThermostatFrame(**{field.name: frame.get(field.name) for field in fields(ThermostatFrame)})
+            self._apply_to_entities(self._last_frame)
+        if "child_lock" in cached:
+            self.child_lock._state = cached["child_lock"]
 
     async def update_sensor_subscription(self, selected_sensor):
-        """Update the subscription to the selected external sensor."""
+        """Update the subscription to the selected external sensor.
+
+        Дополнительные датчики комнаты из настроек объединяются с выбранным в одно значение.
+        """
         if self._sensor_subscription:
             self._sensor_subscription()
             self._sensor_subscription = None
 
         self.external_sensor = selected_sensor
+        self.fusion = None
 
         if not selected_sensor:
             self.external_sensor_working = False
+            if self.thermostat is not None:
+                await self.thermostat.async_external_sensor_removed()
             return
 
-        current_state = self.hass.states.get(selected_sensor)
-        await self.handle_external_sensor_state(current_state)
-
-        return async_track_state_change(
-            self.hass,
-            selected_sensor,
-            self.handle_external_sensor_state_change,
-        )
+        sensors = [selected_sensor]
+        sensors += [sensor for sensor in self.config.options.get(EXTRA_THERMOMETERS) or [] if sensor not in sensors]
+        if len(sensors) > 1:
+            self.fusion = SensorFusion(
+                method=self.config.options.get(FUSION_METHOD, FUSION_MEDIAN),
+                weights={selected_sensor: FUSION_PRIMARY_WEIGHT},
+            )
+
+        hub = async_get_sensor_hub(self.hass)
+        unsubs = [
+            hub.async_subscribe(
+                sensor,
+                self._external_listener(sensor),
+                deadband=self.config.options.get(EXTERNAL_DEADBAND, SENSOR_DEADBAND),
+                min_interval=self.config.options.get(EXTERNAL_MIN_INTERVAL, SENSOR_MIN_INTERVAL),
+            )
+            for sensor in sensors
+        ]
+
+        @callback
+        def unsubscribe():
+            for unsub in unsubs:
+                unsub()
+
+        self._sensor_subscription = unsubscribe
+
+    def _external_listener(self, sensor: str):
+        @callback
+        def listener(temperature: float | None):
+            if self.fusion is not None:
+                temperature = self.fusion.add(sensor, temperature)
+            self.handle_external_temperature(temperature)
+
+        return listener
 
     @callback
-    async def handle_external_sensor_state_change(self, entity_id: str, old_state, new_state):
-        await self.handle_external_sensor_state(new_state)
-
-    async def handle_external_sensor_state(self, new_state):
-        if new_state and new_state.state != "unavailable" and new_state.state != "unknown":
+    def handle_external_temperature(self, temperature: float | None):
+        # Пропавший датчик не сбрасывает последнее известное значение.
+        if temperature is not None and self.thermostat is not None:
+            self.thermostat.set_current_external_temperature(temperature)
+
+    async def _consume_frames(self):
+        """Единственный потребитель входящих кадров: порядок применения совпадает с порядком прихода."""
+        while True:
+            frame = await self.inbound.get()
             try:
-                temperature = float(new_state.state)
-                try:
-                    await self.thermostat.set_current_external_temperature(temperature)
-                except:
-                    pass
-            except (ValueError, TypeError):
-                LOGGER.warning(f"Invalid temperature value from sensor {self.external_sensor}: {new_state.state}")
-
-
-    def handle_event_wrapper(self, event: Event):
-        asyncio.create_task(self.handle_event(event))
-
-    async def handle_event(self, event: Event):
-        try:
-            if isinstance(event, TargetTemperatureEvent):
-                if not self.external_sensor_working:
-                    await self.handle_target_temperature_event(event)
-            elif isinstance(event, CurrentTemperatureEvent):
-                await self.handle_current_temperature_event(event)
-            elif isinstance(event, HeatingEvent):
-                await self.handle_heating_event(event)
-            elif isinstance(event, ChildLockEvent):
-                await self.handle_child_lock_event(event)
-            elif isinstance(event, ThermostatSettingsEvent):
-                await self.handle_thermostat_settings(event)
-        except:
-            pass
-
-    async def handle_thermostat_settings(self, event: ThermostatSettingsEvent):
-        await self.thermostat.set_settings(temp_min=event.target_min, temp_max=event.target_max, step=event.step)
-        await self.base_temperature.set_settings(temp_min=event.target_min, temp_max=event.target_max, step=event.step)
-
-    async def handle_current_temperature_event(self, event: CurrentTemperatureEvent):
-        if not self.external_sensor_working:
-            await self.thermostat.set_current_temperature(event.temperature)
-
-    async def handle_target_temperature_event(self, event: TargetTemperatureEvent):
-        await self.thermostat.set_target_temperature(event.temperature)
-
-    async def handle_heating_event(self, event: HeatingEvent):
-        await self.thermostat.set_heating(event.heating_on)
+                self.handle_frame(frame)
+            except Exception:
+                LOGGER.exception(f"Ошибка обработки кадра термостата {self.device_id}")
 
-    async def handle_child_lock_event(self, event: ChildLockEvent):
-        await self.child_lock.set_state(event.on)
+    @callback
+    def handle_frame(self, frame: ThermostatFrame):
+        """Применяем кадр: каждая сущность пишет состояние не больше одного раза."""
+        self.frames_received += 1
+        self.outbound.handle_frame(frame)
+        replay = self.shadow.apply_frame(frame)
+        if replay:
+            LOGGER.info(f"Термостат {self.device_id}: досылаем {len(replay)} команд после переподключения")
+            for event in replay:
+                self.outbound.submit(event, Priority.USER)
+        self._check_converged()
+        self._apply_to_entities(frame)
+
+        merged = self._last_frame.merged(frame)
+        if merged != self._last_frame:
+            self._last_frame = merged
+            self.state_cache.async_update(self.device_id, frame=asdict(merged))
 
-    async def send_device_command(self, event: Event):
-        await self.client.send(event)
+    @callback
+    def _apply_to_entities(self, frame: ThermostatFrame):
+        climate = {}
+        settings = {}
+        if frame.heating is not None:
+            climate["_heating"] = frame.heating
+        if not self.external_sensor_working:
+            if frame.target_temperature is not None:
+                climate["_target_temperature"] = frame.target_temperature
+            if frame.current_temperature is not None:
+                climate["_current_temperature"] = frame.current_temperature
+        if frame.target_min is not None:
+            settings["temp_min"] = frame.target_min
+        if frame.target_max is not None:
+            settings["temp_max"] = frame.target_max
+        if frame.step is not None:
+            settings["step"] = frame.step
+        climate.update(settings)
+
+        for entity, values in ((self.thermostat, climate), (self.base_temperature, settings)):
+            if values and entity.apply_reported(values):
+                self.state_writes += 1
+
+    async def send_device_command(self, event: Event, priority: Priority = Priority.USER):
+        """Ставим команду в очередь устройства; повторные команды одной настройки схлопываются."""
+        self._submit(event, priority)
+
+    def _submit(self, event: Event, priority: Priority) -> asyncio.Future:
+        if not self.available:
+            # Без связи команду не ставим в очередь: тень переотправит её после переподключения.
+            self.shadow.record(event)
+            self._check_converged()
+            future = self.hass.loop.create_future()
+            future.set_exception(DeviceNotConnectedError(f"Нет соединения с {self.device_id}"))
+            future.exception()  # вызывающий может не ждать результата
+            return future
+        future = self.outbound.submit(event, priority)
+        if not future.done():
+            # Отклонённая по приоритету команда желаемое состояние не меняет.
+            self.shadow.record(event)
+            self._check_converged()
+        return future
+
+    async def async_send_command_acked(self, event: Event, priority: Priority = Priority.USER,
+                                       timeout: float = ACK_TIMEOUT) -> float:
+        """Отправляем команду и ждём, пока устройство её подтвердит; возвращает задержку в секундах.
+
+        Несколько таких вызовов идут конвейером: писатель не ждёт подтверждений.
+        """
+        return await asyncio.wait_for(asyncio.shield(self._submit(event, priority)), timeout)
+
+    async def _write_command(self, event: Event):
+        if await self.client.send(event):
+            self.shadow.written(event)
+            self._check_converged()
+
+    async def async_apply_schedule(self, temperature: float | None):
+        """Применяем уставку расписания; None — вне окон, возврат к глобальной уставке."""
+        if temperature is None:
+            temperature = float(self.config.options.get(BASE_TEMPERATURE, "20"))
+        results = await asyncio.gather(
+            self.async_send_command_acked(TargetTemperatureEvent(temperature=temperature), Priority.SCHEDULE),
+            self.async_send_command_acked(HeatingEvent(heating_on=True), Priority.SCHEDULE),
+            return_exceptions=True,
+        )
+        errors = [result for result in results if isinstance(result, BaseException)]
+        if errors and all(isinstance(error, DeviceNotConnectedError) for error in errors):
+            LOGGER.debug(f"Термостат {self.device_id} недоступен, расписание применится после переподключения")
+        elif errors:
+            LOGGER.error(f"Ошибка при применении расписания: {errors[0]!r}")
+        else:
+            LOGGER.debug(f"Расписание {self.device_id} применено за {max(results):.2f} с")
+        if self.thermostat and self.thermostat.entity_id:
+            self.thermostat.async_write_ha_state()
 
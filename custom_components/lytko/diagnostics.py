@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN, ALICE_LOGIN, ALICE_PASSWORD, MAC
+from .device_manager import DeviceManager
+from .scheduler import async_get_engine
+
+TO_REDACT = {ALICE_LOGIN, ALICE_PASSWORD, MAC}
+
+
+async def async_get_config_entry_diagnostics(hass: HomeAssistant, entry: ConfigEntry) -> dict[str, Any]:
+    """Диагностика записи: настройки и счётчики работы устройства."""
+    data: dict[str, Any] = {
+        "data": async_redact_data(dict(entry.data), TO_REDACT),
+        "options": async_redact_data(dict(entry.options), TO_REDACT),
+        "scheduler": async_get_engine(hass).diagnostics(),
+    }
+    manager = hass.data.get(DOMAIN, {}).get(entry.entry_id)
+    if isinstance(manager, DeviceManager):
+        data["device"] = manager.diagnostics()
+    return data
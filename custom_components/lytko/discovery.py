@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import ipaddress
+import time
+from typing import Callable
+
+from homeassistant.components import zeroconf
+from homeassistant.core import HomeAssistant, callback
+from zeroconf import Zeroconf, ServiceStateChange, IPVersion
+from zeroconf._services.info import AsyncServiceInfo
+from zeroconf.asyncio import AsyncServiceBrowser
+
+from .conf import LOGGER
+from .const import DOMAIN, DATA_DISCOVERY, HAP_SERVICE_TYPE, DISCOVERY_TTL, DISCOVERY_REQUEST_TIMEOUT
+
+
+def _candidates(info: AsyncServiceInfo) -> tuple[str, ...]:
+    """Адреса для подключения: IPv4, затем глобальные IPv6, затем имя хоста .local."""
+    addresses = list(info.parsed_addresses(IPVersion.V4Only))
+    addresses += [
+        address for address in info.parsed_addresses(IPVersion.V6Only)
+        if not ipaddress.ip_address(address).is_link_local
+    ]
+    if info.server:
+        addresses.append(info.server.rstrip("."))
+    return tuple(addresses)
+
+
+class LytkoDiscovery:
+    """Один браузер zeroconf на всю интеграцию и кэш MAC -> адреса устройства.
+
+    Браузер работает, пока есть хоть один подписчик, поэтому смена адреса
+    замечается в любой момент, а не только в первые секунды после старта.
+    О новом адресе узнаёт только менеджер устройства с этим MAC.
+    """
+
+    def __init__(self, hass: HomeAssistant):
+        self.hass = hass
+        self._browser: AsyncServiceBrowser | None = None
+        self._listeners: dict[str, Callable[[tuple[str, ...]], None]] = {}
+        self._addresses: dict[str, tuple[tuple[str, ...], float]] = {}
+        self._names: dict[str, str] = {}
+        self._inflight: set[str] = set()
+        self.lookups = 0
+        self.changes = 0
+
+    @callback
+    def async_subscribe(self, mac: str, listener: Callable[[tuple[str, ...]], None]) -> Callable[[], None]:
+        """Сообщать `listener` новые адреса устройства `mac`."""
+        self._listeners[mac] = listener
+        if self._browser is None:
+            self.hass.async_create_background_task(self._async_start(), "lytko discovery start")
+
+        @callback
+        def unsubscribe() -> None:
+            if self._listeners.get(mac) is listener:
+                del self._listeners[mac]
+            if not self._listeners and self._browser is not None:
+                browser, self._browser = self._browser, None
+                self.hass.async_create_background_task(browser.async_cancel(), "lytko discovery stop")
+
+        return unsubscribe
+
+    @callback
+    def async_addresses(self, mac: str) -> tuple[str, ...]:
+        """Адреса из кэша, если они не старше DISCOVERY_TTL."""
+        cached = self._addresses.get(mac)
+        if cached is None or time.monotonic() - cached[1] > DISCOVERY_TTL:
+            return ()
+        return cached[0]
+
+    async def _async_start(self) -> None:
+        if self._browser is not None:
+            return
+        # Общий экземпляр Home Assistant: закрывать его нельзя, он нужен другим интеграциям.
+        aiozc = await zeroconf.async_get_async_instance(self.hass)
+        if self._browser is not None or not self._listeners:
+            return
+        self._browser = AsyncServiceBrowser(aiozc.zeroconf, [HAP_SERVICE_TYPE], handlers=[self._on_service_state_change])
+
+    def _on_service_state_change(self, zeroconf: Zeroconf, service_type: str, name: str,
+                                 state_change: ServiceStateChange) -> None:
+        if state_change is ServiceStateChange.Removed:
+            mac = self._names.pop(name, None)
+            if mac is not None:
+                self._addresses.pop(mac, None)
+            return
+        if name in self._inflight:
+            return
+        self._inflight.add(name)
+        self.hass.async_create_background_task(
+            self._async_lookup(zeroconf, service_type, name), f"lytko discovery {name}"
+        )
+
+    async def _async_lookup(self, zc: Zeroconf, service_type: str, name: str) -> None:
+        try:
+            self.lookups += 1
+            info = AsyncServiceInfo(service_type, name)
+            if not await info.async_request(zc, DISCOVERY_REQUEST_TIMEOUT):
+                return
+            device = info.properties.get(b'id')
+            if not device:
+                return
+            addresses = _candidates(info)
+            if addresses:
+                self._update(device.decode(), name, addresses)
+        finally:
+            self._inflight.discard(name)
+
+    @callback
+    def _update(self, mac: str, name: str, addresses: tuple[str, ...]) -> None:
+        self._names[name] = mac
+        previous = self._addresses.get(mac)
+        self._addresses[mac] = (addresses, time.monotonic())
+        if previous is not None and previous[0] == addresses:
+            return
+        listener = self._listeners.get(mac)
+        if listener is not None:
+            self.changes += 1
+            LOGGER.debug(f"Устройство {mac} найдено по адресам {', '.join(addresses)}")
+            listener(addresses)
+
+
+def async_get_discovery(hass: HomeAssistant) -> LytkoDiscovery:
+    """Общий для всей интеграции поиск устройств."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    discovery = domain_data.get(DATA_DISCOVERY)
+    if discovery is None:
+        discovery = domain_data[DATA_DISCOVERY] = LytkoDiscovery(hass)
+    return discovery
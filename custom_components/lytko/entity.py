@@ -0,0 +1,45 @@
+from typing import Any
+
+from homeassistant.core import callback
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
+from homeassistant.helpers.entity import Entity
+
+from .const import SIGNAL_AVAILABILITY
+
+
+def availability_signal(device_id: str) -> str:
+    return f"{SIGNAL_AVAILABILITY}_{device_id}"
+
+
+class LytkoEntity(Entity):
+    """Базовая сущность Lytko: состояние только по push от устройства, без опроса.
+
+    Ожидает атрибут `device_manager` и по умолчанию доступна, пока есть связь с устройством
+    или пока показывает сохранённое состояние до первой попытки подключения.
+    """
+
+    _attr_should_poll = False
+
+    @property
+    def available(self) -> bool:
+        return self.device_manager.entities_available
+
+    async def async_added_to_hass(self) -> None:
+        self.async_on_remove(
+            async_dispatcher_connect(
+                self.hass, availability_signal(self.device_manager.device_id), self.async_write_ha_state
+            )
+        )
+
+    @callback
+    def apply_reported(self, values: dict[str, Any]) -> bool:
+        """Применяем значения кадра и пишем состояние один раз, только если что-то изменилось."""
+        changed = False
+        for attribute, value in values.items():
+            if getattr(self, attribute) != value:
+                setattr(self, attribute, value)
+                changed = True
+        if changed and self.entity_id is not None:
+            self.async_write_ha_state()
+            return True
+        return False
@@ -1,21 +1,20 @@
-import asyncio
-import json
-import os
-from datetime import datetime, timedelta
+from typing import Any
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import entity_registry as er
 from homeassistant.helpers.device_registry import DeviceInfo
-from homeassistant.helpers.entity import Entity
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.event import async_track_time_interval
 
-from .const import holidays, BASE_TEMPERATURE
-from .conf import LOGGER
-from .const import ATTR_TEMPERATURE, ATTR_START_TIME, ATTR_END_TIME, ATTR_THERMOSTAT, DOMAIN, ENTRY_TYPE, THERMOSTAT, \
-    SCHEDULE_DAYS, HOLIDAY_DAYS, days_map
+from .const import DAYS_OF_WEEK
+from .const import ATTR_TEMPERATURE, ATTR_START_TIME, ATTR_END_TIME, DOMAIN, NAME, SCHEDULE_DAYS, HOLIDAY_DAYS
 from .device_manager import DeviceManager
-from .events import TargetTemperatureEvent, HeatingEvent
+from .entity import LytkoEntity
+from .schedule_store import async_get_schedule_store, schedule_signal
+from .schedule_store import ACTION_ADDED, ACTION_UPDATED, ACTION_DELETED, ACTION_REPLACED
+from .scheduler import parse_time
+from .timeline import ScheduleWindow
 
 
 async def async_setup_entry(
@@ -23,58 +22,102 @@ async def async_setup_entry(
         config_entry: ConfigEntry,
         async_add_entities: AddEntitiesCallback,
 ):
-    config_entries = hass.config_entries.async_entries()
-    thermostat_name_with_id = config_entry.data.get(ATTR_THERMOSTAT)
-    thermostat_id = thermostat_name_with_id.split("(")[-1].split(")")[0]
-    thermostat_manager = None
-
-    count = 0
-    while thermostat_manager is None:
-        for entry in config_entries:
-            if entry.unique_id is not None and entry.unique_id in thermostat_id:
-                if entry.entry_id in hass.data[DOMAIN] and entry.data.get(ENTRY_TYPE) == THERMOSTAT:
-                    thermostat_manager = hass.data[DOMAIN][entry.entry_id]
-                    break
-
-        await asyncio.sleep(1)
-        count += 1
-        if count == 10:
-            break
-
-    if thermostat_manager is None:
-        await hass.config_entries.async_remove(config_entry.entry_id)
-        return
-
-    schedule_entity = ThermostatScheduleEntity(
-        hass=hass,
-        unique_id=config_entry.unique_id,
-        name=config_entry.title,
-        temperature=config_entry.data.get(ATTR_TEMPERATURE, 0),
-        start_time=config_entry.data.get(ATTR_START_TIME, 0),
-        end_time=config_entry.data.get(ATTR_END_TIME, 0),
-        thermostat_manager=thermostat_manager,
-        schedule_days=config_entry.data.get(SCHEDULE_DAYS),
-        holiday_days=config_entry.data.get(HOLIDAY_DAYS),
-    )
-    async_add_entities([schedule_entity])
-
-class ThermostatScheduleEntity(Entity):
-    def __init__(self, hass, unique_id, name, temperature, start_time, end_time, schedule_days, holiday_days, thermostat_manager: DeviceManager):
+    """Сущности расписаний термостата из общего хранилища."""
+    thermostat_manager: DeviceManager = hass.data[DOMAIN][config_entry.entry_id]
+    device_id = thermostat_manager.device_id
+    store = async_get_schedule_store(hass)
+    entities: dict[str, ThermostatScheduleEntity] = {}
+
+    def create(schedule_id: str, data: dict[str, Any]) -> "ThermostatScheduleEntity":
+        entity = entities[schedule_id] = ThermostatScheduleEntity(hass, schedule_id, data, thermostat_manager)
+        return entity
+
+    @callback
+    def remove(schedule_id: str) -> None:
+        thermostat_manager.timeline.async_remove_window(schedule_id)
+        entity = entities.pop(schedule_id)
+        registry = er.async_get(hass)
+        if entity.entity_id and registry.async_get(entity.entity_id):
+            registry.async_remove(entity.entity_id)
+        else:
+            hass.async_create_task(entity.async_remove())
+
+    @callback
+    def schedules_replaced() -> None:
+        # Сущности с прежними идентификаторами обновляются на месте, остальные добавляются или удаляются.
+        schedules = store.async_schedules(device_id)
+        for schedule_id in entities.keys() - schedules.keys():
+            remove(schedule_id)
+        added = []
+        for schedule_id, data in schedules.items():
+            if schedule_id in entities:
+                entities[schedule_id].load(data)
+            else:
+                added.append(create(schedule_id, data))
+        # Одна пересборка недели на всю замену: сущности потом ставят те же окна, и это ничего не меняет.
+        thermostat_manager.timeline.async_replace_windows([entity.window for entity in entities.values()])
+        for entity in entities.values():
+            if entity not in added and entity.entity_id:
+                entity.async_write_ha_state()
+        if added:
+            async_add_entities(added)
+
+    @callback
+    def schedules_updated(action: str, schedule_id: str | None) -> None:
+        if action == ACTION_REPLACED:
+            schedules_replaced()
+            return
+        data = store.async_get(device_id, schedule_id)
+        if action == ACTION_ADDED and schedule_id not in entities:
+            async_add_entities([create(schedule_id, data)])
+        elif action == ACTION_UPDATED and schedule_id in entities:
+            entities[schedule_id].async_update_schedule(data)
+        elif action == ACTION_DELETED and schedule_id in entities:
+            remove(schedule_id)
+
+    config_entry.async_on_unload(async_dispatcher_connect(hass, schedule_signal(device_id), schedules_updated))
+    async_add_entities([create(schedule_id, data) for schedule_id, data in store.async_schedules(device_id).items()])
+
+
+class ThermostatScheduleEntity(LytkoEntity):
+    def __init__(self, hass, unique_id, data: dict[str, Any], thermostat_manager: DeviceManager):
         self._attr_unique_id = unique_id
-        self._attr_name = name
-        self._temperature = temperature
-        self._start_time = start_time
-        self._end_time = end_time
-        self._thermostat_manager = thermostat_manager
-        self._schedule_days = schedule_days
-        self._work_on_holiday_days = holiday_days
-        self.schedule_task = None
-        self.holidays = holidays
+        self.device_manager = thermostat_manager
         self.hass = hass
+        self.load(data)
+
+    def load(self, data: dict[str, Any]) -> None:
+        self._attr_name = data.get(NAME)
+        self._temperature = data.get(ATTR_TEMPERATURE, 0)
+        self._start_time = data.get(ATTR_START_TIME, "00:00")
+        self._end_time = data.get(ATTR_END_TIME, "00:00")
+        self._schedule_days = data.get(SCHEDULE_DAYS)
+        self._work_on_holiday_days = data.get(HOLIDAY_DAYS)
+
+    @property
+    def window(self) -> ScheduleWindow:
+        return ScheduleWindow(
+            key=self._attr_unique_id,
+            temperature=float(self._temperature),
+            start=parse_time(self._start_time),
+            end=parse_time(self._end_time),
+            days=frozenset(DAYS_OF_WEEK.index(day) for day in self._schedule_days or [] if day in DAYS_OF_WEEK),
+            work_on_holidays=bool(self._work_on_holiday_days),
+        )
+
+    @property
+    def available(self) -> bool:
+        return True
 
     async def async_added_to_hass(self) -> None:
-        self.schedule_task = async_track_time_interval(self.hass, self._check_schedule, timedelta(seconds=60))
-        self._thermostat_manager.schedule_tasks.append(self.schedule_task)
+        self.device_manager.timeline.async_set_window(self.window)
+
+    @callback
+    def async_update_schedule(self, data: dict[str, Any]) -> None:
+        """Применяем изменённое расписание на лету."""
+        self.load(data)
+        self.device_manager.timeline.async_set_window(self.window)
+        self.async_write_ha_state()
 
     @property
     def unique_id(self) -> str | None:
@@ -82,61 +125,10 @@ class ThermostatScheduleEntity(Entity):
 
     @property
     def device_info(self) -> DeviceInfo | None:
-        return self._thermostat_manager.device_info
-
-    def is_right_day(self):
-        current_date = datetime.now().strftime("%Y-%m-%d")
-        current_day = datetime.now().strftime("%A")
-        current_day = days_map.get(current_day, current_day)
-        is_holiday = current_date in self.holidays
-        if is_holiday and not self._work_on_holiday_days:
-            return False
-        if current_day not in self._schedule_days:
-            return False
-        return True
+        return self.device_manager.device_info
 
-    async def async_internal_will_remove_from_hass(self) -> None:
-        if self.schedule_task:
-            self.schedule_task()
-
-    async def _check_schedule(self, _now):
-        LOGGER.error(f"_check_schedule {self.is_right_day()}")
-        current_time = datetime.now().strftime("%H:%M")
-        if self.is_right_day():
-            if current_time == self._start_time:
-                await self._turn_on_thermostat()
-            elif current_time == self._end_time:
-                await self._turn_off_thermostat()
-
-    async def _turn_on_thermostat(self):
-        try:
-            await self._thermostat_manager.send_device_command(
-                TargetTemperatureEvent(
-                    temperature=self._temperature
-                )
-            )
-            await self._thermostat_manager.send_device_command(
-                HeatingEvent(
-                    heating_on=True
-                )
-            )
-        except Exception as e:
-            LOGGER.error(f"Ошибка при включении термостата: {e}")
-
-    async def _turn_off_thermostat(self):
-        try:
-            await self._thermostat_manager.send_device_command(
-                HeatingEvent(
-                    heating_on=True
-                )
-            )
-            await self._thermostat_manager.send_device_command(
-                TargetTemperatureEvent(
-                    temperature=float(self._thermostat_manager.config.options.get(BASE_TEMPERATURE, "20"))
-                )
-            )
-        except Exception as e:
-            LOGGER.error(f"Ошибка при выключении термостата: {e}")
+    async def async_will_remove_from_hass(self) -> None:
+        self.device_manager.timeline.async_remove_window(self._attr_unique_id, restore=False)
 
     @property
     def state(self):
@@ -145,6 +137,7 @@ class ThermostatScheduleEntity(Entity):
     @property
     def extra_state_attributes(self):
         return {
+            "schedule_id": self._attr_unique_id,
             "temperature": self._temperature,
             "start_time": self._start_time,
             "end_time": self._end_time,
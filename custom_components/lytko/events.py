@@ -1,52 +1,66 @@
 from dataclasses import dataclass
 
 # Типы событий
-@dataclass
+@dataclass(slots=True)
 class Event:
     """Основной класс для события."""
 
-@dataclass
-class CurrentTemperatureEvent(Event):
-    """Событие обновления температуры."""
-    temperature: float
-
-@dataclass
+@dataclass(slots=True)
 class TargetTemperatureEvent(Event):
     """Событие обновления температуры."""
     temperature: float
 
 
-@dataclass
+@dataclass(slots=True)
 class HeatingEvent(Event):
     """Событие изменения состояния обогрева."""
     heating_on: bool
 
-@dataclass
+@dataclass(slots=True)
 class ChildLockEvent(Event):
     """Событие изменения состояния обогрева."""
     on: bool
 
-@dataclass
+@dataclass(slots=True)
 class DeviceEvent(Event):
     """Событие устройства (например, новое состояние)."""
     device_id: str
     status: str
 
-@dataclass
-class ThermostatSettingsEvent(Event):
-    """Событие устройства (например, новое состояние)."""
-    target_min: float
-    target_max: float
-    step: float
-
 
-@dataclass
+@dataclass(slots=True)
 class ThermistorSettingsEvent(Event):
     """Событие устройства (например, новое состояние)."""
     resistance: str
 
-@dataclass
+@dataclass(slots=True)
 class AliceSettingsEvent(Event):
     """Событие устройства (например, новое состояние)."""
     login: str
-    password: str
\ No newline at end of file
+    password: str
+
+
+@dataclass(frozen=True, slots=True)
+class ThermostatFrame:
+    """Кадр состояния термостата; поля, которых не было в сообщении, равны None."""
+    current_temperature: float | None = None
+    target_temperature: float | None = None
+    heating: bool | None = None
+    target_min: float | None = None
+    target_max: float | None = None
+    step: float | None = None
+
+    def merged(self, newer: "ThermostatFrame") -> "ThermostatFrame":
+        """Сливаем кадры: поля более нового кадра перекрывают поля этого."""
+        return ThermostatFrame(
+            current_temperature=_newer(self.current_temperature, newer.current_temperature),
+            target_temperature=_newer(self.target_temperature, newer.target_temperature),
+            heating=_newer(self.heating, newer.heating),
+            target_min=_newer(self.target_min, newer.target_min),
+            target_max=_newer(self.target_max, newer.target_max),
+            step=_newer(self.step, newer.step),
+        )
+
+
+def _newer(old, new):
+    return old if new is None else new
@@ -4,4 +4,20 @@ class AliceAuthError(Exception):
 
 class ThermistorError(Exception):
     """Ошибка настройки термистора."""
-    pass
\ No newline at end of file
+    pass
+
+class FrameSchemaError(ValueError):
+    """Кадр устройства не соответствует схеме."""
+    pass
+
+class DeviceNotConnectedError(Exception):
+    """Нет соединения с устройством."""
+    pass
+
+class CommandTimeoutError(Exception):
+    """Устройство не подтвердило команду вовремя."""
+    pass
+
+class CommandSupersededError(Exception):
+    """Команда заменена более приоритетной."""
+    pass
@@ -0,0 +1,152 @@
+from collections import deque
+
+from .const import FUSION_MEDIAN, FUSION_TRIMMED, FUSION_WEIGHTED, FUSION_SAMPLES_PER_SENSOR, FUSION_TRIM
+
+# Значения квантуются до сотой градуса: порядковые статистики считаются деревом Фенвика
+# по корзинам, поэтому добавление, удаление и запрос стоят O(log) и не зависят от истории.
+RESOLUTION = 0.01
+LOWEST = -60.0
+HIGHEST = 100.0
+BUCKETS = round((HIGHEST - LOWEST) / RESOLUTION) + 1
+
+
+def _bucket(value: float) -> int:
+    return min(BUCKETS - 1, max(0, round((value - LOWEST) / RESOLUTION)))
+
+
+def _value(bucket: int) -> float:
+    return LOWEST + bucket * RESOLUTION
+
+
+class _Fenwick:
+    """Количество и сумма значений по корзинам с префиксными запросами за O(log n)."""
+
+    __slots__ = ("counts", "sums", "_top")
+
+    def __init__(self, size: int):
+        self.counts = [0] * (size + 1)
+        self.sums = [0.0] * (size + 1)
+        self._top = 1 << (size.bit_length() - 1)
+
+    def add(self, bucket: int, count: int) -> None:
+        value = _value(bucket) * count
+        index = bucket + 1
+        while index < len(self.counts):
+            self.counts[index] += count
+            self.sums[index] += value
+            index += index & -index
+
+    def smallest(self, k: int) -> tuple[int, float]:
+        """Корзина k-го по возрастанию значения (с нуля) и сумма всех значений строго до этой корзины."""
+        index = 0
+        total = 0.0
+        step = self._top
+        while step:
+            following = index + step
+            if following < len(self.counts) and self.counts[following] <= k:
+                index = following
+                k -= self.counts[following]
+                total += self.sums[following]
+            step >>= 1
+        return index, total
+
+    def sum_smallest(self, k: int) -> float:
+        """Сумма k наименьших значений."""
+        if k <= 0:
+            return 0.0
+        bucket, total = self.smallest(k - 1)
+        before = self._count_before(bucket)
+        return total + (k - before) * _value(bucket)
+
+    def _count_before(self, bucket: int) -> int:
+        count = 0
+        index = bucket
+        while index:
+            count += self.counts[index]
+            index -= index & -index
+        return count
+
+
+class SensorFusion:
+    """Скользящее объединение нескольких датчиков комнаты: медиана, усечённое или взвешенное среднее.
+
+    У каждого датчика своё окно из последних `samples_per_sensor` показаний, и каждый
+    датчик всегда занимает его целиком, поэтому частый датчик не перевешивает редкие.
+    Датчик выбывает вместе со своими показаниями, только когда его сущность недоступна:
+    хаб молчит, пока значение в мёртвой зоне, и тишина значит «без изменений», а не «устарел».
+    """
+
+    def __init__(
+            self,
+            method: str = FUSION_MEDIAN,
+            samples_per_sensor: int = FUSION_SAMPLES_PER_SENSOR,
+            weights: dict[str, float] | None = None,
+            trim: float = FUSION_TRIM,
+    ):
+        self.method = method
+        self.samples_per_sensor = samples_per_sensor
+        self.weights = weights or {}
+        self.trim = trim
+        self._tree = _Fenwick(BUCKETS)
+        self._by_sensor: dict[str, deque[tuple[int, float, float]]] = {}
+        self._count = 0
+        self._weighted_sum = 0.0
+        self._weight = 0.0
+
+    @property
+    def sensors(self) -> list[str]:
+        return list(self._by_sensor)
+
+    def add(self, sensor: str, value: float | None) -> float | None:
+        """Новое показание датчика (None — датчик недоступен); возвращает объединённое значение."""
+        if value is None:
+            self._drop(sensor)
+            return self.value
+        entry = (_bucket(value), value, self.weights.get(sensor, 1.0))
+        samples = self._by_sensor.get(sensor)
+        if samples is None:
+            samples = self._by_sensor[sensor] = deque()
+            # Хаб молчит, пока значение не меняется: новый датчик сразу занимает всё своё окно.
+            for _ in range(self.samples_per_sensor - 1):
+                samples.append(entry)
+                self._insert(entry)
+        samples.append(entry)
+        self._insert(entry)
+        while len(samples) > self.samples_per_sensor:
+            self._remove(samples.popleft())
+        return self.value
+
+    def _drop(self, sensor: str) -> None:
+        for entry in self._by_sensor.pop(sensor, ()):
+            self._remove(entry)
+        if not self._count:
+            self._weighted_sum = 0.0
+            self._weight = 0.0
+
+    def _insert(self, entry: tuple[int, float, float]) -> None:
+        self._tree.add(entry[0], 1)
+        self._count += 1
+        self._weighted_sum += entry[1] * entry[2]
+        self._weight += entry[2]
+
+    def _remove(self, entry: tuple[int, float, float]) -> None:
+        self._tree.add(entry[0], -1)
+        self._count -= 1
+        self._weighted_sum -= entry[1] * entry[2]
+        self._weight -= entry[2]
+
+    @property
+    def value(self) -> float | None:
+        count = self._count
+        if not count:
+            return None
+        if self.method == FUSION_WEIGHTED and self._weight > 0:
+            return round(self._weighted_sum / self._weight, 2)
+        if self.method == FUSION_TRIMMED:
+            cut = int(count * self.trim)
+            kept = count - 2 * cut
+            total = self._tree.sum_smallest(count - cut) - self._tree.sum_smallest(cut)
+            return round(total / kept, 2)
+        low, _ = self._tree.smallest((count - 1) // 2)
+        high, _ = self._tree.smallest(count // 2)
+        return round((_value(low) + _value(high)) / 2, 2)
@@ -1,25 +1,22 @@
-import json
+from homeassistant.helpers import entity_registry as er
 
-from homeassistant.config_entries import ConfigEntry
-
-from .conf import LOGGER
+from .catalog import async_get_catalog
+from .const import DOMAIN
 
 
 async def get_thermostat_devices(hass):
     """Получаем устройства термостатов для выпадающего списка."""
-    devices = []
-
-    for state in hass.states.async_all():
-        if state.domain == "climate" and "lytko" in state.entity_id:
-            devices.append({
-                'id': state.entity_id,
-                'name': state.name,
-                'icon': 'mdi:thermometer',
-            })
+    return async_get_catalog(hass).thermostats()
 
-    return devices
+def thermostat_entity_id(value: str) -> str:
+    """Достаём entity_id из строки вида «Имя (climate.xxx)» или «climate.xxx»."""
+    if "(" in value:
+        value = value.split("(")[-1].split(")")[0]
+    return value.strip()
 
-def config_options_to_dict(config_entry: ConfigEntry) -> dict:
-    json_string = str(config_entry.options).replace("'", '"').replace("None", "null")
-    LOGGER.error(json_string)
-    return json.loads(json_string)
+def resolve_thermostat_device_id(hass, value: str) -> str | None:
+    """Находим device_id термостата Lytko по его climate-сущности."""
+    entry = er.async_get(hass).async_get(thermostat_entity_id(value))
+    if entry is None or entry.platform != DOMAIN or entry.domain != "climate":
+        return None
+    return entry.unique_id
@@ -0,0 +1,47 @@
+import asyncio
+from collections import deque
+
+from .const import INBOUND_QUEUE_SIZE
+from .events import ThermostatFrame
+
+
+class FrameQueue:
+    """Ограниченная упорядоченная очередь входящих кадров устройства.
+
+    Читатель сокета никогда не ждёт: если потребитель отстал и очередь полна,
+    новый кадр сливается с последним (устаревшая телеметрия перезаписывается),
+    а не растёт память. Потребитель забирает всё накопленное одним кадром.
+    """
+
+    def __init__(self, maxsize: int = INBOUND_QUEUE_SIZE):
+        self.maxsize = maxsize
+        self._frames: deque[ThermostatFrame] = deque()
+        self._ready = asyncio.Event()
+        self.received = 0
+        self.coalesced = 0
+        self.max_depth = 0
+
+    @property
+    def depth(self) -> int:
+        return len(self._frames)
+
+    def put(self, frame: ThermostatFrame) -> None:
+        self.received += 1
+        if len(self._frames) >= self.maxsize:
+            self._frames[-1] = self._frames[-1].merged(frame)
+            self.coalesced += 1
+        else:
+            self._frames.append(frame)
+            self.max_depth = max(self.max_depth, len(self._frames))
+        self._ready.set()
+
+    async def get(self) -> ThermostatFrame:
+        """Ждём кадры и отдаём все накопленные, слитые в порядке поступления."""
+        while not self._frames:
+            self._ready.clear()
+            await self._ready.wait()
+        frame = self._frames.popleft()
+        while self._frames:
+            frame = frame.merged(self._frames.popleft())
+            self.coalesced += 1
+        return frame
@@ -11,10 +11,10 @@ from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.typing import StateType
 
-from .helper import config_options_to_dict
 from .conf import LOGGER
 from .const import DOMAIN, BASE_TEMPERATURE
 from .device_manager import DeviceManager
+from .entity import LytkoEntity
 
 
 async def async_setup_entry(
@@ -28,7 +28,7 @@ async def async_setup_entry(
 
     async_add_entities([device_manager.base_temperature])
 
-class BaseTemperature(NumberEntity):
+class BaseTemperature(LytkoEntity, NumberEntity):
 
     def __init__(self, hass: HomeAssistant, device_manager: DeviceManager, config: ConfigEntry):
         self.hass = hass
@@ -68,13 +68,6 @@ class BaseTemperature(NumberEntity):
     def native_step(self) -> float:
         return self.step
 
-    async def set_settings(self, temp_min: float, temp_max: float, step: float):
-        if self.temp_min != temp_min or self.temp_max!=temp_max or self.step!=self.step:
-            self.temp_max = temp_max
-            self.temp_min = temp_min
-            self.step = step
-            self.async_write_ha_state()
-
     @property
     def device_info(self) -> DeviceInfo | None:
         return self.device_manager.device_info
@@ -102,13 +95,7 @@ class BaseTemperature(NumberEntity):
     async def async_set_native_value(self, value: float) -> None:
         self._base_temperature = value
 
-        data = config_options_to_dict(self.config)
-
-        data[BASE_TEMPERATURE] = value
-
         self.hass.config_entries.async_update_entry(
-            self.config, options=data
+            self.config, options={**self.config.options, BASE_TEMPERATURE: value}
         )
-
-        await self.hass.config_entries.async_reload(self.config.entry_id)
         self.async_write_ha_state()
@@ -1,13 +1,12 @@
 import voluptuous as vol
 from homeassistant import config_entries
-from homeassistant.const import ATTR_NAME
-from homeassistant.helpers import translation, selector
+from homeassistant.helpers import selector
 
-from .const import ATTR_TEMPERATURE, ATTR_START_TIME, ATTR_END_TIME, ATTR_THERMOSTAT, THERMOSTAT, SCHEDULE_DAYS, \
-    HOLIDAY_DAYS, DAYS_OF_WEEK
-from .helper import get_thermostat_devices
-from .exceptions import AliceAuthError, ThermistorError
-from .const import ALICE_LOGIN, THERMISTOR, ALICE_PASSWORD, SELECTED_THERMOMETER, ENTRY_TYPE, SCHEDULE
+from .const import THERMOSTAT
+from .const import ALICE_LOGIN, ALICE_PASSWORD, ENTRY_TYPE, LIVENESS_DEADLINE, COMMAND_DEBOUNCE, COMMAND_DEBOUNCE_MS
+from .const import COMMAND_RATE, COMMAND_BURST, COMMAND_RATE_LIMIT, COMMAND_BURST_SIZE
+from .const import SENSOR_DEADBAND, SENSOR_MIN_INTERVAL, EXTERNAL_DEADBAND, EXTERNAL_MIN_INTERVAL
+from .const import EXTRA_THERMOMETERS, FUSION_METHOD, FUSION_MEDIAN, FUSION_TRIMMED, FUSION_WEIGHTED
 
 
 class OptionsFlowHandler(config_entries.OptionsFlow):
@@ -17,57 +16,42 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
 
 
     async def async_step_init(self, user_input=None):
-        if self.config_entry.data.get(ENTRY_TYPE) == SCHEDULE:
-            return await self.async_step_schedule()
-
         errors = {}
         if user_input is not None:
-            try:
-                user_input[ENTRY_TYPE] = THERMOSTAT
-                self.hass.config_entries.async_update_entry(
-                    self.config_entry, options=user_input
-                )
-                await self.hass.config_entries.async_reload(self.config_entry.entry_id)
-                return self.async_create_entry(title="", data=user_input)
-            except AliceAuthError:
-                errors["base"] = "alice_auth_failed"
+            # Настройки, которых нет в форме (внешний датчик, уставка, термистор), сохраняем;
+            # изменения применит на лету слушатель записи в DeviceManager.
+            user_input[ENTRY_TYPE] = THERMOSTAT
+            return self.async_create_entry(title="", data={**self.config_entry.options, **user_input})
 
         return self.async_show_form(
             step_id="init",
             data_schema=vol.Schema({
                 vol.Optional(ALICE_LOGIN, default=self.config_entry.options.get(ALICE_LOGIN, "")): str,
                 vol.Optional(ALICE_PASSWORD, default=self.config_entry.options.get(ALICE_PASSWORD, "")): str,
+                vol.Optional(LIVENESS_DEADLINE, default=self.config_entry.options.get(LIVENESS_DEADLINE, 0)):
+                    vol.All(vol.Coerce(int), vol.Range(min=0)),
+                vol.Optional(COMMAND_DEBOUNCE_MS,
+                             default=self.config_entry.options.get(COMMAND_DEBOUNCE_MS, int(COMMAND_DEBOUNCE * 1000))):
+                    vol.All(vol.Coerce(int), vol.Range(min=0, max=5000)),
+                vol.Optional(COMMAND_RATE_LIMIT,
+                             default=self.config_entry.options.get(COMMAND_RATE_LIMIT, COMMAND_RATE)):
+                    vol.All(vol.Coerce(float), vol.Range(min=0.1, max=50)),
+                vol.Optional(COMMAND_BURST_SIZE,
+                             default=self.config_entry.options.get(COMMAND_BURST_SIZE, COMMAND_BURST)):
+                    vol.All(vol.Coerce(int), vol.Range(min=1, max=50)),
+                vol.Optional(EXTERNAL_DEADBAND,
+                             default=self.config_entry.options.get(EXTERNAL_DEADBAND, SENSOR_DEADBAND)):
+                    vol.All(vol.Coerce(float), vol.Range(min=0, max=5)),
+                vol.Optional(EXTERNAL_MIN_INTERVAL,
+                             default=self.config_entry.options.get(EXTERNAL_MIN_INTERVAL, SENSOR_MIN_INTERVAL)):
+                    vol.All(vol.Coerce(int), vol.Range(min=0, max=600)),
+                vol.Optional(EXTRA_THERMOMETERS, default=self.config_entry.options.get(EXTRA_THERMOMETERS, [])):
+                    selector.EntitySelector(
+                        selector.EntitySelectorConfig(domain="sensor", device_class="temperature", multiple=True)),
+                vol.Optional(FUSION_METHOD, default=self.config_entry.options.get(FUSION_METHOD, FUSION_MEDIAN)):
+                    selector.SelectSelector(
+                        selector.SelectSelectorConfig(options=[FUSION_MEDIAN, FUSION_TRIMMED, FUSION_WEIGHTED],
+                                                      mode=selector.SelectSelectorMode.DROPDOWN)),
             }),
             errors=errors
         )
-
-
-    async def async_step_schedule(self, user_input=None):
-        if user_input is not None:
-            user_input[ENTRY_TYPE] = SCHEDULE
-            self.hass.config_entries.async_update_entry(
-                self.config_entry, data=user_input
-            )
-            await self.hass.config_entries.async_reload(self.config_entry.entry_id)
-            return self.async_create_entry(title="", data=user_input)
-
-        thermostats = await get_thermostat_devices(self.hass)
-        devices = {thermostat["id"]: f"{thermostat['name']} ({thermostat['id']})"
-                   for thermostat in thermostats}
-
-        return self.async_show_form(
-            step_id="schedule",
-            data_schema=vol.Schema({
-                vol.Required(ATTR_NAME, default=self.config_entry.data.get(ATTR_NAME)): str,
-                vol.Required(ATTR_TEMPERATURE, default=self.config_entry.data.get(ATTR_TEMPERATURE)): vol.Coerce(float),
-                vol.Required(ATTR_START_TIME, default=self.config_entry.data.get(ATTR_START_TIME)): str,
-                vol.Required(ATTR_END_TIME, default=self.config_entry.data.get(ATTR_END_TIME)):  str,
-                vol.Required(ATTR_THERMOSTAT, default=self.config_entry.data.get(ATTR_THERMOSTAT)): vol.In(devices),
-                vol.Required(SCHEDULE_DAYS, default=self.config_entry.data.get(SCHEDULE_DAYS)): selector.SelectSelector(
-                    selector.SelectSelectorConfig(options=DAYS_OF_WEEK,
-                                                  mode=selector.SelectSelectorMode.DROPDOWN, multiple=True),
-                ),
-                vol.Required(HOLIDAY_DAYS, default=self.config_entry.data.get(HOLIDAY_DAYS)): bool
-            }),
-        )
-
@@ -0,0 +1,256 @@
+import asyncio
+import itertools
+import time
+from dataclasses import dataclass, field
+from enum import IntEnum
+from typing import Awaitable, Callable
+
+from .conf import LOGGER
+from .const import COMMAND_DEBOUNCE, COMMAND_MAX_DELAY, ACK_TIMEOUT, COMMAND_RATE, COMMAND_BURST
+from .events import Event, HeatingEvent, TargetTemperatureEvent, ThermostatFrame
+from .exceptions import CommandTimeoutError, CommandSupersededError
+
+
+class Priority(IntEnum):
+    """Классы приоритета команд: меньшее значение важнее."""
+    USER = 0
+    SCHEDULE = 1
+    AUTOMATIC = 2
+
+
+# Команды, которые часто повторяются подряд (ползунок, авторежим) и ждут окна тишины.
+DEBOUNCED = (TargetTemperatureEvent, HeatingEvent)
+
+
+def reflects(event: Event, frame: ThermostatFrame) -> bool | None:
+    """Отражает ли кадр устройства команду; None — команда в кадрах не видна."""
+    if isinstance(event, TargetTemperatureEvent):
+        return frame.target_temperature is not None and abs(frame.target_temperature - event.temperature) < 0.01
+    if isinstance(event, HeatingEvent):
+        return frame.heating == event.heating_on
+    return None
+
+
+@dataclass(slots=True)
+class PendingCommand:
+    event: Event
+    priority: Priority
+    sequence: int
+    first_submitted: float
+    deadline: float
+    futures: list[asyncio.Future] = field(default_factory=list)
+
+
+@dataclass(slots=True)
+class AwaitingAck:
+    event: Event
+    sent_at: float
+    futures: list[asyncio.Future]
+    timer: asyncio.TimerHandle | None = None
+
+
+class TokenBucket:
+    """Ограничитель частоты: `rate` команд в секунду с запасом `burst` подряд."""
+
+    def __init__(self, rate: float = COMMAND_RATE, burst: int = COMMAND_BURST):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+
+    @property
+    def tokens(self) -> float:
+        self._refill()
+        return self._tokens
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def delay(self) -> float:
+        """Сколько ждать до следующего жетона; 0 — можно отправлять."""
+        self._refill()
+        return 0 if self._tokens >= 1 else (1 - self._tokens) / self.rate
+
+    def take(self) -> None:
+        self._refill()
+        self._tokens -= 1
+
+
+def _retrieve(future: asyncio.Future) -> None:
+    # Результат «выстрелил и забыл» никто не ждёт: забираем исключение, чтобы не было предупреждений.
+    if not future.cancelled():
+        future.exception()
+
+
+class CommandQueue:
+    """Очередь исходящих команд устройства с единственным писателем.
+
+    Команды одной настройки (класс события) схлопываются: в устройство уходит
+    только последняя, а команда с более низким приоритетом не перебивает
+    ожидающую более важную. Уставка и режим отправляются после окна тишины
+    `debounce`, но не позже COMMAND_MAX_DELAY с первой попытки. Частоту записи
+    ограничивает `bucket`: пока жетонов нет, команды ждут в очереди и продолжают
+    схлопываться, ничего не отбрасывается.
+
+    Каждая команда получает future, который завершается временем от постановки
+    до подтверждения, когда кадр устройства отразит значение, или ошибкой по
+    таймауту. Писатель не ждёт подтверждений, поэтому команды идут конвейером.
+    """
+
+    def __init__(
+            self,
+            send: Callable[[Event], Awaitable[None]],
+            debounce: float = COMMAND_DEBOUNCE,
+            ack_timeout: float = ACK_TIMEOUT,
+            bucket: TokenBucket | None = None,
+    ):
+        self._send = send
+        self.debounce = debounce
+        self.ack_timeout = ack_timeout
+        self.bucket = bucket or TokenBucket()
+        self._pending: dict[type[Event], PendingCommand] = {}
+        self._awaiting: dict[type[Event], AwaitingAck] = {}
+        self._sequence = itertools.count()
+        self._wake = asyncio.Event()
+        self.submitted = 0
+        self.sent = 0
+        self.superseded = 0
+        self.rejected = 0
+        self.acked = 0
+        self.timeouts = 0
+        self.failed = 0
+        self.throttled = 0
+        self.throttled_seconds = 0.0
+        self.last_latency: float | None = None
+
+    @property
+    def depth(self) -> int:
+        return len(self._pending)
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._awaiting)
+
+    def submit(self, event: Event, priority: Priority = Priority.USER) -> asyncio.Future:
+        """Ставим команду в очередь; future завершится подтверждением устройства."""
+        self.submitted += 1
+        future = asyncio.get_running_loop().create_future()
+        future.add_done_callback(_retrieve)
+        key = type(event)
+        now = time.monotonic()
+        delay = self.debounce if isinstance(event, DEBOUNCED) else 0
+        pending = self._pending.get(key)
+        if pending is not None:
+            if priority > pending.priority:
+                self.rejected += 1
+                future.set_exception(CommandSupersededError(f"Ожидает более приоритетная команда {pending.event}"))
+                return future
+            # Команда сохраняет место в очереди, чтобы частые правки не задерживали остальные;
+            # вызывающие заменённой команды получат результат той, что её заменила.
+            self.superseded += 1
+            pending.event = event
+            pending.priority = priority
+            pending.deadline = min(now + delay, pending.first_submitted + COMMAND_MAX_DELAY)
+            pending.futures.append(future)
+        else:
+            self._pending[key] = PendingCommand(event, priority, next(self._sequence), now, now + delay, [future])
+        self._wake.set()
+        return future
+
+    def _next_ready(self) -> tuple[PendingCommand | None, float | None]:
+        now = time.monotonic()
+        ready = [command for command in self._pending.values() if command.deadline <= now]
+        if ready:
+            return min(ready, key=lambda command: (command.priority, command.sequence)), None
+        if self._pending:
+            return None, min(command.deadline for command in self._pending.values()) - now
+        return None, None
+
+    async def run(self):
+        """Писатель: отправляет готовые команды по одной, по приоритету и порядку поступления."""
+        while True:
+            command, wait = self._next_ready()
+            if command is None:
+                self._wake.clear()
+                try:
+                    await asyncio.wait_for(self._wake.wait(), wait)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            throttle = self.bucket.delay()
+            if throttle:
+                # Команда остаётся в очереди: пока ждём жетон, новые команды с ней схлопнутся.
+                self.throttled += 1
+                self.throttled_seconds += throttle
+                await asyncio.sleep(throttle)
+                continue
+            self.bucket.take()
+            del self._pending[type(command.event)]
+            try:
+                await self._send(command.event)
+            except Exception as e:
+                self.failed += 1
+                LOGGER.error(f"Не удалось отправить команду {command.event}: {e}")
+                self._finish(command.futures, error=e)
+                continue
+            self.sent += 1
+            self._await_ack(command)
+
+    def _await_ack(self, command: PendingCommand) -> None:
+        key = type(command.event)
+        futures = command.futures
+        previous = self._awaiting.pop(key, None)
+        if previous is not None:
+            previous.timer.cancel()
+            futures = previous.futures + futures
+        if reflects(command.event, ThermostatFrame()) is None:
+            # Подтвердить нечем: считаем выполненной после записи в сокет.
+            self._finish(futures, result=time.monotonic() - command.first_submitted)
+            return
+        awaiting = AwaitingAck(command.event, command.first_submitted, futures)
+        awaiting.timer = asyncio.get_running_loop().call_later(self.ack_timeout, self._ack_timeout, key, awaiting)
+        self._awaiting[key] = awaiting
+
+    def _ack_timeout(self, key: type[Event], awaiting: AwaitingAck) -> None:
+        if self._awaiting.get(key) is not awaiting:
+            return
+        del self._awaiting[key]
+        self.timeouts += 1
+        LOGGER.warning(f"Устройство не подтвердило {awaiting.event} за {self.ack_timeout} с")
+        self._finish(awaiting.futures, error=CommandTimeoutError(f"Нет подтверждения {awaiting.event}"))
+
+    def handle_frame(self, frame: ThermostatFrame) -> None:
+        """Подтверждаем команды, значения которых отразились в кадре устройства."""
+        if not self._awaiting:
+            return
+        now = time.monotonic()
+        for key, awaiting in list(self._awaiting.items()):
+            if reflects(awaiting.event, frame):
+                del self._awaiting[key]
+                awaiting.timer.cancel()
+                self.acked += 1
+                self.last_latency = now - awaiting.sent_at
+                self._finish(awaiting.futures, result=self.last_latency)
+
+    def shutdown(self) -> None:
+        for awaiting in self._awaiting.values():
+            awaiting.timer.cancel()
+            self._finish(awaiting.futures, cancel=True)
+        for command in self._pending.values():
+            self._finish(command.futures, cancel=True)
+        self._awaiting.clear()
+        self._pending.clear()
+
+    @staticmethod
+    def _finish(futures: list[asyncio.Future], result=None, error: Exception | None = None, cancel: bool = False):
+        for future in futures:
+            if future.done():
+                continue
+            if cancel:
+                future.cancel()
+            elif error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(result)
@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+import json
+from datetime import date, timedelta
+from pathlib import Path
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+
+from .conf import LOGGER
+from .const import DOMAIN, DATA_CALENDAR, SIGNAL_CALENDAR_UPDATED
+
+# Календари из поставки интеграции и пользовательские из <config>/lytko/calendars.
+BUILTIN_CALENDARS = Path(__file__).parent / "calendars"
+USER_CALENDARS = "lytko/calendars"
+
+
+def _weekends_mask(year: int) -> int:
+    """Маска выходных для года без производственного календаря: суббота и воскресенье."""
+    mask = 0
+    day = date(year, 1, 1)
+    while day.year == year:
+        if day.weekday() >= 5:
+            mask |= 1 << (day.timetuple().tm_yday - 1)
+        day += timedelta(days=1)
+    return mask
+
+
+def _parse_json(path: Path) -> list[date]:
+    data = json.loads(path.read_text(encoding="utf-8"))
+    days = data.get("days_off", []) if isinstance(data, dict) else data
+    return [date.fromisoformat(day) for day in days]
+
+
+def _parse_ics(path: Path) -> list[date]:
+    """Минимальный разбор ICS: однодневные и многодневные события с VALUE=DATE."""
+    days = []
+    start = end = None
+    for line in path.read_text(encoding="utf-8").splitlines():
+        line = line.strip()
+        if line == "BEGIN:VEVENT":
+            start = end = None
+        elif line.startswith("DTSTART"):
+            start = _ics_date(line)
+        elif line.startswith("DTEND"):
+            end = _ics_date(line)
+        elif line == "END:VEVENT" and start:
+            day = start
+            while True:
+                days.append(day)
+                day += timedelta(days=1)
+                if end is None or day >= end:
+                    break
+    return days
+
+
+def _ics_date(line: str) -> date:
+    value = line.split(":", 1)[1][:8]
+    return date(int(value[:4]), int(value[4:6]), int(value[6:8]))
+
+
+def load_calendars(directories: list[Path]) -> dict[int, int]:
+    """Собираем календари в битовые маски выходных по годам.
+
+    JSON-файл ({"days_off": [...]} или просто список дат) — полный список
+    нерабочих дней года. Даты из ICS добавляются к нему, а для лет без JSON —
+    к обычным выходным.
+    """
+    production: dict[int, int] = {}
+    extra: dict[int, int] = {}
+    for directory in directories:
+        if not directory.is_dir():
+            continue
+        for path in sorted(directory.iterdir()):
+            try:
+                if path.suffix == ".json":
+                    target, days = production, _parse_json(path)
+                elif path.suffix == ".ics":
+                    target, days = extra, _parse_ics(path)
+                else:
+                    continue
+            except (OSError, ValueError, IndexError) as e:
+                LOGGER.error(f"Не удалось загрузить календарь {path}: {e}")
+                continue
+            years = {day.year for day in days}
+            if target is production:
+                # Файл полностью задаёт нерабочие дни своих лет.
+                for year in years:
+                    production[year] = 0
+            for day in days:
+                target[day.year] = target.get(day.year, 0) | 1 << (day.timetuple().tm_yday - 1)
+
+    masks = dict(production)
+    for year, mask in extra.items():
+        masks[year] = masks.get(year, _weekends_mask(year)) | mask
+    return masks
+
+
+class ProductionCalendar:
+    """Производственный календарь: проверка выходного дня за O(1)."""
+
+    def __init__(self, hass: HomeAssistant):
+        self.hass = hass
+        self._masks: dict[int, int] = {}
+        self._cached_day: date | None = None
+        self._cached_day_off = False
+        self.revision = 0
+
+    @property
+    def years(self) -> list[int]:
+        return sorted(self._masks)
+
+    async def async_load(self) -> None:
+        directories = [BUILTIN_CALENDARS, Path(self.hass.config.path(USER_CALENDARS))]
+        self._masks = await self.hass.async_add_executor_job(load_calendars, directories)
+        self._cached_day = None
+        self.revision += 1
+        LOGGER.debug(f"Производственный календарь загружен: {self.years}")
+        async_dispatcher_send(self.hass, SIGNAL_CALENDAR_UPDATED)
+
+    def is_day_off(self, day: date) -> bool:
+        if day == self._cached_day:
+            return self._cached_day_off
+        mask = self._masks.get(day.year)
+        if mask is None:
+            LOGGER.warning(f"Нет производственного календаря на {day.year} год, используются обычные выходные")
+            mask = self._masks[day.year] = _weekends_mask(day.year)
+        day_off = bool(mask >> (day.timetuple().tm_yday - 1) & 1)
+        # Все расписания спрашивают про один и тот же день — запоминаем последний ответ.
+        self._cached_day, self._cached_day_off = day, day_off
+        return day_off
+
+
+@callback
+def async_get_calendar(hass: HomeAssistant) -> ProductionCalendar:
+    """Общий для всей интеграции производственный календарь."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    calendar = domain_data.get(DATA_CALENDAR)
+    if calendar is None:
+        calendar = domain_data[DATA_CALENDAR] = ProductionCalendar(hass)
+    return calendar
@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import uuid
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN, DATA_SCHEDULE_STORE, SIGNAL_SCHEDULES_UPDATED
+from .const import ATTR_SCHEDULE_ID, ATTR_TEMPERATURE, ATTR_START_TIME, ATTR_END_TIME, NAME, SCHEDULE_DAYS, HOLIDAY_DAYS
+
+STORAGE_VERSION = 1
+STORAGE_KEY = f"{DOMAIN}.schedules"
+SAVE_DELAY = 1
+
+SCHEDULE_FIELDS = (NAME, ATTR_TEMPERATURE, ATTR_START_TIME, ATTR_END_TIME, SCHEDULE_DAYS, HOLIDAY_DAYS)
+
+ACTION_ADDED = "added"
+ACTION_UPDATED = "updated"
+ACTION_DELETED = "deleted"
+ACTION_REPLACED = "replaced"
+
+
+def schedule_signal(device_id: str) -> str:
+    return f"{SIGNAL_SCHEDULES_UPDATED}_{device_id}"
+
+
+def compact_schedule(data: dict[str, Any]) -> dict[str, Any]:
+    """Оставляем только поля расписания, без служебных ключей config entry."""
+    return {key: data[key] for key in SCHEDULE_FIELDS if key in data}
+
+
+class ScheduleStore:
+    """Расписания всех термостатов в одном версионируемом файле .storage.
+
+    Изменения сохраняются отложенно и рассылаются по сигналу устройства,
+    чтобы запущенные сущности обновлялись без перезагрузки записи.
+    """
+
+    def __init__(self, hass: HomeAssistant):
+        self.hass = hass
+        self._store: Store[dict[str, dict[str, dict[str, Any]]]] = Store(hass, STORAGE_VERSION, STORAGE_KEY)
+        self._devices: dict[str, dict[str, dict[str, Any]]] = {}
+
+    async def async_load(self) -> None:
+        self._devices = await self._store.async_load() or {}
+
+    @callback
+    def _schedule_save(self) -> None:
+        self._store.async_delay_save(lambda: self._devices, SAVE_DELAY)
+
+    @callback
+    def _notify(self, device_id: str, action: str, schedule_id: str | None) -> None:
+        async_dispatcher_send(self.hass, schedule_signal(device_id), action, schedule_id)
+
+    @callback
+    def async_schedules(self, device_id: str) -> dict[str, dict[str, Any]]:
+        return dict(self._devices.get(device_id, {}))
+
+    @callback
+    def async_get(self, device_id: str, schedule_id: str) -> dict[str, Any] | None:
+        return self._devices.get(device_id, {}).get(schedule_id)
+
+    @callback
+    def async_add(self, device_id: str, data: dict[str, Any], schedule_id: str | None = None) -> str:
+        schedule_id = schedule_id or str(uuid.uuid4())
+        exists = schedule_id in self._devices.get(device_id, {})
+        self._devices.setdefault(device_id, {})[schedule_id] = compact_schedule(data)
+        self._schedule_save()
+        self._notify(device_id, ACTION_UPDATED if exists else ACTION_ADDED, schedule_id)
+        return schedule_id
+
+    @callback
+    def async_update(self, device_id: str, schedule_id: str, changes: dict[str, Any]) -> None:
+        schedule = self._devices.get(device_id, {}).get(schedule_id)
+        if schedule is None:
+            raise KeyError(schedule_id)
+        schedule.update(compact_schedule(changes))
+        self._schedule_save()
+        self._notify(device_id, ACTION_UPDATED, schedule_id)
+
+    @callback
+    def async_delete(self, device_id: str, schedule_id: str) -> None:
+        if self._devices.get(device_id, {}).pop(schedule_id, None) is None:
+            raise KeyError(schedule_id)
+        self._schedule_save()
+        self._notify(device_id, ACTION_DELETED, schedule_id)
+
+    @callback
+    def async_replace(self, device_id: str, schedules: list[dict[str, Any]]) -> list[str]:
+        """Заменяем все расписания термостата одним изменением и одним сигналом.
+
+        Расписание с `schedule_id` сохраняет идентификатор, а с ним и свою сущность.
+        """
+        replaced = {
+            schedule.get(ATTR_SCHEDULE_ID) or str(uuid.uuid4()): compact_schedule(schedule)
+            for schedule in schedules
+        }
+        self._devices[device_id] = replaced
+        self._schedule_save()
+        self._notify(device_id, ACTION_REPLACED, None)
+        return list(replaced)
+
+
+@callback
+def async_get_schedule_store(hass: HomeAssistant) -> ScheduleStore:
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    store = domain_data.get(DATA_SCHEDULE_STORE)
+    if store is None:
+        store = domain_data[DATA_SCHEDULE_STORE] = ScheduleStore(hass)
+    return store
@@ -0,0 +1,186 @@
+from __future__ import annotations
+
+import heapq
+import itertools
+from dataclasses import dataclass, field
+from datetime import date, datetime, time, timedelta
+from typing import Any, Callable
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_point_in_utc_time
+from homeassistant.util import dt as dt_util
+
+from .conf import LOGGER
+from .const import DOMAIN, DATA_SCHEDULER
+
+def parse_time(value: str) -> time:
+    """Разбираем время в формате HH:MM."""
+    hours, minutes = str(value).strip().split(":")[:2]
+    return time(int(hours), int(minutes))
+
+
+def local_datetime(day: date, at: time) -> datetime:
+    """Локальное время дня с корректной обработкой перехода на летнее/зимнее время.
+
+    Несуществующее время (весенний перевод) сдвигается вперёд на размер скачка,
+    неоднозначное (осенний перевод) берётся по первому вхождению.
+    """
+    naive = datetime.combine(day, at)
+    return dt_util.as_local(dt_util.as_utc(naive.replace(tzinfo=dt_util.DEFAULT_TIME_ZONE)))
+
+
+@dataclass(eq=False, slots=True)
+class ScheduleJob:
+    """Задание планировщика: функция расчёта следующего запуска и действие."""
+    key: str
+    next_fire: Callable[[datetime], datetime | None]
+    action: Callable[[datetime], Any]
+    when: datetime | None = None
+    generation: int = 0
+    removed: bool = field(default=False)
+
+
+class ScheduleEngine:
+    """Единый планировщик интеграции.
+
+    Задания лежат в куче по времени следующего срабатывания, а таймер HA
+    взводится только на ближайшее из них, поэтому в простое цикл событий не будит никто.
+    """
+
+    def __init__(self, hass: HomeAssistant):
+        self.hass = hass
+        self._heap: list[tuple[datetime, int, int, ScheduleJob]] = []
+        self._jobs: dict[str, ScheduleJob] = {}
+        self._sequence = itertools.count()
+        self._unsub_timer: CALLBACK_TYPE | None = None
+        self._armed_at: datetime | None = None
+        self.wakeups = 0
+        self.fired = 0
+        self.misfires = 0
+
+    @property
+    def next_fire(self) -> datetime | None:
+        return self._armed_at
+
+    def diagnostics(self) -> dict[str, Any]:
+        """Счётчики планировщика: в простое wakeups не растёт."""
+        return {
+            "jobs": len(self._jobs),
+            "wakeups": self.wakeups,
+            "fired": self.fired,
+            "misfires": self.misfires,
+            "next_fire": self._armed_at.isoformat() if self._armed_at else None,
+        }
+
+    @callback
+    def async_add_job(
+            self,
+            key: str,
+            next_fire: Callable[[datetime], datetime | None],
+            action: Callable[[datetime], Any],
+    ) -> CALLBACK_TYPE:
+        """Добавляем (или заменяем) задание и возвращаем функцию его удаления."""
+        self.async_remove_job(key)
+        job = ScheduleJob(key=key, next_fire=next_fire, action=action)
+        self._jobs[key] = job
+        self._push(job, dt_util.utcnow())
+        self._arm()
+
+        @callback
+        def remove() -> None:
+            if self._jobs.get(key) is job:
+                self.async_remove_job(key)
+
+        return remove
+
+    @callback
+    def async_remove_job(self, key: str) -> None:
+        job = self._jobs.pop(key, None)
+        if job is None:
+            return
+        job.removed = True
+        self._arm()
+
+    @callback
+    def async_reschedule(self, key: str) -> None:
+        """Пересчитать время задания после изменения его параметров."""
+        job = self._jobs.get(key)
+        if job is None:
+            return
+        self._push(job, dt_util.utcnow())
+        self._arm()
+
+    @callback
+    def async_shutdown(self) -> None:
+        for job in self._jobs.values():
+            job.removed = True
+        self._jobs.clear()
+        self._heap.clear()
+        self._cancel_timer()
+
+    def _push(self, job: ScheduleJob, after: datetime) -> None:
+        job.generation += 1
+        when = job.next_fire(after)
+        job.when = dt_util.as_utc(when) if when is not None else None
+        if job.when is not None:
+            heapq.heappush(self._heap, (job.when, next(self._sequence), job.generation, job))
+
+    def _peek(self) -> datetime | None:
+        # Ленивое удаление: устаревшие записи выбрасываются только при просмотре вершины.
+        while self._heap:
+            when, _, generation, job = self._heap[0]
+            if job.removed or generation != job.generation:
+                heapq.heappop(self._heap)
+                continue
+            return when
+        return None
+
+    def _cancel_timer(self) -> None:
+        if self._unsub_timer:
+            self._unsub_timer()
+        self._unsub_timer = None
+        self._armed_at = None
+
+    def _arm(self) -> None:
+        when = self._peek()
+        if when == self._armed_at:
+            return
+        self._cancel_timer()
+        if when is not None:
+            self._armed_at = when
+            self._unsub_timer = async_track_point_in_utc_time(self.hass, self._handle_timer, when)
+
+    @callback
+    def _handle_timer(self, _now: datetime) -> None:
+        self._unsub_timer = None
+        self._armed_at = None
+        self.wakeups += 1
+        now = dt_util.utcnow()
+
+        while (when := self._peek()) is not None and when <= now:
+            _, _, _, job = heapq.heappop(self._heap)
+            if now - when > timedelta(minutes=1):
+                # Пропущенные срабатывания (сон, зависание цикла) схлопываются в одно.
+                self.misfires += 1
+                LOGGER.warning("Расписание %s сработало с опозданием на %s", job.key, now - when)
+            self.fired += 1
+            try:
+                result = job.action(when)
+                if result is not None:
+                    self.hass.async_create_task(result)
+            except Exception:
+                LOGGER.exception("Ошибка при выполнении расписания %s", job.key)
+            if not job.removed:
+                self._push(job, now)
+
+        self._arm()
+
+
+@callback
+def async_get_engine(hass: HomeAssistant) -> ScheduleEngine:
+    """Общий для всей интеграции экземпляр планировщика."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    engine = domain_data.get(DATA_SCHEDULER)
+    if engine is None:
+        engine = domain_data[DATA_SCHEDULER] = ScheduleEngine(hass)
+    return engine
@@ -5,11 +5,13 @@ from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import EntityCategory
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.device_registry import DeviceInfo
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
-from .helper import config_options_to_dict
-from .const import SELECTED_THERMOMETER, DOMAIN, THERMISTOR
+from .catalog import async_get_catalog
+from .const import SELECTED_THERMOMETER, DOMAIN, THERMISTOR, SIGNAL_CATALOG_UPDATED
 from .device_manager import DeviceManager
+from .entity import LytkoEntity
 from .events import ThermistorSettingsEvent
 from .conf import LOGGER
 
@@ -25,7 +27,7 @@ async def async_setup_entry(
 
     async_add_entities([ResistanceSelect(hass, device_manager, device_manager.config), ExternalTemperatureSensorSelect(hass, device_manager, device_manager.config)])
 
-class ResistanceSelect(SelectEntity):
+class ResistanceSelect(LytkoEntity, SelectEntity):
 
     def __init__(self, hass: HomeAssistant, device_manager: DeviceManager, config: ConfigEntry):
         self.hass = hass
@@ -64,16 +66,12 @@ class ResistanceSelect(SelectEntity):
         )
         self._option = option
 
-        data = config_options_to_dict(self.config)
-        data[THERMISTOR] = option
         self.hass.config_entries.async_update_entry(
-            self.config, options=data
+            self.config, options={**self.config.options, THERMISTOR: option}
         )
-
-        await self.hass.config_entries.async_reload(self.config.entry_id)
         self.async_write_ha_state()
 
-class ExternalTemperatureSensorSelect(SelectEntity):
+class ExternalTemperatureSensorSelect(LytkoEntity, SelectEntity):
 
     def __init__(self, hass: HomeAssistant, device_manager: DeviceManager, config: ConfigEntry):
         self.hass = hass
@@ -84,6 +82,14 @@ class ExternalTemperatureSensorSelect(SelectEntity):
         if option is None:
             option = "-"
         self._option = option
+        self._catalog_options = None
+        self._options = ["-"]
+
+    async def async_added_to_hass(self) -> None:
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            async_dispatcher_connect(self.hass, SIGNAL_CATALOG_UPDATED, self.async_write_ha_state)
+        )
 
     @property
     def entity_category(self) -> EntityCategory | None:
@@ -93,6 +99,10 @@ class ExternalTemperatureSensorSelect(SelectEntity):
     def unique_id(self) -> str | None:
         return self.device_manager.external_sensor_id
 
+    @property
+    def available(self) -> bool:
+        return True
+
     @property
     def device_info(self) -> DeviceInfo | None:
         return self.device_manager.device_info
@@ -103,43 +113,30 @@ class ExternalTemperatureSensorSelect(SelectEntity):
 
     @property
     def options(self) -> list[str]:
-        thermometer_entities = ["-"]
-
-        for state in self.hass.states.async_all():
-            if state.domain == "sensor" and "temperature" in state.attributes.get("device_class", "").lower():
-                thermometer_entities.append(f"{state.name} ({state.entity_id})")
-
-
-        return thermometer_entities
+        catalog_options = async_get_catalog(self.hass).sensor_options()
+        if catalog_options is not self._catalog_options:
+            self._catalog_options = catalog_options
+            self._options = ["-", *catalog_options]
+        return self._options
 
     @property
     def current_option(self) -> str | None:
-        for option in self.options:
-            if self._option in option:
-                return option
+        if self._option == "-":
+            return "-"
+        return async_get_catalog(self.hass).sensor_label(self._option)
 
     async def async_select_option(self, option: str) -> None:
-        await self.device_manager.send_device_command(
-            ThermistorSettingsEvent(resistance=str(option).replace(",", ".") + "_kOm")
-        )
-        self._option = option
-
-        data = config_options_to_dict(self.config)
-
         if option == "-":
             selected_sensor = None
         else:
-            selected_sensor = option.split("(")[1].split(")")[0]
-
-        data[SELECTED_THERMOMETER] = selected_sensor
-
-
-        if selected_sensor != self.device_manager.external_sensor:
-            await self.device_manager.update_sensor_subscription(selected_sensor)
+            selected_sensor = async_get_catalog(self.hass).sensor_entity_id(option)
+            if selected_sensor is None:
+                LOGGER.warning(f"Датчик {option} больше не найден")
+                return
+        self._option = selected_sensor or "-"
 
+        # Подписку на датчик обновит слушатель изменений записи в DeviceManager.
         self.hass.config_entries.async_update_entry(
-            self.config, options=data
+            self.config, options={**self.config.options, SELECTED_THERMOMETER: selected_sensor}
         )
-
-        await self.hass.config_entries.async_reload(self.config.entry_id)
         self.async_write_ha_state()
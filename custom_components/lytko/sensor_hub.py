@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+import time
+from typing import Callable
+
+from homeassistant.const import STATE_UNAVAILABLE, STATE_UNKNOWN
+from homeassistant.core import HomeAssistant, Event, callback
+from homeassistant.helpers.event import async_track_state_change_event, async_call_later
+
+from .conf import LOGGER
+from .const import DOMAIN, DATA_SENSOR_HUB, SENSOR_DEADBAND, SENSOR_MIN_INTERVAL
+
+
+def parse_temperature(state) -> float | None:
+    if state is None or state.state in (STATE_UNAVAILABLE, STATE_UNKNOWN):
+        return None
+    try:
+        return float(state.state)
+    except (ValueError, TypeError):
+        LOGGER.warning(f"Invalid temperature value from sensor {state.entity_id}: {state.state}")
+        return None
+
+
+class _Subscriber:
+    """Получатель значений одного датчика со своими мёртвой зоной и минимальным интервалом."""
+
+    __slots__ = ("hass", "listener", "deadband", "min_interval", "last_value", "last_sent", "pending", "_unsub_timer")
+
+    def __init__(self, hass: HomeAssistant, listener: Callable[[float | None], None], deadband: float, min_interval: float):
+        self.hass = hass
+        self.listener = listener
+        self.deadband = deadband
+        self.min_interval = min_interval
+        self.last_value: float | None = None
+        self.last_sent = float("-inf")
+        self.pending: float | None = None
+        self._unsub_timer = None
+
+    @callback
+    def offer(self, value: float | None) -> bool:
+        """Передаём значение, если оно вышло за мёртвую зону; чаще min_interval — откладываем последнее."""
+        if value is None:
+            # Недоступность датчика сообщаем сразу, один раз.
+            self.pending = None
+            self.cancel()
+            if self.last_value is None:
+                return False
+            self._deliver(None)
+            return True
+        if self.last_value is not None and abs(value - self.last_value) < self.deadband:
+            self.pending = None
+            return False
+        wait = self.last_sent + self.min_interval - time.monotonic()
+        if wait > 0:
+            self.pending = value
+            if self._unsub_timer is None:
+                self._unsub_timer = async_call_later(self.hass, wait, self._flush)
+            return False
+        self._deliver(value)
+        return True
+
+    @callback
+    def _flush(self, _now) -> None:
+        self._unsub_timer = None
+        if self.pending is not None:
+            value, self.pending = self.pending, None
+            self._deliver(value)
+
+    @callback
+    def _deliver(self, value: float | None) -> None:
+        self.last_value = value
+        self.last_sent = time.monotonic()
+        self.listener(value)
+
+    @callback
+    def cancel(self) -> None:
+        if self._unsub_timer is not None:
+            self._unsub_timer()
+            self._unsub_timer = None
+
+
+class SensorHub:
+    """Одна подписка на каждый внешний датчик, значения раздаются всем термостатам, которые его выбрали.
+
+    Изменения только атрибутов отбрасываются, состояние разбирается один раз на событие.
+    """
+
+    def __init__(self, hass: HomeAssistant):
+        self.hass = hass
+        self._subscribers: dict[str, list[_Subscriber]] = {}
+        self._unsubs: dict[str, Callable[[], None]] = {}
+        self.events = 0
+        self.delivered = 0
+        self.suppressed = 0
+
+    @callback
+    def async_subscribe(
+            self,
+            entity_id: str,
+            listener: Callable[[float | None], None],
+            deadband: float = SENSOR_DEADBAND,
+            min_interval: float = SENSOR_MIN_INTERVAL,
+    ) -> Callable[[], None]:
+        """Подписываемся на значения датчика; текущее значение передаётся сразу, None — датчик недоступен."""
+        subscriber = _Subscriber(self.hass, listener, deadband, min_interval)
+        self._subscribers.setdefault(entity_id, []).append(subscriber)
+        if entity_id not in self._unsubs:
+            self._unsubs[entity_id] = async_track_state_change_event(self.hass, entity_id, self._state_changed)
+        value = parse_temperature(self.hass.states.get(entity_id))
+        if value is not None:
+            subscriber.offer(value)
+
+        @callback
+        def unsubscribe() -> None:
+            subscriber.cancel()
+            subscribers = self._subscribers.get(entity_id, [])
+            if subscriber in subscribers:
+                subscribers.remove(subscriber)
+            if not subscribers:
+                self._subscribers.pop(entity_id, None)
+                unsub = self._unsubs.pop(entity_id, None)
+                if unsub:
+                    unsub()
+
+        return unsubscribe
+
+    @callback
+    def _state_changed(self, event: Event) -> None:
+        old_state = event.data.get("old_state")
+        new_state = event.data.get("new_state")
+        if old_state is not None and new_state is not None and old_state.state == new_state.state:
+            return
+        self.events += 1
+        value = parse_temperature(new_state)
+        for subscriber in list(self._subscribers.get(event.data["entity_id"], ())):
+            if subscriber.offer(value):
+                self.delivered += 1
+            else:
+                self.suppressed += 1
+
+
+def async_get_sensor_hub(hass: HomeAssistant) -> SensorHub:
+    """Общий для всей интеграции диспетчер внешних датчиков."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    hub = domain_data.get(DATA_SENSOR_HUB)
+    if hub is None:
+        hub = domain_data[DATA_SENSOR_HUB] = SensorHub(hass)
+    return hub
@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import voluptuous as vol
+from homeassistant.const import ATTR_ENTITY_ID
+from homeassistant.core import HomeAssistant, ServiceCall, ServiceResponse, SupportsResponse
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import config_validation as cv
+
+from .const import DOMAIN, NAME, ATTR_TEMPERATURE, ATTR_START_TIME, ATTR_END_TIME, SCHEDULE_DAYS, HOLIDAY_DAYS
+from .const import DAYS_OF_WEEK, ATTR_SCHEDULE_ID, ATTR_SCHEDULES
+from .const import SERVICE_RELOAD_CALENDARS, SERVICE_ADD_SCHEDULE, SERVICE_UPDATE_SCHEDULE, SERVICE_DELETE_SCHEDULE, SERVICE_REPLACE_SCHEDULES
+from .helper import resolve_thermostat_device_id
+from .production_calendar import async_get_calendar
+from .schedule_store import async_get_schedule_store
+from .scheduler import parse_time
+
+
+def time_string(value) -> str:
+    """Проверяем время HH:MM и приводим его к каноничному виду."""
+    try:
+        return parse_time(value).strftime("%H:%M")
+    except (ValueError, TypeError) as e:
+        raise vol.Invalid(f"Неверное время: {value}") from e
+
+
+SCHEDULE_FIELDS = {
+    vol.Required(NAME): cv.string,
+    vol.Required(ATTR_TEMPERATURE): vol.Coerce(float),
+    vol.Required(ATTR_START_TIME): time_string,
+    vol.Required(ATTR_END_TIME): time_string,
+    vol.Optional(SCHEDULE_DAYS, default=DAYS_OF_WEEK): vol.All(cv.ensure_list, [vol.In(DAYS_OF_WEEK)]),
+    vol.Optional(HOLIDAY_DAYS, default=True): cv.boolean,
+}
+SCHEDULE_SCHEMA = vol.Schema({vol.Optional(ATTR_SCHEDULE_ID): cv.string, **SCHEDULE_FIELDS})
+
+ADD_SCHEDULE_SCHEMA = vol.Schema({vol.Required(ATTR_ENTITY_ID): cv.entity_id, **SCHEDULE_FIELDS})
+UPDATE_SCHEDULE_SCHEMA = vol.Schema({
+    vol.Required(ATTR_ENTITY_ID): cv.entity_id,
+    vol.Required(ATTR_SCHEDULE_ID): cv.string,
+    **{vol.Optional(str(key)): validator for key, validator in SCHEDULE_FIELDS.items()},
+})
+DELETE_SCHEDULE_SCHEMA = vol.Schema({
+    vol.Required(ATTR_ENTITY_ID): cv.entity_id,
+    vol.Required(ATTR_SCHEDULE_ID): cv.string,
+})
+REPLACE_SCHEDULES_SCHEMA = vol.Schema({
+    vol.Required(ATTR_ENTITY_ID): cv.entity_id,
+    vol.Required(ATTR_SCHEDULES): [SCHEDULE_SCHEMA],
+})
+
+
+def _device_id(hass: HomeAssistant, call: ServiceCall) -> str:
+    device_id = resolve_thermostat_device_id(hass, call.data[ATTR_ENTITY_ID])
+    if device_id is None:
+        raise HomeAssistantError(f"{call.data[ATTR_ENTITY_ID]} не является термостатом Lytko")
+    return device_id
+
+
+def async_register_services(hass: HomeAssistant) -> None:
+    """Службы интеграции: изменения расписаний применяются без перезагрузки."""
+    store = async_get_schedule_store(hass)
+
+    async def reload_calendars(call: ServiceCall) -> None:
+        await async_get_calendar(hass).async_load()
+
+    async def add_schedule(call: ServiceCall) -> ServiceResponse:
+        data = {key: value for key, value in call.data.items() if key != ATTR_ENTITY_ID}
+        schedule_id = store.async_add(_device_id(hass, call), data)
+        return {ATTR_SCHEDULE_ID: schedule_id}
+
+    async def update_schedule(call: ServiceCall) -> None:
+        changes = {key: value for key, value in call.data.items() if key not in (ATTR_ENTITY_ID, ATTR_SCHEDULE_ID)}
+        try:
+            store.async_update(_device_id(hass, call), call.data[ATTR_SCHEDULE_ID], changes)
+        except KeyError as e:
+            raise HomeAssistantError(f"Расписание {call.data[ATTR_SCHEDULE_ID]} не найдено") from e
+
+    async def delete_schedule(call: ServiceCall) -> None:
+        try:
+            store.async_delete(_device_id(hass, call), call.data[ATTR_SCHEDULE_ID])
+        except KeyError as e:
+            raise HomeAssistantError(f"Расписание {call.data[ATTR_SCHEDULE_ID]} не найдено") from e
+
+    async def replace_schedules(call: ServiceCall) -> ServiceResponse:
+        schedule_ids = store.async_replace(_device_id(hass, call), call.data[ATTR_SCHEDULES])
+        return {ATTR_SCHEDULES: schedule_ids}
+
+    hass.services.async_register(DOMAIN, SERVICE_RELOAD_CALENDARS, reload_calendars)
+    hass.services.async_register(
+        DOMAIN, SERVICE_ADD_SCHEDULE, add_schedule, ADD_SCHEDULE_SCHEMA, SupportsResponse.OPTIONAL
+    )
+    hass.services.async_register(DOMAIN, SERVICE_UPDATE_SCHEDULE, update_schedule, UPDATE_SCHEDULE_SCHEMA)
+    hass.services.async_register(DOMAIN, SERVICE_DELETE_SCHEDULE, delete_schedule, DELETE_SCHEDULE_SCHEMA)
+    hass.services.async_register(
+        DOMAIN, SERVICE_REPLACE_SCHEDULES, replace_schedules, REPLACE_SCHEDULES_SCHEMA, SupportsResponse.OPTIONAL
+    )
@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+from typing import Any, Callable
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN
+from .events import Event, HeatingEvent, TargetTemperatureEvent, ThermistorSettingsEvent
+from .events import ThermostatFrame
+
+STORAGE_VERSION = 1
+SAVE_DELAY = 1
+
+TARGET_TEMPERATURE = "target_temperature"
+HEATING = "heating"
+RESISTANCE = "resistance"
+
+# Настройка -> (значение из команды, команда из значения); только то, что протокол умеет отправить.
+FIELDS: dict[type[Event], tuple[str, Callable[[Any], Any]]] = {
+    TargetTemperatureEvent: (TARGET_TEMPERATURE, lambda e: e.temperature),
+    HeatingEvent: (HEATING, lambda e: e.heating_on),
+    ThermistorSettingsEvent: (RESISTANCE, lambda e: e.resistance),
+}
+COMMANDS: dict[str, Callable[[Any], Event]] = {
+    TARGET_TEMPERATURE: lambda value: TargetTemperatureEvent(temperature=value),
+    HEATING: lambda value: HeatingEvent(heating_on=value),
+    RESISTANCE: lambda value: ThermistorSettingsEvent(resistance=value),
+}
+# Настройки, которые устройство присылает в кадрах thermostat.
+REPORTED = (TARGET_TEMPERATURE, HEATING)
+
+
+def _storage_key(device_id: str) -> str:
+    return f"{DOMAIN}.shadow.{device_id}"
+
+
+async def async_remove_shadow(hass: HomeAssistant, device_id: str) -> None:
+    """Удаляем сохранённую тень устройства вместе с его записью."""
+    await Store(hass, STORAGE_VERSION, _storage_key(device_id)).async_remove()
+
+
+def _same(field: str, desired: Any, reported: Any) -> bool:
+    if field == TARGET_TEMPERATURE:
+        return abs(desired - reported) < 0.01
+    return desired == reported
+
+
+class DeviceShadow:
+    """Тень устройства: желаемое состояние из Home Assistant рядом с последним отчётом устройства.
+
+    Настройка «грязная», пока устройство её не подтвердило: уставку и режим
+    подтверждает кадр, термистор — успешная запись кадра команды в сокет.
+    Желаемое состояние и грязные настройки переживают перезапуск, а после
+    переподключения переотправляются только они. Изменения, сделанные на
+    самом устройстве, принимаются как новое желаемое состояние.
+    """
+
+    def __init__(self, hass: HomeAssistant, device_id: str):
+        self._store: Store[dict[str, Any]] = Store(hass, STORAGE_VERSION, _storage_key(device_id))
+        self.desired: dict[str, Any] = {}
+        self.reported: dict[str, Any] = {}
+        self.dirty: set[str] = set()
+        self._resync = True
+        self.replayed = 0
+
+    async def async_load(self) -> None:
+        data = await self._store.async_load() or {}
+        self.desired = {name: value for name, value in data.get("desired", {}).items() if name in COMMANDS}
+        self.dirty = set(data.get("dirty", [])) & set(self.desired)
+
+    @callback
+    def _data_to_save(self) -> dict[str, Any]:
+        return {"desired": self.desired, "dirty": sorted(self.dirty)}
+
+    @callback
+    def _schedule_save(self) -> None:
+        self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+
+    async def async_flush(self) -> None:
+        """Пишем сразу: отложенная запись не должна сработать после выгрузки или удаления записи."""
+        await self._store.async_save(self._data_to_save())
+
+    @property
+    def converged(self) -> bool:
+        """Устройство на связи прислало кадр и подтвердило всё желаемое состояние."""
+        return not self._resync and not self.dirty
+
+    @callback
+    def record(self, event: Event) -> None:
+        """Home Assistant захотел новое значение настройки."""
+        field = FIELDS.get(type(event))
+        if field is None:
+            return
+        name, value = field[0], field[1](event)
+        if name in REPORTED and name in self.reported and _same(name, value, self.reported[name]):
+            self.dirty.discard(name)
+        else:
+            self.dirty.add(name)
+        self.desired[name] = value
+        self._schedule_save()
+
+    @callback
+    def written(self, event: Event) -> None:
+        """Команда записана в сокет: для настроек без отчёта это и есть подтверждение."""
+        field = FIELDS.get(type(event))
+        if field is None or field[0] in REPORTED:
+            return
+        name = field[0]
+        if name in self.dirty and self.desired.get(name) == field[1](event):
+            self.dirty.discard(name)
+            self._schedule_save()
+
+    @callback
+    def disconnected(self) -> None:
+        """Связь потеряна: отчёт устарел, сверимся по первому кадру после переподключения."""
+        self.reported.clear()
+        self._resync = True
+
+    @callback
+    def apply_frame(self, frame: ThermostatFrame) -> list[Event]:
+        """Учитываем кадр; после переподключения возвращает команды, которых не хватает до желаемого."""
+        changed = False
+        for name, value in ((TARGET_TEMPERATURE, frame.target_temperature), (HEATING, frame.heating)):
+            if value is None:
+                continue
+            self.reported[name] = value
+            if name not in self.desired:
+                continue
+            if _same(name, self.desired[name], value):
+                if name in self.dirty:
+                    self.dirty.discard(name)
+                    changed = True
+            elif name not in self.dirty:
+                # Настройку поменяли на самом устройстве.
+                self.desired[name] = value
+                changed = True
+        if changed:
+            self._schedule_save()
+        if not self._resync:
+            return []
+        self._resync = False
+        replay = [COMMANDS[name](self.desired[name]) for name in sorted(self.dirty)]
+        self.replayed += len(replay)
+        return replay
@@ -0,0 +1,93 @@
+"""Офлайн-симулятор режима AUTO для подбора гистерезиса, минимального цикла и фильтра датчика.
+
+Инструмент для разработчика, интеграция его не импортирует. Нужен NumPy:
+
+    from custom_components.lytko.simulator import parameter_grid, simulate
+    params = parameter_grid(hysteresis=[0.2, 0.5, 1.0], min_on=[60, 300], min_off=[60, 300], filter_alpha=[1, 0.3])
+    result = simulate(outdoor, dt=60, target=22, **params)
+
+Все комбинации параметров считаются одним проходом по времени: на каждом шаге
+решение принимается сразу для всего вектора параметров теми же функциями, что и
+у AutoController.
+"""
+from dataclasses import dataclass
+
+import numpy as np
+
+from .auto_control import auto_heating, min_cycle
+
+
+@dataclass(slots=True)
+class SimulationResult:
+    """Итоги по каждой комбинации параметров (массивы длины P)."""
+    switches: np.ndarray
+    mean_abs_deviation: np.ndarray
+    max_deviation: np.ndarray
+    duty: np.ndarray
+
+
+def parameter_grid(**axes) -> dict[str, np.ndarray]:
+    """Все сочетания значений параметров как плоские массивы одной длины."""
+    names = list(axes)
+    mesh = np.meshgrid(*(np.asarray(axes[name], dtype=float) for name in names), indexing="ij")
+    return {name: values.ravel() for name, values in zip(names, mesh)}
+
+
+def simulate(
+        outdoor,
+        dt: float,
+        target: float,
+        hysteresis,
+        min_on,
+        min_off,
+        filter_alpha=1.0,
+        heat_gain: float = 2.0 / 3600,
+        heat_loss: float = 0.1 / 3600,
+        initial=None,
+        sensor_noise=None,
+) -> SimulationResult:
+    """Прогоняем записанный ряд наружной температуры через модель помещения и AUTO.
+
+    Помещение — модель первого порядка: за секунду нагрев даёт `heat_gain` °C, а
+    теплопотери равны `heat_loss * (T - outdoor)`. Коэффициенты можно подобрать по
+    записанному ряду комнатной температуры. `filter_alpha` — коэффициент
+    экспоненциального сглаживания показаний датчика (1 — без фильтра),
+    `sensor_noise` — необязательный ряд шума датчика той же длины, что и `outdoor`.
+    """
+    outdoor = np.asarray(outdoor, dtype=float)
+    hysteresis, min_on, min_off, alpha = np.broadcast_arrays(
+        *(np.atleast_1d(np.asarray(value, dtype=float)) for value in (hysteresis, min_on, min_off, filter_alpha))
+    )
+    size = hysteresis.shape[0]
+    noise = np.zeros_like(outdoor) if sensor_noise is None else np.asarray(sensor_noise, dtype=float)
+
+    room = np.full(size, target if initial is None else initial, dtype=float)
+    sensor = room.copy()
+    heating = np.zeros(size, dtype=bool)
+    since = np.full(size, np.inf)
+    switches = np.zeros(size, dtype=np.int64)
+    heated = np.zeros(size, dtype=np.int64)
+    deviation = np.zeros(size)
+    worst = np.zeros(size)
+
+    for step in range(outdoor.shape[0]):
+        sensor += alpha * (room + noise[step] - sensor)
+        wanted = auto_heating(sensor, target, hysteresis, heating)
+        switch = (wanted != heating) & (since >= min_cycle(heating, min_on, min_off))
+        heating ^= switch
+        switches += switch
+        since = np.where(switch, dt, since + dt)
+
+        room += dt * (heat_gain * heating - heat_loss * (room - outdoor[step]))
+        error = np.abs(room - target)
+        deviation += error
+        np.maximum(worst, error, out=worst)
+        heated += heating
+
+    steps = max(outdoor.shape[0], 1)
+    return SimulationResult(
+        switches=switches,
+        mean_abs_deviation=deviation / steps,
+        max_deviation=worst,
+        duty=heated / steps,
+    )
@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN, DATA_STATE_CACHE
+
+STORAGE_VERSION = 1
+STORAGE_KEY = f"{DOMAIN}.device_state"
+# Текущая температура меняется часто: пишем пачкой не чаще раза в SAVE_DELAY.
+# Таймер Store перезапускается при каждом вызове, поэтому взводим его, только если запись не ожидается.
+SAVE_DELAY = 30
+
+
+class DeviceStateCache:
+    """Последнее известное состояние всех термостатов в одном файле .storage.
+
+    Нужен только для старта: сущности сразу показывают последний кадр, пределы
+    и режим, а живые кадры потом их уточняют. Отложенная запись сбрасывается
+    Store при остановке Home Assistant.
+    """
+
+    def __init__(self, hass: HomeAssistant):
+        self._store: Store[dict[str, dict[str, Any]]] = Store(hass, STORAGE_VERSION, STORAGE_KEY)
+        self._devices: dict[str, dict[str, Any]] = {}
+        self._save_pending = False
+
+    async def async_load(self) -> None:
+        self._devices = await self._store.async_load() or {}
+
+    @callback
+    def _schedule_save(self) -> None:
+        if not self._save_pending:
+            self._save_pending = True
+            self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+
+    @callback
+    def _data_to_save(self) -> dict[str, dict[str, Any]]:
+        self._save_pending = False
+        return self._devices
+
+    @callback
+    def async_get(self, device_id: str) -> dict[str, Any]:
+        return dict(self._devices.get(device_id, {}))
+
+    @callback
+    def async_update(self, device_id: str, **values: Any) -> None:
+        """Запоминаем значения; None не пишем, чтобы не затирать известное."""
+        state = self._devices.setdefault(device_id, {})
+        changed = False
+        for key, value in values.items():
+            if value is not None and state.get(key) != value:
+                state[key] = value
+                changed = True
+        if changed:
+            self._schedule_save()
+
+    @callback
+    def async_remove(self, device_id: str) -> None:
+        if self._devices.pop(device_id, None) is not None:
+            self._schedule_save()
+
+
+def async_get_state_cache(hass: HomeAssistant) -> DeviceStateCache:
+    """Общий для всей интеграции кэш состояния устройств."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    cache = domain_data.get(DATA_STATE_CACHE)
+    if cache is None:
+        cache = domain_data[DATA_STATE_CACHE] = DeviceStateCache(hass)
+    return cache
@@ -8,6 +8,7 @@ from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 from .const import DOMAIN
 from .device_manager import DeviceManager
+from .entity import LytkoEntity
 from .events import ChildLockEvent
 
 
@@ -22,7 +23,7 @@ async def async_setup_entry(
 
     async_add_entities([device_manager.child_lock])
 
-class ChildLockSwitch(SwitchEntity):
+class ChildLockSwitch(LytkoEntity, SwitchEntity):
 
     def __init__(self, hass: HomeAssistant, device_manager: DeviceManager, config: ConfigEntry):
         self.hass = hass
@@ -53,6 +54,7 @@ class ChildLockSwitch(SwitchEntity):
             )
         )
         self._state = True
+        self.device_manager.state_cache.async_update(self.device_manager.device_id, child_lock=True)
         self.async_write_ha_state()
 
     async def async_turn_off(self, **kwargs: Any) -> None:
@@ -62,8 +64,5 @@ class ChildLockSwitch(SwitchEntity):
             )
         )
         self._state = False
-        self.async_write_ha_state()
-
-    async def set_state(self, state):
-        self._state = state
+        self.device_manager.state_cache.async_update(self.device_manager.device_id, child_lock=False)
         self.async_write_ha_state()
\ No newline at end of file
@@ -0,0 +1,257 @@
+from __future__ import annotations
+
+import heapq
+from bisect import bisect_right
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta
+from typing import TYPE_CHECKING, Callable
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.debounce import Debouncer
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
+from homeassistant.util import dt as dt_util
+
+from .conf import LOGGER
+from .const import SIGNAL_CALENDAR_UPDATED
+from .production_calendar import async_get_calendar
+from .scheduler import async_get_engine, local_datetime
+
+if TYPE_CHECKING:
+    from .device_manager import DeviceManager
+
+MINUTES_PER_DAY = 24 * 60
+MINUTES_PER_WEEK = 7 * MINUTES_PER_DAY
+
+# Значение «вне расписания»: термостат возвращается к глобальной уставке.
+IDLE = None
+
+
+@dataclass(frozen=True, slots=True)
+class ScheduleWindow:
+    """Окно расписания: уставка с `start` до `end` в дни недели `days` (0 — понедельник).
+
+    Дни хранятся значениями, а не функцией: окна сравниваются, и правка одних дней
+    должна давать другое окно.
+    """
+    key: str
+    temperature: float
+    start: time
+    end: time
+    days: frozenset[int]
+    work_on_holidays: bool = True
+
+    def applies(self, day: date, is_day_off: Callable[[date], bool]) -> bool:
+        if day.weekday() not in self.days:
+            return False
+        return self.work_on_holidays or not is_day_off(day)
+
+
+@dataclass(frozen=True, slots=True)
+class Segment:
+    """Непересекающийся отрезок недели с действующей уставкой."""
+    start: int
+    window: ScheduleWindow | None
+
+
+def week_start_of(day: date) -> date:
+    return day - timedelta(days=day.weekday())
+
+
+def week_minute(moment: datetime, week_start: date) -> int:
+    local = dt_util.as_local(moment)
+    return (local.date() - week_start).days * MINUTES_PER_DAY + local.hour * 60 + local.minute
+
+
+def _no_days_off(day: date) -> bool:
+    return False
+
+
+def compile_week(
+        windows: list[ScheduleWindow], week_start: date, is_day_off: Callable[[date], bool] = _no_days_off
+) -> list[Segment]:
+    """Собираем окна недели в отсортированный список непересекающихся отрезков.
+
+    При пересечении побеждает окно, начавшееся позже (при равенстве — с большей уставкой).
+    Окна, переходящие через полночь, учитываются и с воскресенья предыдущей недели.
+    `is_day_off` — производственный календарь для окон, не работающих в выходные.
+    """
+    intervals = []
+    for offset in range(-1, 7):
+        day = week_start + timedelta(days=offset)
+        for window in windows:
+            if not window.applies(day, is_day_off):
+                continue
+            start = offset * MINUTES_PER_DAY + window.start.hour * 60 + window.start.minute
+            end = offset * MINUTES_PER_DAY + window.end.hour * 60 + window.end.minute
+            if end <= start:
+                end += MINUTES_PER_DAY
+            if end <= 0 or start >= MINUTES_PER_WEEK:
+                continue
+            intervals.append((start, end, window))
+
+    intervals.sort(key=lambda item: item[0])
+    boundaries = sorted({0} | {max(0, s) for s, _, _ in intervals} | {e for _, e, _ in intervals if e < MINUTES_PER_WEEK})
+
+    segments: list[Segment] = []
+    active: list[tuple[int, float, int, int, ScheduleWindow]] = []
+    index = 0
+    for boundary in boundaries:
+        while index < len(intervals) and intervals[index][0] <= boundary:
+            start, end, window = intervals[index]
+            heapq.heappush(active, (-start, -window.temperature, index, end, window))
+            index += 1
+        # Закончившиеся окна удаляются лениво: достаточно, чтобы живой была вершина кучи.
+        while active and active[0][3] <= boundary:
+            heapq.heappop(active)
+        winner = active[0][4] if active else IDLE
+        if segments and segments[-1].window is winner:
+            continue
+        segments.append(Segment(boundary, winner))
+    return segments
+
+
+class ThermostatTimeline:
+    """Скомпилированное недельное расписание одного термостата."""
+
+    def __init__(self, hass: HomeAssistant, device_manager: DeviceManager):
+        self.hass = hass
+        self.device_manager = device_manager
+        self._windows: dict[str, ScheduleWindow] = {}
+        self._week_start: date | None = None
+        self._segments: list[Segment] = []
+        self._starts: list[int] = []
+        self._unsub_job: CALLBACK_TYPE | None = None
+        self._unsub_calendar: CALLBACK_TYPE | None = None
+        self._applied = object()
+        self._apply_debouncer = Debouncer(
+            hass, LOGGER, cooldown=1, immediate=False, function=self._async_apply_now
+        )
+
+    @property
+    def job_key(self) -> str:
+        return f"{self.device_manager.device_id}_timeline"
+
+    @callback
+    def async_set_window(self, window: ScheduleWindow) -> None:
+        if self._windows.get(window.key) != window:
+            self._windows[window.key] = window
+            self._invalidate()
+
+    @callback
+    def async_replace_windows(self, windows: list[ScheduleWindow]) -> None:
+        """Заменяем все окна разом: неделя пересобирается один раз."""
+        replaced = {window.key: window for window in windows}
+        if replaced != self._windows:
+            self._windows = replaced
+            self._invalidate()
+
+    @callback
+    def async_remove_window(self, key: str, restore: bool = True) -> None:
+        """Убираем окно; `restore` — вернуть глобальную уставку, если окон не осталось.
+
+        При выгрузке сущностей уставку не трогаем: окна вернутся вместе с ними.
+        """
+        if self._windows.pop(key, None) is not None:
+            self._invalidate(restore)
+
+    @callback
+    def async_base_temperature_changed(self) -> None:
+        """Глобальная уставка изменилась: вне окон расписания её нужно применить заново."""
+        if self._windows and self.effective_window() is IDLE:
+            self._applied = object()
+            self.hass.async_create_task(self._apply_debouncer.async_call())
+
+    @callback
+    def async_shutdown(self) -> None:
+        self._apply_debouncer.async_cancel()
+        if self._unsub_job:
+            self._unsub_job()
+            self._unsub_job = None
+        if self._unsub_calendar:
+            self._unsub_calendar()
+            self._unsub_calendar = None
+
+    @callback
+    def _on_calendar_updated(self) -> None:
+        if self._windows:
+            self._invalidate()
+
+    def _invalidate(self, restore: bool = True) -> None:
+        self._week_start = None
+        engine = async_get_engine(self.hass)
+        if not self._windows:
+            self.async_shutdown()
+            if restore and isinstance(self._applied, ScheduleWindow):
+                # Удалено действовавшее окно: без этого устройство так и осталось бы на его уставке.
+                self._applied = IDLE
+                self.hass.async_create_task(self.device_manager.async_apply_schedule(None))
+            return
+        if self._unsub_job is None:
+            self._unsub_job = engine.async_add_job(self.job_key, self.next_transition, self._on_transition)
+            self._unsub_calendar = async_dispatcher_connect(
+                self.hass, SIGNAL_CALENDAR_UPDATED, self._on_calendar_updated
+            )
+        else:
+            engine.async_reschedule(self.job_key)
+        # Применяем актуальное состояние сразу (старт, перезагрузка, правка окон).
+        self.hass.async_create_task(self._apply_debouncer.async_call())
+
+    def _ensure_compiled(self, moment: datetime) -> int:
+        week_start = week_start_of(dt_util.as_local(moment).date())
+        if week_start != self._week_start:
+            self._segments = compile_week(
+                list(self._windows.values()), week_start, async_get_calendar(self.hass).is_day_off
+            )
+            self._starts = [segment.start for segment in self._segments]
+            self._week_start = week_start
+        return week_minute(moment, week_start)
+
+    def effective_window(self, moment: datetime | None = None) -> ScheduleWindow | None:
+        """Окно, действующее в момент `moment` (по умолчанию — сейчас); O(log n)."""
+        moment = moment or dt_util.utcnow()
+        minute = self._ensure_compiled(moment)
+        if not self._segments:
+            return IDLE
+        return self._segments[bisect_right(self._starts, minute) - 1].window
+
+    def next_transition(self, after: datetime) -> datetime | None:
+        """Ближайшая смена уставки строго после `after`; O(log n)."""
+        if not self._windows:
+            return None
+        minute = self._ensure_compiled(after)
+        index = bisect_right(self._starts, minute)
+        while index < len(self._starts):
+            boundary = self._starts[index]
+            moment = local_datetime(self._week_start + timedelta(days=boundary // MINUTES_PER_DAY),
+                                    time(boundary % MINUTES_PER_DAY // 60, boundary % 60))
+            if moment > after:
+                return moment
+            index += 1
+        # Конец недели: просыпаемся, чтобы пересобрать следующую.
+        return local_datetime(self._week_start + timedelta(days=7), time(0, 0))
+
+    @callback
+    def _on_transition(self, _when: datetime):
+        return self._async_apply_now()
+
+    async def _async_apply_now(self) -> None:
+        if not self._windows:
+            return
+        window = self.effective_window()
+        if window is self._applied:
+            return
+        self._applied = window
+        await self.device_manager.async_apply_schedule(window.temperature if window else None)
+
+    @property
+    def attributes(self) -> dict:
+        if not self._windows:
+            return {}
+        now = dt_util.utcnow()
+        window = self.effective_window(now)
+        next_transition = self.next_transition(now)
+        return {
+            "schedule_active": window.key if window else None,
+            "schedule_setpoint": window.temperature if window else None,
+            "schedule_next_transition": next_transition.isoformat() if next_transition else None,
+        }
@@ -1,127 +1,319 @@
 import asyncio
-import json
-from typing import Callable, Dict, Any, List
+import random
+import time
+from dataclasses import dataclass
+from typing import Callable, Any
 
 import websockets
 
+from .codec import encode_command, loads
 from .conf import LOGGER
-from .events import Event, HeatingEvent, TargetTemperatureEvent, CurrentTemperatureEvent, \
-    ThermostatSettingsEvent
-from .events import ThermistorSettingsEvent, AliceSettingsEvent
+from .const import CONNECT_TIMEOUT, PING_INTERVAL, PING_TIMEOUT, RECONNECT_MIN_DELAY, RECONNECT_MAX_DELAY
+from .const import SHUTDOWN_TIMEOUT, CONNECT_STAGGER
+from .events import Event, ThermostatFrame
+from .exceptions import FrameSchemaError, DeviceNotConnectedError
 
 
-def parse_event(data: Dict[str, Any]) -> List[Event]:
-    """Парсим JSON-сообщение в типизированное событие."""
-    event_type = data.get("action")
-    if event_type == "thermostat":
-        return [
-            TargetTemperatureEvent(temperature=data["t_target"]),
-            HeatingEvent(heating_on=data["heat"] == "heat"),
-            CurrentTemperatureEvent(temperature=data["t_curr"]),
-            ThermostatSettingsEvent(
-                target_max=data["target_max"],
-                target_min=data["target_min"],
-                step=data["hysteresis"],
-            )
-        ]
+def _number(value: Any) -> float:
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        raise FrameSchemaError(f"ожидалось число, получено {value!r}")
+    return value
 
-    return []
 
+def _heat_mode(value: Any) -> bool:
+    if not isinstance(value, str):
+        raise FrameSchemaError(f"ожидалась строка режима, получено {value!r}")
+    return value == "heat"
+
+
+# Поле сообщения -> (поле кадра, проверка и преобразование значения).
+THERMOSTAT_FIELDS: dict[str, tuple[str, Callable[[Any], Any]]] = {
+    "t_curr": ("current_temperature", _number),
+    "t_target": ("target_temperature", _number),
+    "heat": ("heating", _heat_mode),
+    "target_min": ("target_min", _number),
+    "target_max": ("target_max", _number),
+    "hysteresis": ("step", _number),
+}
+
+
+def parse_frame(data: Any) -> ThermostatFrame | None:
+    """Разбираем JSON-сообщение в кадр термостата; частичные кадры допускаются.
+
+    Возвращает None для сообщений, которые не относятся к состоянию термостата,
+    и бросает FrameSchemaError, если известное поле имеет неверный тип.
+    """
+    if not isinstance(data, dict):
+        raise FrameSchemaError(f"ожидался объект, получено {type(data).__name__}")
+    if data.get("action") != "thermostat":
+        return None
+    values = {}
+    for key, (field, convert) in THERMOSTAT_FIELDS.items():
+        if key in data:
+            try:
+                values[field] = convert(data[key])
+            except FrameSchemaError as e:
+                raise FrameSchemaError(f"{key}: {e}") from None
+    if not values:
+        return None
+    return ThermostatFrame(**values)
+
+
+@dataclass(slots=True)
+class ClientStats:
+    """Счётчики клиента: входящие сообщения и восстановление соединения."""
+    frames: int = 0
+    ignored: int = 0
+    decode_errors: int = 0
+    schema_errors: int = 0
+    connects: int = 0
+    disconnects: int = 0
+    reconnect_attempts: int = 0
+    stale_disconnects: int = 0
+    last_recovery_seconds: float | None = None
+    winning_uri: str | None = None
+    last_connect_seconds: float | None = None
+
+
+def address_uri(address: str) -> str:
+    """URI сокета устройства по IPv4, IPv6 или имени хоста."""
+    host = f"[{address}]" if ":" in address else address
+    return f"ws://{host}/ws"
+
+
+def backoff_delay(attempt: int, minimum: float, maximum: float) -> float:
+    """Экспоненциальная задержка с джиттером: половина фиксирована, половина случайна."""
+    delay = min(maximum, minimum * 2 ** max(0, attempt - 1))
+    return delay / 2 + random.uniform(0, delay / 2)
 
 
 class WebSocketClient:
-    """Клиент WebSocket для общения с термостатом и отправки данных."""
+    """Клиент WebSocket для общения с термостатом и отправки данных.
+
+    Соединение держит один задача-супервизор: переподключение с экспоненциальной
+    задержкой, таймаут установки соединения и ping/pong для поиска полуоткрытых
+    соединений. О потере и восстановлении связи сообщается через `availability_handler`,
+    о первой неудачной попытке подключения после старта или обрыва — через `failure_handler`.
+    """
 
-    def __init__(self, uri: str, event_handler: Callable[[Event], None]):
+    def __init__(
+            self,
+            uri: str,
+            event_handler: Callable[[ThermostatFrame], None],
+            availability_handler: Callable[[bool], None] | None = None,
+            connect_timeout: float = CONNECT_TIMEOUT,
+            ping_interval: float = PING_INTERVAL,
+            ping_timeout: float = PING_TIMEOUT,
+            stale_after: float | None = None,
+            candidates: list[str] | None = None,
+            failure_handler: Callable[[], None] | None = None,
+    ):
         self.uri = uri
+        self.candidates = candidates or [uri]
         self.event_handler = event_handler
+        self.availability_handler = availability_handler
+        self.failure_handler = failure_handler
+        self.connect_timeout = connect_timeout
+        self.ping_interval = ping_interval
+        self.ping_timeout = ping_timeout
+        self.stale_after = stale_after
+        self.stats = ClientStats()
         self.connection = None
-        self._reconnect_delay = 5
         self._connected = False
+        self._closing = False
+        self._lost_at: float | None = None
+        self.last_frame_at: float | None = None
         self.reconnect_task = None
+        self._kick = asyncio.Event()
 
-    async def reconnect(self):
-        """Установить асинхронное соединение с WebSocket сервером."""
-        while not self._connected:
-            try:
-                self.connection = await websockets.connect(self.uri)
-                asyncio.create_task(self.listen())
-                self._connected = True
-            except Exception as e:
-                await asyncio.sleep(self._reconnect_delay)
+    @property
+    def connected(self) -> bool:
+        return self._connected
 
-    async def close(self):
-        if self.reconnect_task:
-            if not self.reconnect_task.cancelled():
-                self.reconnect_task.cancel()
-        del self.connection
+    def set_candidates(self, candidates: list[str]):
+        """Новые адреса устройства; ожидание между попытками прерывается, чтобы сразу их проверить."""
+        self.candidates = candidates
+        self._kick.set()
+
+    async def _open(self):
+        """Подключаемся к первому ответившему адресу и запоминаем его."""
+        started = time.monotonic()
+        if len(self.candidates) == 1:
+            uri, connection = self.candidates[0], await self._open_one(self.candidates[0])
+        else:
+            uri, connection = await self._race(list(self.candidates))
+        self.uri = uri
+        self.stats.winning_uri = uri
+        self.stats.last_connect_seconds = time.monotonic() - started
+        return connection
+
+    async def _race(self, uris: list[str]):
+        """Happy eyeballs: попытки стартуют с шагом CONNECT_STAGGER, следующая — сразу после неудачи.
+
+        Побеждает первое рукопожатие, остальные попытки отменяются.
+        """
+        running: dict[asyncio.Task, str] = {}
+        error: BaseException | None = None
+        try:
+            while uris or running:
+                if uris:
+                    uri = uris.pop(0)
+                    running[asyncio.create_task(self._open_one(uri))] = uri
+                done, _ = await asyncio.wait(
+                    running, timeout=CONNECT_STAGGER if uris else None, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    uri = running.pop(task)
+                    if task.exception() is None:
+                        return uri, task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in running:
+                task.cancel()
+            if running:
+                # Проигравшие попытки могли успеть подключиться: закрываем их сокеты.
+                for result in await asyncio.gather(*running, return_exceptions=True):
+                    if not isinstance(result, BaseException):
+                        await result.close()
+
+    async def _open_one(self, uri: str):
+        return await websockets.connect(
+            uri,
+            open_timeout=self.connect_timeout,
+            ping_interval=self.ping_interval,
+            ping_timeout=self.ping_timeout,
+            close_timeout=self.ping_timeout,
+        )
+
+    def _set_connected(self, connected: bool):
+        if connected == self._connected:
+            return
+        self._connected = connected
+        now = time.monotonic()
+        if connected:
+            self.stats.connects += 1
+            if self._lost_at is not None:
+                self.stats.last_recovery_seconds = now - self._lost_at
+                LOGGER.info(
+                    f"Соединение с {self.uri} восстановлено за {self.stats.last_recovery_seconds:.1f} с, "
+                    f"попыток: {self.stats.reconnect_attempts}"
+                )
+            self._lost_at = None
+        else:
+            self.stats.disconnects += 1
+            self._lost_at = now
+        if self.availability_handler:
+            self.availability_handler(connected)
+
+    def start(self):
+        """Подключаемся в фоне: первую попытку и все последующие делает супервизор."""
+        self._lost_at = time.monotonic()
+        self.reconnect_task = asyncio.create_task(self.supervise(), name=f"lytko supervisor {self.uri}")
 
     async def connect(self):
-        """Установить асинхронное соединение с WebSocket сервером."""
+        """Установить соединение; при неудаче супервизор продолжит попытки в фоне."""
         try:
-            self.connection = await websockets.connect(self.uri)
-            asyncio.create_task(self.listen())
-            self._connected = True
-            return True
-        except Exception as e:
-            self.reconnect_task = asyncio.create_task(self.reconnect())
-            return False
+            self.connection = await self._open()
+            self._set_connected(True)
+            success = True
+        except (OSError, asyncio.TimeoutError, websockets.exceptions.WebSocketException) as e:
+            LOGGER.debug(f"Не удалось подключиться к {self.uri}: {e}")
+            self._lost_at = time.monotonic()
+            success = False
+            if self.failure_handler:
+                self.failure_handler()
+        self.reconnect_task = asyncio.create_task(self.supervise(), name=f"lytko supervisor {self.uri}")
+        return success
+
+    async def supervise(self):
+        """Держим соединение: слушаем, а при обрыве переподключаемся с задержкой."""
+        attempt = 0
+        while not self._closing:
+            if self.connection is None:
+                try:
+                    self.connection = await self._open()
+                except (OSError, asyncio.TimeoutError, websockets.exceptions.WebSocketException) as e:
+                    attempt += 1
+                    self.stats.reconnect_attempts += 1
+                    if attempt == 1 and self.failure_handler:
+                        self.failure_handler()
+                    delay = backoff_delay(attempt, RECONNECT_MIN_DELAY, RECONNECT_MAX_DELAY)
+                    LOGGER.debug(f"Переподключение к {self.uri} через {delay:.1f} с: {e}")
+                    self._kick.clear()
+                    try:
+                        await asyncio.wait_for(self._kick.wait(), delay)
+                    except asyncio.TimeoutError:
+                        pass
+                    continue
+                attempt = 0
+                self._set_connected(True)
+
+            try:
+                await self.listen()
+            except (OSError, asyncio.TimeoutError, websockets.exceptions.WebSocketException) as e:
+                LOGGER.debug(f"Соединение с {self.uri} потеряно: {e}")
+            finally:
+                connection, self.connection = self.connection, None
+                self._set_connected(False)
+                if connection is not None:
+                    await connection.close()
 
     async def listen(self):
-        """Прослушиваем входящие сообщения через WebSocket асинхронно."""
+        """Прослушиваем входящие сообщения; без данных дольше `stale_after` соединение считается мёртвым."""
+        self.last_frame_at = time.monotonic()
+        while True:
+            try:
+                message = await asyncio.wait_for(self.connection.recv(), self.stale_after)
+            except asyncio.TimeoutError:
+                self.stats.stale_disconnects += 1
+                LOGGER.warning(f"Нет данных от {self.uri} дольше {self.stale_after} с, переподключаемся")
+                return
+            self.last_frame_at = time.monotonic()
+            self.handle_message(message)
+
+    async def close(self):
+        """Останавливаем супервизор и закрываем сокет, не дольше SHUTDOWN_TIMEOUT."""
+        self._closing = True
+        task, self.reconnect_task = self.reconnect_task, None
+        if task is not None and not task.done():
+            task.cancel()
+            await asyncio.wait({task}, timeout=SHUTDOWN_TIMEOUT)
+        connection, self.connection = self.connection, None
+        if connection is not None:
+            try:
+                await asyncio.wait_for(connection.close(), SHUTDOWN_TIMEOUT)
+            except (OSError, asyncio.TimeoutError, websockets.exceptions.WebSocketException):
+                pass
+        self._set_connected(False)
+
+    def handle_message(self, message: str | bytes):
+        """Разбираем одно сообщение и передаем кадр обработчику."""
         try:
-            async for message in self.connection:
-                data = json.loads(message)
-                events = parse_event(data)
-                for event in events:
-                    await self.dispatch_event(event)
-        except Exception as e:
-            self._connected = False
-            await self.reconnect()
-
-    async def dispatch_event(self, event: Event):
-        """Асинхронно передаем событие обработчику событий."""
+            frame = parse_frame(loads(message))
+        except ValueError as e:
+            if isinstance(e, FrameSchemaError):
+                self.stats.schema_errors += 1
+            else:
+                self.stats.decode_errors += 1
+            LOGGER.debug(f"Отброшено сообщение {self.uri}: {e}")
+            return
+        if frame is None:
+            self.stats.ignored += 1
+            return
+        self.stats.frames += 1
         if self.event_handler:
-            self.event_handler(event)
-
-    async def send(self, data: Event):
-        """Отправка данных через WebSocket."""
-        if self.connection:
-            if isinstance(data, TargetTemperatureEvent):
-                await self.connection.send(
-                    json.dumps(
-                        {
-                            "action": "thermostat.set.target",
-                            "t_target": data.temperature
-                        }
-                    )
-                )
-            if isinstance(data, HeatingEvent):
-                await self.connection.send(
-                    json.dumps(
-                        {
-                            "action": "thermostat.set.mode",
-                            "heat": "on" if data.heating_on else "off"
-                        }
-                    )
-                )
-            if isinstance(data, ThermistorSettingsEvent):
-                await self.connection.send(
-                    json.dumps(
-                        {
-                            "action": "thermostat.set.sensor",
-                            "sensor": data.resistance
-                        }
-                    )
-                )
+            try:
+                self.event_handler(frame)
+            except Exception:
+                LOGGER.exception(f"Ошибка обработки кадра от {self.uri}")
 
-            if isinstance(data, AliceSettingsEvent):
-                await self.connection.send(
-                    json.dumps(
-                        {
-                            "action": "alice.login",
-                            "login": data.login,
-                            "pass": data.password
-                        }
-                    )
-                )
\ No newline at end of file
+    async def send(self, data: Event) -> bool:
+        """Отправка данных через WebSocket; False — протокол такую команду не поддерживает."""
+        if not self.connection:
+            raise DeviceNotConnectedError(f"Нет соединения с {self.uri}")
+        payload = encode_command(data)
+        if payload is None:
+            return False
+        await self.connection.send(payload)
+        return True
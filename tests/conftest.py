@@ -0,0 +1,10 @@
+"""Общие фикстуры: настоящий HomeAssistant без запуска интеграций."""
+import pytest_asyncio
+from homeassistant.core import HomeAssistant
+
+
+@pytest_asyncio.fixture
+async def hass(tmp_path):
+    hass = HomeAssistant(str(tmp_path))
+    yield hass
+    await hass.async_stop(force=True)
@@ -0,0 +1,83 @@
+"""Режим AUTO: гистерезис, минимальное время цикла и отсутствие работы в простое."""
+import asyncio
+import time
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from homeassistant.components.climate import HVACMode
+
+from custom_components.lytko.auto_control import AutoController, auto_heating, hold_remaining
+from custom_components.lytko.climate import ThermostatClimate
+from custom_components.lytko.const import SELECTED_THERMOMETER
+from custom_components.lytko.events import TargetTemperatureEvent
+
+
+def test_hysteresis():
+    assert auto_heating(19.4, 20, 0.5, False)
+    assert not auto_heating(19.6, 20, 0.5, False)
+    assert auto_heating(20.4, 20, 0.5, True)
+    assert not auto_heating(20.6, 20, 0.5, True)
+
+
+def test_hold_remaining():
+    assert hold_remaining(True, None, 120, 60) == 0
+    assert hold_remaining(True, 100, 120, 60) == 20
+    assert hold_remaining(False, 100, 120, 60) == 0
+
+
+@pytest.mark.asyncio
+async def test_min_cycle_delays_second_switch(hass):
+    switched = []
+
+    async def switch(heating):
+        switched.append(heating)
+
+    controller = AutoController(hass, switch, min_on=0.2, min_off=0.2)
+    controller.start(False)
+    controller.update(19.0, 20, 0.5)
+    await hass.async_block_till_done()
+    assert switched == [True]
+
+    controller.update(21.0, 20, 0.5)
+    await hass.async_block_till_done()
+    assert switched == [True]
+    await asyncio.sleep(0.3)
+    await hass.async_block_till_done()
+    assert switched == [True, False]
+    controller.stop()
+
+
+@pytest.mark.asyncio
+async def test_idle_controller_does_no_work(hass):
+    controller = AutoController(hass, AsyncMock())
+    controller.start(False)
+    controller.update(20.0, 20, 0.5)
+    evaluations = controller.evaluations
+    cpu = time.process_time()
+    await asyncio.sleep(2)
+    assert time.process_time() - cpu < 0.05
+    assert controller.evaluations == evaluations
+    controller.stop()
+
+
+@pytest.mark.asyncio
+async def test_entering_auto_raises_device_target_once(hass):
+    manager = MagicMock()
+    manager.send_device_command = AsyncMock()
+    config = MagicMock()
+    config.options = {SELECTED_THERMOMETER: "sensor.room"}
+    climate = ThermostatClimate(hass, manager, config)
+    climate.async_write_ha_state = MagicMock()
+    climate._target_temperature = 22
+    climate.temp_max = 45
+
+    await climate.async_set_hvac_mode(HVACMode.AUTO)
+    for temperature in (21.0, 21.2, 21.4, 21.3):
+        climate.set_current_external_temperature(temperature)
+    await hass.async_block_till_done()
+
+    targets = [call.args[0] for call in manager.send_device_command.call_args_list
+               if isinstance(call.args[0], TargetTemperatureEvent)]
+    assert targets == [TargetTemperatureEvent(temperature=45)]
+    assert climate.hvac_mode == HVACMode.AUTO
+    climate.auto_controller.stop()
@@ -0,0 +1,38 @@
+"""Индекс сущностей для выпадающих списков и выбор внешнего датчика."""
+from types import SimpleNamespace
+
+import pytest
+from homeassistant.helpers import entity_registry as er
+
+from custom_components.lytko.catalog import async_get_catalog
+from custom_components.lytko.const import SELECTED_THERMOMETER
+from custom_components.lytko.select import ExternalTemperatureSensorSelect
+
+pytestmark = pytest.mark.asyncio
+
+TEMPERATURE = {"device_class": "temperature"}
+
+
+async def test_sensor_with_parentheses_in_name_is_selected_by_entity_id(hass):
+    await er.async_load(hass)
+    hass.states.async_set("sensor.kitchen", "21.5", {**TEMPERATURE, "friendly_name": "Кухня (у окна)"})
+    hass.states.async_set("sensor.hall", "20.0", {**TEMPERATURE, "friendly_name": "Коридор"})
+    catalog = async_get_catalog(hass)
+    label = "Кухня (у окна) (sensor.kitchen)"
+    assert label in catalog.sensor_options()
+    assert catalog.sensor_entity_id(label) == "sensor.kitchen"
+
+    updates = []
+    config = SimpleNamespace(options={})
+    hass.config_entries = SimpleNamespace(async_update_entry=lambda entry, options: updates.append(options))
+    select = ExternalTemperatureSensorSelect(hass, SimpleNamespace(), config)
+    select.entity_id = "select.external"
+    await select.async_select_option(label)
+    assert updates == [{SELECTED_THERMOMETER: "sensor.kitchen"}]
+    assert select.current_option == label
+
+    # Переименованный датчик меняет и свой вариант в списке.
+    hass.states.async_set("sensor.kitchen", "21.5", {**TEMPERATURE, "friendly_name": "Кухня"})
+    await hass.async_block_till_done()
+    assert catalog.sensor_entity_id("Кухня (sensor.kitchen)") == "sensor.kitchen"
+    assert catalog.sensor_entity_id(label) is None
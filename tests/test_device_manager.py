@@ -0,0 +1,178 @@
+"""Жизненный цикл DeviceManager против локального WebSocket-сервера."""
+import asyncio
+import json
+import time
+from types import SimpleNamespace
+
+import pytest
+import pytest_asyncio
+import websockets
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers import entity_registry as er
+
+from custom_components.lytko import device_manager as device_manager_module
+from custom_components.lytko import websocket_client
+from custom_components.lytko.const import DOMAIN, DEVICE_ID, MAC, MODEL, NAME, ENTRY_TYPE, THERMOSTAT
+from custom_components.lytko.device_manager import DeviceManager
+from custom_components.lytko.events import ThermostatFrame
+from custom_components.lytko.state_cache import async_get_state_cache
+
+pytestmark = pytest.mark.asyncio
+
+FRAME = json.dumps({"action": "thermostat", "t_curr": 21.5, "t_target": 22, "heat": "heat"})
+UNREACHABLE = "192.0.2.1"
+REFUSED = "192.0.2.2"
+
+
+class FakeDiscovery:
+    def async_subscribe(self, mac, listener):
+        return lambda: None
+
+    def async_addresses(self, mac):
+        return ()
+
+
+@pytest_asyncio.fixture
+async def server():
+    """Локальный «термостат»: шлёт кадр и держит соединение; считает открытые сокеты."""
+    connections = set()
+
+    async def handler(connection):
+        connections.add(connection)
+        try:
+            await connection.send(FRAME)
+            await connection.wait_closed()
+        finally:
+            connections.discard(connection)
+
+    async with websockets.serve(handler, "127.0.0.1", 0) as ws_server:
+        yield SimpleNamespace(connections=connections, port=ws_server.sockets[0].getsockname()[1])
+
+
+@pytest_asyncio.fixture
+async def setup(hass, server, monkeypatch):
+    """Фабрика записей термостатов; UNREACHABLE никогда не отвечает, REFUSED сразу отказывает."""
+    await dr.async_load(hass)
+    await er.async_load(hass)
+    monkeypatch.setattr(device_manager_module, "async_get_discovery", lambda hass: FakeDiscovery())
+    connect = websockets.connect
+
+    async def fake_connect(uri, **kwargs):
+        if UNREACHABLE in uri:
+            await asyncio.Event().wait()
+        if REFUSED in uri:
+            raise OSError("Connection refused")
+        return await connect(f"ws://127.0.0.1:{server.port}/ws", **kwargs)
+
+    monkeypatch.setattr(websocket_client.websockets, "connect", fake_connect)
+
+    def create(number: int, ip: str = "127.0.0.1") -> DeviceManager:
+        entry = ConfigEntry(
+            version=1, minor_version=1, domain=DOMAIN, title=f"t{number}", source="user",
+            data={ENTRY_TYPE: THERMOSTAT, DEVICE_ID: f"dev{number}", MAC: f"mac{number}",
+                  MODEL: "TS", NAME: f"t{number}", "ip": ip},
+            options={},
+        )
+        return DeviceManager(hass, entry)
+
+    return create
+
+
+async def _wait_for(condition, timeout: float = 5):
+    async with asyncio.timeout(timeout):
+        while not condition():
+            await asyncio.sleep(0.001)
+
+
+async def test_reloads_do_not_leak_tasks_or_sockets(hass, server, setup):
+    manager = setup(0)
+    await manager.initialize()
+    await _wait_for(lambda: manager.available and manager.frames_received)
+    await manager.stop()
+    await _wait_for(lambda: not server.connections)
+    await hass.async_block_till_done()
+    baseline = len(asyncio.all_tasks())
+
+    for _ in range(1000):
+        manager = setup(0)
+        await manager.initialize()
+        await _wait_for(lambda: manager.available)
+        await manager.stop()
+        assert not manager._tasks
+
+    await _wait_for(lambda: not server.connections)
+    await hass.async_block_till_done()
+    assert len(asyncio.all_tasks()) <= baseline
+
+
+async def test_setup_does_not_wait_for_unreachable_devices(hass, server, setup):
+    managers = [setup(number, UNREACHABLE if number % 2 else "127.0.0.1") for number in range(50)]
+    started = time.monotonic()
+    for manager in managers:
+        await manager.initialize()
+    elapsed = time.monotonic() - started
+
+    assert elapsed < 0.5
+    assert all(manager.setup_seconds is not None for manager in managers)
+    await _wait_for(lambda: all(manager.available for manager in managers[::2]))
+    assert not any(manager.available for manager in managers[1::2])
+
+    await asyncio.gather(*(manager.stop() for manager in managers))
+    await _wait_for(lambda: not server.connections)
+
+
+async def test_restored_state_is_shown_until_first_connect_fails(hass, server, setup):
+    frame = {"current_temperature": 21.5, "target_temperature": 24.0, "heating": True,
+             "target_min": 5.0, "target_max": 35.0, "step": 0.5}
+    cache = async_get_state_cache(hass)
+    for number in (0, 1):
+        cache.async_update(f"dev{number}", frame=frame, child_lock=True)
+    waiting, refused = setup(0, UNREACHABLE), setup(1, REFUSED)
+    for manager in (waiting, refused):
+        await manager.initialize()
+        for domain, entity in (("climate", manager.thermostat), ("switch", manager.child_lock)):
+            entity.hass = hass
+            entity.entity_id = f"{domain}.{manager.device_id}"
+            await entity.async_added_to_hass()
+            entity.async_write_ha_state()
+    await _wait_for(lambda: not refused.restored)
+    await hass.async_block_till_done()
+
+    climate = hass.states.get("climate.dev0")
+    assert climate.state == "heat"
+    assert climate.attributes["current_temperature"] == 21.5
+    assert climate.attributes["temperature"] == 24.0
+    assert climate.attributes["restored"] is True
+    assert hass.states.get("switch.dev0").state == "on"
+    assert hass.states.get("climate.dev1").state == "unavailable"
+    assert hass.states.get("switch.dev1").state == "unavailable"
+
+    await asyncio.gather(waiting.stop(), refused.stop())
+
+
+async def test_thousand_frames_write_each_entity_only_on_change(hass, server, setup):
+    manager = setup(0, UNREACHABLE)
+    await manager.initialize()
+    writes = {}
+    for entity in (manager.thermostat, manager.base_temperature):
+        entity.hass = hass
+        entity.entity_id = f"test.{type(entity).__name__.lower()}"
+        writes[entity.entity_id] = 0
+
+        def count(entity=entity):
+            writes[entity.entity_id] += 1
+
+        entity.async_write_ha_state = count
+
+    # Температура меняется каждые 50 кадров, нагрев — каждые 250, пределы не меняются.
+    for number in range(1000):
+        manager.handle_frame(ThermostatFrame(
+            current_temperature=20 + number // 50 / 10, target_temperature=24.0, heating=number // 250 % 2 == 0,
+            target_min=5.0, target_max=35.0, step=0.5,
+        ))
+
+    # До сведения кадра уставка, температура и нагрев писали термостат безусловно: 3001 запись.
+    assert writes == {"test.thermostatclimate": 20, "test.basetemperature": 1}
+    assert manager.state_writes == 21
+    await manager.stop()
@@ -0,0 +1,82 @@
+"""Объединение показаний нескольких датчиков комнаты."""
+import random
+import statistics
+
+import pytest
+from homeassistant.const import STATE_UNAVAILABLE
+
+from custom_components.lytko.const import FUSION_MEDIAN, FUSION_TRIMMED, FUSION_WEIGHTED
+from custom_components.lytko.fusion import SensorFusion
+from custom_components.lytko.sensor_hub import SensorHub
+
+
+def test_fast_sensor_does_not_outvote_slow_ones():
+    fusion = SensorFusion(FUSION_MEDIAN, samples_per_sensor=3)
+    fusion.add("b", 20.0)
+    fusion.add("c", 20.2)
+    for second in range(10):
+        value = fusion.add("a", 30.0)
+    assert value == 20.2
+    assert sorted(fusion.sensors) == ["a", "b", "c"]
+
+
+def test_each_sensor_keeps_its_own_window():
+    fusion = SensorFusion(FUSION_WEIGHTED, samples_per_sensor=2)
+    fusion.add("a", 10.0)
+    fusion.add("a", 12.0)
+    fusion.add("a", 14.0)
+    fusion.add("b", 20.0)
+    assert fusion.value == 16.5
+
+
+def test_only_unavailable_sensors_drop_out():
+    fusion = SensorFusion(FUSION_MEDIAN)
+    fusion.add("a", 21.0)
+    fusion.add("b", 25.0)
+    assert fusion.add("b", None) == 21.0
+    assert fusion.sensors == ["a"]
+    # Датчик «a» больше ничего не присылает: его значение не менялось, и он остаётся в медиане.
+    for value in (23.0, 23.4, 22.8):
+        fusion.add("c", value)
+    assert fusion.sensors == ["a", "c"]
+    assert fusion.value == 21.9
+
+
+def test_matches_brute_force():
+    rng = random.Random(1)
+    for method in (FUSION_MEDIAN, FUSION_TRIMMED, FUSION_WEIGHTED):
+        fusion = SensorFusion(method, samples_per_sensor=4, weights={"s0": 2.0})
+        windows = {}
+        for step in range(500):
+            sensor = f"s{rng.randrange(4)}"
+            value = round(rng.uniform(15, 30), 2)
+            windows.setdefault(sensor, [value] * 3).append(value)
+            windows[sensor] = windows[sensor][-4:]
+            samples = sorted(v for values in windows.values() for v in values)
+            if method == FUSION_MEDIAN:
+                expected = statistics.median(samples)
+            elif method == FUSION_TRIMMED:
+                cut = int(len(samples) * fusion.trim)
+                expected = statistics.mean(samples[cut:len(samples) - cut])
+            else:
+                weight = sum(2.0 if s == "s0" else 1.0 for s, values in windows.items() for _ in values)
+                total = sum(v * (2.0 if s == "s0" else 1.0) for s, values in windows.items() for v in values)
+                expected = total / weight
+            assert abs(fusion.add(sensor, value) - expected) < 0.011
+
+
+@pytest.mark.asyncio
+async def test_sensor_drops_out_when_its_entity_becomes_unavailable(hass):
+    fusion = SensorFusion(FUSION_MEDIAN)
+    values = []
+    hub = SensorHub(hass)
+    for sensor, value in (("sensor.a", "21.0"), ("sensor.b", "25.0")):
+        hass.states.async_set(sensor, value)
+        hub.async_subscribe(sensor, lambda value, sensor=sensor: values.append(fusion.add(sensor, value)), min_interval=0)
+    assert fusion.value == 23.0
+
+    hass.states.async_set("sensor.a", "21.0", {"battery": 40})
+    hass.states.async_set("sensor.b", STATE_UNAVAILABLE)
+    await hass.async_block_till_done()
+    assert fusion.sensors == ["sensor.a"]
+    assert values[-1] == 21.0
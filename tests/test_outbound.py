@@ -0,0 +1,117 @@
+"""Очередь исходящих команд устройства."""
+import asyncio
+
+import pytest
+
+from custom_components.lytko.events import ChildLockEvent, HeatingEvent, TargetTemperatureEvent, ThermostatFrame
+from custom_components.lytko.exceptions import CommandSupersededError, CommandTimeoutError
+from custom_components.lytko.outbound import CommandQueue, Priority, TokenBucket
+
+
+class Device:
+    """Писатель очереди: запоминает отправленные команды."""
+
+    def __init__(self):
+        self.sent = []
+
+    async def send(self, event):
+        self.sent.append(event)
+
+
+async def _run(queue: CommandQueue, seconds: float) -> None:
+    writer = asyncio.create_task(queue.run())
+    await asyncio.sleep(seconds)
+    writer.cancel()
+
+
+@pytest.mark.asyncio
+async def test_slider_burst_collapses_to_last_value():
+    device = Device()
+    queue = CommandQueue(device.send, debounce=0.05, bucket=TokenBucket(100, 100))
+    for temperature in range(20, 30):
+        queue.submit(TargetTemperatureEvent(temperature=temperature))
+    await _run(queue, 0.1)
+    assert device.sent == [TargetTemperatureEvent(temperature=29)]
+    assert queue.superseded == 9
+
+
+@pytest.mark.asyncio
+async def test_lower_priority_does_not_override_user_command():
+    device = Device()
+    queue = CommandQueue(device.send, debounce=0.05, bucket=TokenBucket(100, 100))
+    queue.submit(HeatingEvent(heating_on=True), Priority.USER)
+    rejected = queue.submit(HeatingEvent(heating_on=False), Priority.AUTOMATIC)
+    with pytest.raises(CommandSupersededError):
+        await rejected
+    await _run(queue, 0.1)
+    assert device.sent == [HeatingEvent(heating_on=True)]
+
+
+@pytest.mark.asyncio
+async def test_priority_order_among_ready_commands():
+    device = Device()
+    queue = CommandQueue(device.send, debounce=0, bucket=TokenBucket(100, 100))
+    queue.submit(ChildLockEvent(on=True), Priority.AUTOMATIC)
+    queue.submit(HeatingEvent(heating_on=True), Priority.USER)
+    await _run(queue, 0.05)
+    assert device.sent == [HeatingEvent(heating_on=True), ChildLockEvent(on=True)]
+
+
+@pytest.mark.asyncio
+async def test_frame_reflecting_command_acknowledges_it():
+    device = Device()
+    queue = CommandQueue(device.send, debounce=0, bucket=TokenBucket(100, 100))
+    writer = asyncio.create_task(queue.run())
+    future = queue.submit(TargetTemperatureEvent(temperature=24))
+    await asyncio.sleep(0.01)
+    assert queue.in_flight == 1
+    queue.handle_frame(ThermostatFrame(target_temperature=23))
+    assert not future.done()
+    queue.handle_frame(ThermostatFrame(target_temperature=24))
+    assert await future >= 0
+    assert queue.acked == 1 and queue.in_flight == 0
+    writer.cancel()
+
+
+@pytest.mark.asyncio
+async def test_unacknowledged_command_times_out():
+    device = Device()
+    queue = CommandQueue(device.send, debounce=0, ack_timeout=0.05, bucket=TokenBucket(100, 100))
+    writer = asyncio.create_task(queue.run())
+    with pytest.raises(CommandTimeoutError):
+        await queue.submit(HeatingEvent(heating_on=True))
+    assert queue.timeouts == 1 and queue.in_flight == 0
+    writer.cancel()
+
+
+@pytest.mark.asyncio
+async def test_command_invisible_in_frames_completes_after_write():
+    device = Device()
+    queue = CommandQueue(device.send, debounce=0, ack_timeout=10, bucket=TokenBucket(100, 100))
+    writer = asyncio.create_task(queue.run())
+    await asyncio.wait_for(queue.submit(ChildLockEvent(on=True)), 1)
+    assert queue.in_flight == 0
+    writer.cancel()
+
+
+def test_token_bucket_allows_burst_then_rate():
+    bucket = TokenBucket(rate=10, burst=3)
+    for _ in range(3):
+        assert bucket.delay() == 0
+        bucket.take()
+    assert bucket.delay() == pytest.approx(0.1, abs=0.01)
+
+
+@pytest.mark.asyncio
+async def test_throttled_commands_keep_collapsing():
+    device = Device()
+    queue = CommandQueue(device.send, debounce=0, bucket=TokenBucket(rate=10, burst=1))
+    writer = asyncio.create_task(queue.run())
+    queue.submit(ChildLockEvent(on=True))
+    await asyncio.sleep(0.01)
+    for on in (False, True, False):
+        queue.submit(ChildLockEvent(on=on))
+    await asyncio.sleep(0.2)
+    writer.cancel()
+    assert device.sent == [ChildLockEvent(on=True), ChildLockEvent(on=False)]
+    assert queue.throttled >= 1
@@ -0,0 +1,25 @@
+"""Производственный календарь из поставки интеграции."""
+from datetime import date
+
+from custom_components.lytko.production_calendar import BUILTIN_CALENDARS, load_calendars
+
+
+def _days_off(mask: int, year: int) -> set[date]:
+    return {date.fromordinal(date(year, 1, 1).toordinal() + bit) for bit in range(366) if mask >> bit & 1}
+
+
+def test_builtin_2026():
+    days_off = _days_off(load_calendars([BUILTIN_CALENDARS])[2026], 2026)
+    assert 365 - len(days_off) == 247
+    for day in (date(2026, 1, 9), date(2026, 2, 23), date(2026, 3, 9), date(2026, 5, 11), date(2026, 12, 31)):
+        assert day in days_off
+    assert date(2026, 1, 12) not in days_off
+
+
+def test_ics_adds_to_weekends(tmp_path):
+    (tmp_path / "extra.ics").write_text(
+        "BEGIN:VEVENT\nDTSTART;VALUE=DATE:20300102\nDTEND;VALUE=DATE:20300104\nEND:VEVENT\n", encoding="utf-8"
+    )
+    days_off = _days_off(load_calendars([tmp_path])[2030], 2030)
+    assert {date(2030, 1, 2), date(2030, 1, 3), date(2030, 1, 5)} <= days_off
+    assert date(2030, 1, 4) not in days_off
@@ -0,0 +1,39 @@
+"""Хранилище расписаний: массовая замена одним изменением."""
+import pytest
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
+
+from custom_components.lytko.schedule_store import ScheduleStore, schedule_signal, ACTION_ADDED, ACTION_REPLACED
+
+pytestmark = pytest.mark.asyncio
+
+MORNING = {"name": "Утро", "temperature": 23.0, "start_time": "06:30", "end_time": "09:00"}
+EVENING = {"name": "Вечер", "temperature": 22.0, "start_time": "18:00", "end_time": "23:00"}
+
+
+async def test_replace_keeps_ids_and_sends_one_signal(hass):
+    store = ScheduleStore(hass)
+    signals = []
+    async_dispatcher_connect(hass, schedule_signal("dev"), lambda *args: signals.append(args))
+    kept = store.async_add("dev", MORNING)
+    dropped = store.async_add("dev", EVENING)
+    await hass.async_block_till_done()
+    signals.clear()
+
+    ids = store.async_replace("dev", [{**MORNING, "temperature": 24.0, "schedule_id": kept}, EVENING])
+    await hass.async_block_till_done()
+
+    assert signals == [(ACTION_REPLACED, None)]
+    assert ids[0] == kept
+    assert dropped not in ids
+    assert set(store.async_schedules("dev")) == set(ids)
+    assert store.async_get("dev", kept)["temperature"] == 24.0
+    assert "schedule_id" not in store.async_get("dev", kept)
+
+
+async def test_add_signals_each_schedule(hass):
+    store = ScheduleStore(hass)
+    signals = []
+    async_dispatcher_connect(hass, schedule_signal("dev"), lambda *args: signals.append(args))
+    schedule_id = store.async_add("dev", MORNING)
+    await hass.async_block_till_done()
+    assert signals == [(ACTION_ADDED, schedule_id)]
@@ -0,0 +1,59 @@
+"""Общий планировщик: просыпается только к ближайшему срабатыванию."""
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from homeassistant.util import dt as dt_util
+
+from custom_components.lytko.scheduler import ScheduleEngine
+
+pytestmark = pytest.mark.asyncio
+
+MIDNIGHT = datetime(2026, 10, 19, tzinfo=timezone.utc)
+
+
+def _daily(minute: int):
+    def next_fire(after: datetime) -> datetime:
+        moment = MIDNIGHT + timedelta(minutes=minute)
+        while moment <= after:
+            moment += timedelta(days=1)
+        return moment
+
+    return next_fire
+
+
+async def test_idle_wakeups_per_hour_for_1000_schedules(hass, monkeypatch):
+    now = MIDNIGHT
+    monkeypatch.setattr(dt_util, "utcnow", lambda: now)
+    engine = ScheduleEngine(hass)
+    fired = []
+    for number in range(1000):
+        # Начало и конец окон расписаний разбросаны по суткам.
+        engine.async_add_job(f"job{number}", _daily(number * 7 % 1440), fired.append)
+
+    hour_end = MIDNIGHT + timedelta(hours=1)
+    while engine.next_fire is not None and engine.next_fire < hour_end:
+        now = engine.next_fire
+        engine._handle_timer(now)
+
+    # Опрос раз в минуту на каждое расписание дал бы 60 000 пробуждений в час.
+    assert engine.wakeups <= 60
+    assert len(fired) == sum(1 for number in range(1000) if 0 < number * 7 % 1440 < 60)
+    assert engine.misfires == 0
+    engine.async_shutdown()
+
+
+async def test_late_timer_counts_misfire_once(hass, monkeypatch):
+    now = MIDNIGHT
+    monkeypatch.setattr(dt_util, "utcnow", lambda: now)
+    engine = ScheduleEngine(hass)
+    fired = []
+    engine.async_add_job("job", _daily(1), fired.append)
+
+    now = MIDNIGHT + timedelta(hours=3)
+    engine._handle_timer(now)
+
+    assert fired == [MIDNIGHT + timedelta(minutes=1)]
+    assert engine.misfires == 1
+    assert engine.next_fire == MIDNIGHT + timedelta(days=1, minutes=1)
+    assert engine.diagnostics()["jobs"] == 1
+    engine.async_shutdown()
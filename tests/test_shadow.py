@@ -0,0 +1,72 @@
+"""Тень устройства: переотправка только недостающего и признак сходимости."""
+import pytest
+
+from custom_components.lytko.events import HeatingEvent, TargetTemperatureEvent, ThermistorSettingsEvent
+from custom_components.lytko.events import ThermostatFrame
+from custom_components.lytko.shadow import DeviceShadow
+
+pytestmark = pytest.mark.asyncio
+
+
+async def test_offline_command_is_replayed_once_after_reconnect(hass):
+    shadow = DeviceShadow(hass, "dev")
+    shadow.apply_frame(ThermostatFrame(target_temperature=20, heating=True))
+    shadow.disconnected()
+    shadow.record(TargetTemperatureEvent(temperature=23))
+
+    assert shadow.apply_frame(ThermostatFrame(target_temperature=20, heating=True)) == [
+        TargetTemperatureEvent(temperature=23)
+    ]
+    assert shadow.apply_frame(ThermostatFrame(target_temperature=20, heating=True)) == []
+    assert shadow.replayed == 1
+
+
+async def test_value_already_on_device_is_not_replayed(hass):
+    shadow = DeviceShadow(hass, "dev")
+    shadow.record(TargetTemperatureEvent(temperature=22))
+    shadow.record(HeatingEvent(heating_on=False))
+    assert shadow.apply_frame(ThermostatFrame(target_temperature=22.001, heating=True)) == [
+        HeatingEvent(heating_on=False)
+    ]
+    assert shadow.dirty == {"heating"}
+
+
+async def test_change_made_on_device_becomes_desired(hass):
+    shadow = DeviceShadow(hass, "dev")
+    shadow.record(TargetTemperatureEvent(temperature=22))
+    shadow.apply_frame(ThermostatFrame(target_temperature=22))
+    shadow.apply_frame(ThermostatFrame(target_temperature=25))
+    assert shadow.desired["target_temperature"] == 25
+    shadow.disconnected()
+    assert shadow.apply_frame(ThermostatFrame(target_temperature=25)) == []
+
+
+async def test_converged_flips_with_frames_commands_and_disconnects(hass):
+    shadow = DeviceShadow(hass, "dev")
+    assert not shadow.converged
+    shadow.apply_frame(ThermostatFrame(target_temperature=20))
+    assert shadow.converged
+
+    shadow.record(TargetTemperatureEvent(temperature=21))
+    assert not shadow.converged
+    shadow.apply_frame(ThermostatFrame(target_temperature=21))
+    assert shadow.converged
+
+    # Термистор в кадрах не виден: подтверждением служит запись команды.
+    shadow.record(ThermistorSettingsEvent(resistance="10K"))
+    assert not shadow.converged
+    shadow.written(ThermistorSettingsEvent(resistance="10K"))
+    assert shadow.converged
+
+    shadow.disconnected()
+    assert not shadow.converged
+
+
+async def test_desired_state_survives_restart(hass):
+    shadow = DeviceShadow(hass, "dev")
+    shadow.record(TargetTemperatureEvent(temperature=23))
+    await shadow.async_flush()
+
+    restored = DeviceShadow(hass, "dev")
+    await restored.async_load()
+    assert restored.apply_frame(ThermostatFrame(target_temperature=20)) == [TargetTemperatureEvent(temperature=23)]
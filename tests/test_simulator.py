@@ -0,0 +1,57 @@
+"""Симулятор AUTO: пакетный прогон совпадает с поштучным по логике AutoController."""
+import random
+
+import numpy as np
+import pytest
+
+from custom_components.lytko.auto_control import auto_heating, hold_remaining
+from custom_components.lytko.simulator import parameter_grid, simulate
+
+DT = 60
+TARGET = 22.0
+HEAT_GAIN = 2.0 / 3600
+HEAT_LOSS = 0.1 / 3600
+
+
+def _scalar(outdoor, noise, hysteresis, min_on, min_off, alpha):
+    """Одна комбинация параметров: реле решает так же, как AutoController."""
+    room = sensor = TARGET
+    heating = False
+    since = None
+    switches = heated = 0
+    deviation = worst = 0.0
+    for step, temperature in enumerate(outdoor):
+        sensor += alpha * (room + noise[step] - sensor)
+        wanted = bool(auto_heating(sensor, TARGET, hysteresis, heating))
+        if wanted != heating and not hold_remaining(heating, since, min_on, min_off):
+            heating = wanted
+            switches += 1
+            since = 0
+        if since is not None:
+            since += DT
+        room += DT * (HEAT_GAIN * heating - HEAT_LOSS * (room - temperature))
+        deviation += abs(room - TARGET)
+        worst = max(worst, abs(room - TARGET))
+        heated += heating
+    return switches, deviation / len(outdoor), worst, heated / len(outdoor)
+
+
+def test_batched_run_matches_scalar_controller():
+    rng = random.Random(3)
+    outdoor = [10 + 5 * np.sin(step / 240) + rng.uniform(-1, 1) for step in range(2 * 24 * 60)]
+    noise = [rng.gauss(0, 0.1) for _ in outdoor]
+    params = parameter_grid(hysteresis=[0.2, 0.5], min_on=[60, 600], min_off=[60, 300], filter_alpha=[1, 0.3])
+
+    result = simulate(outdoor, DT, TARGET, heat_gain=HEAT_GAIN, heat_loss=HEAT_LOSS, sensor_noise=noise, **params)
+
+    assert result.switches.shape == (16,)
+    for index in range(16):
+        switches, mean_deviation, worst, duty = _scalar(
+            outdoor, noise, *(params[name][index] for name in ("hysteresis", "min_on", "min_off", "filter_alpha"))
+        )
+        assert result.switches[index] == switches
+        assert result.mean_abs_deviation[index] == pytest.approx(mean_deviation)
+        assert result.max_deviation[index] == pytest.approx(worst)
+        assert result.duty[index] == pytest.approx(duty)
+    assert result.switches.min() > 0
+    assert len(set(result.switches.tolist())) > 1
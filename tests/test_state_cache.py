@@ -0,0 +1,28 @@
+"""Кэш состояния устройств: частые изменения не откладывают запись бесконечно."""
+import pytest
+
+from custom_components.lytko import state_cache
+from custom_components.lytko.state_cache import DeviceStateCache
+
+pytestmark = pytest.mark.asyncio
+
+
+async def test_frequent_updates_do_not_postpone_save(hass, monkeypatch):
+    cache = DeviceStateCache(hass)
+    calls = []
+    monkeypatch.setattr(cache._store, "async_delay_save", lambda data, delay: calls.append((data, delay)))
+    for temperature in range(100):
+        cache.async_update("dev", current_temperature=20 + temperature / 10)
+    assert len(calls) == 1
+    data, delay = calls[0]
+    assert delay == state_cache.SAVE_DELAY
+    assert data()["dev"]["current_temperature"] == 29.9
+    cache.async_update("dev", current_temperature=30.0)
+    assert len(calls) == 2
+
+
+async def test_remove_forgets_device(hass):
+    cache = DeviceStateCache(hass)
+    cache.async_update("dev", auto=True)
+    cache.async_remove("dev")
+    assert cache.async_get("dev") == {}
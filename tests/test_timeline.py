@@ -0,0 +1,153 @@
+"""Компиляция недельного расписания: пересечения, переход через полночь, выходные."""
+import random
+from bisect import bisect_right
+from datetime import date, datetime, time
+from types import SimpleNamespace
+
+import pytest
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.util import dt as dt_util
+
+from custom_components.lytko import event as event_platform
+from custom_components.lytko.const import DOMAIN, SCHEDULE_DAYS, HOLIDAY_DAYS
+from custom_components.lytko.production_calendar import async_get_calendar
+from custom_components.lytko.schedule_store import async_get_schedule_store
+from custom_components.lytko.timeline import (
+    IDLE, MINUTES_PER_DAY, MINUTES_PER_WEEK, ScheduleWindow, ThermostatTimeline, compile_week,
+)
+
+MONDAY = date(2026, 10, 19)
+EVERY_DAY = frozenset(range(7))
+
+
+def _effective(segments, minute: int):
+    starts = [segment.start for segment in segments]
+    return segments[bisect_right(starts, minute) - 1].window
+
+
+def test_later_start_wins_overlap():
+    day = ScheduleWindow("day", 21.0, time(8, 0), time(20, 0), EVERY_DAY)
+    lunch = ScheduleWindow("lunch", 19.0, time(12, 0), time(13, 0), EVERY_DAY)
+    segments = compile_week([day, lunch], MONDAY)
+    assert _effective(segments, 7 * 60 + 59) is IDLE
+    assert _effective(segments, 9 * 60) is day
+    assert _effective(segments, 12 * 60 + 30) is lunch
+    assert _effective(segments, 13 * 60) is day
+    assert _effective(segments, 20 * 60) is IDLE
+
+
+def test_window_over_midnight_carries_from_previous_sunday():
+    night = ScheduleWindow("night", 18.0, time(23, 0), time(6, 0), frozenset({6}))
+    segments = compile_week([night], MONDAY)
+    assert _effective(segments, 0) is night
+    assert _effective(segments, 6 * 60) is IDLE
+    assert _effective(segments, 6 * MINUTES_PER_DAY + 23 * 60) is night
+
+
+def test_matches_brute_force():
+    rng = random.Random(2)
+    for _ in range(20):
+        windows = []
+        for number in range(rng.randrange(1, 8)):
+            days = frozenset(rng.sample(range(7), rng.randrange(1, 8)))
+            windows.append(ScheduleWindow(
+                f"w{number}", float(rng.randrange(15, 26)),
+                time(rng.randrange(24), rng.choice((0, 30))), time(rng.randrange(24), rng.choice((0, 30))),
+                days,
+            ))
+        segments = compile_week(windows, MONDAY)
+        for minute in range(0, MINUTES_PER_WEEK, 30):
+            best = None
+            for offset in (-1, 0):
+                day_index = minute // MINUTES_PER_DAY + offset
+                day = date.fromordinal(MONDAY.toordinal() + day_index)
+                for index, window in enumerate(windows):
+                    if day.weekday() not in window.days:
+                        continue
+                    start = day_index * MINUTES_PER_DAY + window.start.hour * 60 + window.start.minute
+                    end = day_index * MINUTES_PER_DAY + window.end.hour * 60 + window.end.minute
+                    if end <= start:
+                        end += MINUTES_PER_DAY
+                    if start <= minute < end:
+                        key = (start, window.temperature, -index)
+                        if best is None or key > best[0]:
+                            best = (key, window)
+            assert _effective(segments, minute) is (best[1] if best else IDLE)
+
+
+def test_day_off_skips_window_unless_it_works_on_holidays():
+    weekday = ScheduleWindow("weekday", 21.0, time(8, 0), time(9, 0), EVERY_DAY, work_on_holidays=False)
+    always = ScheduleWindow("always", 20.0, time(10, 0), time(11, 0), EVERY_DAY)
+    segments = compile_week([weekday, always], MONDAY, lambda day: day == MONDAY)
+    assert _effective(segments, 8 * 60) is IDLE
+    assert _effective(segments, 10 * 60) is always
+    assert _effective(segments, MINUTES_PER_DAY + 8 * 60) is weekday
+
+
+def _at(day: date, hour: int) -> datetime:
+    return dt_util.as_utc(datetime.combine(day, time(hour), dt_util.DEFAULT_TIME_ZONE))
+
+
+@pytest.mark.asyncio
+async def test_editing_only_days_recompiles_week(hass):
+    await async_get_calendar(hass).async_load()
+    applied = []
+
+    async def apply_schedule(temperature):
+        applied.append(temperature)
+
+    manager = SimpleNamespace(device_id="dev", device_info=None, available=True, async_apply_schedule=apply_schedule)
+    manager.timeline = ThermostatTimeline(hass, manager)
+    entry = ConfigEntry(version=1, minor_version=1, domain=DOMAIN, title="t", data={}, source="user", options={})
+    hass.data.setdefault(DOMAIN, {})[entry.entry_id] = manager
+    store = async_get_schedule_store(hass)
+    schedule = {"name": "День", "temperature": 23.0, "start_time": "08:00", "end_time": "20:00",
+                SCHEDULE_DAYS: ["Понедельник"], HOLIDAY_DAYS: False}
+    schedule_id = store.async_add("dev", schedule)
+
+    def add_entities(entities):
+        for entity in entities:
+            entity.hass = hass
+            entity.entity_id = f"event.{entity.unique_id}"
+            hass.async_create_task(entity.async_added_to_hass())
+
+    await event_platform.async_setup_entry(hass, entry, add_entities)
+    await hass.async_block_till_done()
+    tuesday = date(2026, 10, 20)
+    assert manager.timeline.effective_window(_at(MONDAY, 10)).key == schedule_id
+    assert manager.timeline.effective_window(_at(tuesday, 10)) is IDLE
+
+    store.async_update("dev", schedule_id, {SCHEDULE_DAYS: ["Вторник"]})
+    await hass.async_block_till_done()
+    assert manager.timeline.effective_window(_at(MONDAY, 10)) is IDLE
+    assert manager.timeline.effective_window(_at(tuesday, 10)).key == schedule_id
+
+    store.async_replace("dev", [{**schedule, "schedule_id": schedule_id, SCHEDULE_DAYS: ["Среда"]}])
+    await hass.async_block_till_done()
+    assert manager.timeline.effective_window(_at(tuesday, 10)) is IDLE
+    assert manager.timeline.effective_window(_at(date(2026, 10, 21), 10)).key == schedule_id
+    manager.timeline.async_shutdown()
+
+
+@pytest.mark.asyncio
+async def test_removing_active_window_restores_base_temperature(hass):
+    applied = []
+
+    async def apply_schedule(temperature):
+        applied.append(temperature)
+
+    manager = SimpleNamespace(device_id="dev", async_apply_schedule=apply_schedule)
+    timeline = ThermostatTimeline(hass, manager)
+    timeline.async_set_window(ScheduleWindow("all_day", 23.0, time(0, 0), time(0, 0), EVERY_DAY))
+    await timeline._async_apply_now()
+    assert applied == [23.0]
+
+    # Выгрузка сущностей не трогает уставку, удаление расписания возвращает глобальную.
+    timeline.async_remove_window("all_day", restore=False)
+    await hass.async_block_till_done()
+    assert applied == [23.0]
+    timeline.async_set_window(ScheduleWindow("all_day", 23.0, time(0, 0), time(0, 0), EVERY_DAY))
+    timeline.async_remove_window("all_day")
+    await hass.async_block_till_done()
+    assert applied == [23.0, None]
+    timeline.async_shutdown()
@@ -0,0 +1,150 @@
+"""WebSocketClient: разбор кадров устройства и гонка подключений по известным адресам."""
+import asyncio
+import json
+import time
+import tracemalloc
+from types import SimpleNamespace
+
+import pytest
+import pytest_asyncio
+import websockets
+
+from custom_components.lytko import websocket_client
+from custom_components.lytko.codec import loads
+from custom_components.lytko.events import ThermostatFrame
+from custom_components.lytko.exceptions import FrameSchemaError
+from custom_components.lytko.websocket_client import WebSocketClient, address_uri, parse_frame
+
+STALE = "192.0.2.1"
+
+
+FULL = {"action": "thermostat", "t_curr": 21.5, "t_target": 24, "heat": "heat",
+        "target_min": 5, "target_max": 35, "hysteresis": 0.5}
+
+
+def test_full_frame():
+    assert parse_frame(FULL) == ThermostatFrame(21.5, 24, True, 5, 35, 0.5)
+
+
+def test_partial_frame_keeps_missing_fields_empty():
+    assert parse_frame({"action": "thermostat", "heat": "off"}) == ThermostatFrame(heating=False)
+
+
+def test_messages_without_thermostat_state_are_ignored():
+    assert parse_frame({"action": "alice.status", "t_curr": 21}) is None
+    assert parse_frame({"action": "thermostat", "uptime": 10}) is None
+
+
+@pytest.mark.parametrize("data", [
+    [FULL],
+    {**FULL, "t_curr": "21.5"},
+    {**FULL, "t_target": True},
+    {**FULL, "heat": 1},
+])
+def test_schema_errors(data):
+    with pytest.raises(FrameSchemaError):
+        parse_frame(data)
+
+
+def test_client_counts_frames_and_errors():
+    frames = []
+    client = WebSocketClient(address_uri("127.0.0.1"), frames.append)
+    for message in (json.dumps(FULL), json.dumps(FULL).encode(), "{", json.dumps({**FULL, "t_curr": False}),
+                    json.dumps({"action": "ping"})):
+        client.handle_message(message)
+    assert len(frames) == 2
+    assert (client.stats.frames, client.stats.decode_errors, client.stats.schema_errors, client.stats.ignored) == (2, 1, 1, 1)
+
+
+def test_parse_100k_frames_memory_and_throughput():
+    messages = [json.dumps({**FULL, "t_curr": 20 + number % 100 / 10}) for number in range(100_000)]
+    started = time.perf_counter()
+    for message in messages:
+        parse_frame(loads(message))
+    elapsed = time.perf_counter() - started
+
+    decoded = [loads(message) for message in messages]
+    tracemalloc.start()
+    frames = [parse_frame(data) for data in decoded]
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    # Разбор и декодирование — около 0,6 с на 100 тыс. кадров; кадр без __dict__ занимает ~90 байт.
+    assert elapsed < 5
+    assert retained / len(frames) < 128
+    assert not hasattr(frames[0], "__dict__")
+
+
+@pytest_asyncio.fixture
+async def server():
+    connections = set()
+
+    async def handler(connection):
+        connections.add(connection)
+        try:
+            await connection.wait_closed()
+        finally:
+            connections.discard(connection)
+
+    async with websockets.serve(handler, "127.0.0.1", 0) as ws_server:
+        yield SimpleNamespace(connections=connections, port=ws_server.sockets[0].getsockname()[1])
+
+
+@pytest.fixture
+def attempts(server, monkeypatch):
+    """Устаревший адрес молчит, остальные ведут на локальный сервер; отменённые попытки считаются."""
+    connect = websockets.connect
+    cancelled = []
+
+    async def fake_connect(uri, **kwargs):
+        if STALE in uri:
+            try:
+                await asyncio.Event().wait()
+            except asyncio.CancelledError:
+                cancelled.append(uri)
+                raise
+        return await connect(f"ws://127.0.0.1:{server.port}/ws", **kwargs)
+
+    monkeypatch.setattr(websocket_client.websockets, "connect", fake_connect)
+    return cancelled
+
+
+@pytest.mark.asyncio
+async def test_stale_address_does_not_delay_connection(server, attempts):
+    client = WebSocketClient(address_uri(STALE), lambda frame: None,
+                             candidates=[address_uri(STALE), address_uri("127.0.0.1")])
+    started = time.monotonic()
+    assert await client.connect()
+    elapsed = time.monotonic() - started
+    await client.close()
+
+    assert elapsed < 1
+    assert client.uri == address_uri("127.0.0.1")
+    assert attempts == [address_uri(STALE)]
+
+
+@pytest.mark.asyncio
+async def test_losing_connections_are_closed(server, monkeypatch):
+    # Обе попытки стартуют сразу и завершают рукопожатие одновременно: победитель один.
+    monkeypatch.setattr(websocket_client, "CONNECT_STAGGER", 0)
+    connect = websockets.connect
+    opened = []
+    both_open = asyncio.Event()
+
+    async def fake_connect(uri, **kwargs):
+        connection = await connect(f"ws://127.0.0.1:{server.port}/ws", **kwargs)
+        opened.append(connection)
+        if len(opened) == 2:
+            both_open.set()
+        await both_open.wait()
+        return connection
+
+    monkeypatch.setattr(websocket_client.websockets, "connect", fake_connect)
+    client = WebSocketClient(address_uri("127.0.0.1"), lambda frame: None,
+                             candidates=[address_uri("127.0.0.1"), address_uri("localhost")])
+    assert await client.connect()
+    await asyncio.sleep(0.05)
+
+    assert len(opened) == 2
+    assert len(server.connections) == 1
+    await client.close()